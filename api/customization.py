@@ -1,6 +1,10 @@
 # api/customization.py
 from fastapi import APIRouter, HTTPException
-from schemas import CustomizationRequest, CustomizationResponse
+from schemas import CustomizationRequest, CustomizationResponse, JobSubmitResponse, JobStatusResponse
+from service.job_service import get_job_manager, job_to_response, JobQueueFull
+from utils.errors import not_found, too_many_requests
+from utils.executors import get_executor, run_model
+from config import get_settings
 
 router = APIRouter(prefix="/custom", tags=["Customization"])
 
@@ -11,7 +15,7 @@ async def apply_customization(request: CustomizationRequest):
     """
     try:
         from service.customization_service import run_inference
-        result = run_inference(request.dict())
+        result = await run_model("custom", run_inference, request.dict())
 
         if result.get("status") == "failed":
             raise HTTPException(status_code=500, detail=result.get("message", "Inference failed"))
@@ -21,4 +25,41 @@ async def apply_customization(request: CustomizationRequest):
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+
+
+@router.post("/jobs", response_model=JobSubmitResponse, response_model_exclude_none=True, status_code=202,
+             summary="커스텀 메이크업 작업 등록(비동기)")
+def submit_customization_job(request: CustomizationRequest):
+    payload = request.model_dump()
+
+    def _run(token):
+        from service.customization_service import run_inference
+        token.raise_if_cancelled()
+        result = get_executor("custom").call(run_inference, payload, priority=get_settings().priority_class("custom_job"))
+        token.raise_if_cancelled()  # executor 대기/실행 중 취소된 작업은 결과를 버리고 cancelled 로
+        return result
+
+    try:
+        job = get_job_manager().submit("customization", _run)
+    except JobQueueFull as e:
+        raise too_many_requests(str(e), retry_after=5)
+    return JobSubmitResponse(status="success", job_id=job["job_id"], job_status=job["status"])
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse, response_model_exclude_none=True,
+            summary="커스텀 작업 상태/결과 조회")
+def get_customization_job(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None or job.get("kind") != "customization":
+        raise not_found(f"job을 찾을 수 없습니다(만료되었을 수 있음): {job_id}")
+    return JobStatusResponse(**job_to_response(job))
+
+
+@router.delete("/jobs/{job_id}", response_model=JobStatusResponse, response_model_exclude_none=True,
+               summary="커스텀 작업 취소")
+def cancel_customization_job(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None or job.get("kind") != "customization":
+        raise not_found(f"job을 찾을 수 없습니다(만료되었을 수 있음): {job_id}")
+    return JobStatusResponse(**job_to_response(get_job_manager().cancel(job_id) or job))
@@ -1,6 +1,7 @@
 # api/feedback.py
 from fastapi import APIRouter, HTTPException
 from schemas import FeedbackRequest, FeedbackResponse
+from utils.executors import run_model
 
 router = APIRouter(prefix="/feedback", tags=["Feedback"])
 
@@ -18,8 +19,8 @@ async def generate_feedback(request: FeedbackRequest) -> FeedbackResponse:
         # 요청 데이터를 dict로 변환하여 service에 전달
         payload = request.model_dump()
 
-        # 서비스 호출
-        result = run_inference(payload)
+        # 서비스 호출 (LLM executor)
+        result = await run_model("llm", run_inference, payload, endpoint="feedback")
 
         # 성공 처리
         if result.get("status") == "success":
@@ -1,5 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from config import get_settings
+from model_manager.preloader import get_preloader
+from model_manager.registry import registry_stats
+from service.image_service import image_store_stats
+from service.speculation_service import speculation_stats
+from utils.executors import executor_stats, scheduler_stats
+from utils.singleflight import singleflight_stats
+from utils.stages import stage_stats
+from utils.tiered_cache import cache_stats
 import time
 router = APIRouter(tags=["Health"])
 _started = time.time()
@@ -9,12 +17,31 @@ def health():
     return {"status": "ok", "uptime_sec": round(time.time() - _started, 1)}
 
 @router.get("/ready")
-def ready():
+def ready(response: Response):
+    """설정 점검 + 모델 프리로드/웜업 상태. 준비되지 않았으면 503"""
     s = get_settings()
     checks = s.readiness_checks()
-    return {"ready": all(checks.values()), "checks": checks}
+    preloader = get_preloader()
+    is_ready = all(checks.values()) and preloader.ready
+    if not is_ready:
+        response.status_code = 503
+    return {"ready": is_ready, "checks": checks, "models": preloader.status()}
 
 @router.get("/version")
 def version():
     s = get_settings()
     return {"service": "Beautiq AI-BE", "version": s.SERVICE_VERSION, "commit": s.COMMIT_SHA, "env": s.APP_ENV}
+
+@router.get("/metrics")
+def metrics():
+    """executor별 대기 깊이/대기 시간, 우선순위 클래스별 SLO 달성률 등 모니터링 지표"""
+    return {
+        "executors": executor_stats(),
+        "scheduler": scheduler_stats(),
+        "singleflight": singleflight_stats(),
+        "caches": cache_stats(),
+        "models": registry_stats(),
+        "stages": stage_stats(),
+        "speculation": speculation_stats(),
+        "images": image_store_stats(),
+    }
@@ -0,0 +1,24 @@
+# api/images.py
+"""
+이미지 업로드 API
+POST /v1/images - 이미지를 한 번 올려 image_id(원본 sha256)를 받는다.
+  이후 NIA(image_id) / Style(source_image_id) / Makeup(source_image_id, style_image_id) /
+  Customization(base_image_id) / Pipeline(image_id) 요청에서 base64 대신 사용 (TTL: IMAGE_STORE_TTL_SEC)
+"""
+from fastapi import APIRouter
+from starlette.concurrency import run_in_threadpool
+from schemas import ImageUploadRequest, ImageUploadResponse
+from service.image_service import upload_image
+
+router = APIRouter(prefix="/images", tags=["Images"])
+
+
+@router.post("", response_model=ImageUploadResponse, response_model_exclude_none=True, summary="이미지 업로드(image_id 발급)")
+async def upload(request: ImageUploadRequest) -> ImageUploadResponse:
+    try:
+        info = await run_in_threadpool(upload_image, request.image_base64)
+        return ImageUploadResponse(status="success", **info)
+    except ValueError as e:
+        return ImageUploadResponse(status="error", message=str(e))
+    except Exception as e:
+        return ImageUploadResponse(status="error", message=f"이미지 업로드 처리 중 오류: {str(e)}")
@@ -1,47 +1,126 @@
 # api/makeup.py
-from fastapi import APIRouter
-from schemas import MakeupRequest, MakeupResponse
-from service.makeup_service import run_inference
-from io import BytesIO
-from PIL import Image
+import asyncio
+from functools import partial
+
+from fastapi import APIRouter, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+from schemas import MakeupRequest, MakeupResponse, JobSubmitResponse, JobStatusResponse
+from service.job_service import get_job_manager, job_to_response, JobQueueFull
+from config import get_settings
+from utils.cancellation import CancellationToken, InferenceCancelled
+from utils.errors import not_found, too_many_requests
+from utils.executors import get_executor, run_model
+from service.image_service import load_image
 import base64
-import torch  # ✅ 추가
 
 router = APIRouter(prefix="/makeup", tags=["Makeup"])
 
-def _b64_to_pil(b64: str) -> Image.Image:
-    from io import BytesIO
-    return Image.open(BytesIO(base64.b64decode(b64))).convert("RGB")
 
-@router.post("/simulate", response_model=MakeupResponse, response_model_exclude_none=True)
-async def simulate(req: MakeupRequest):
+def _inference_kwargs(req: MakeupRequest) -> dict:
+    """요청 → run_inference_encoded 인자 (이미지 디코딩 포함, image_id 는 업로드 저장소에서)"""
+    import torch  # 첫 요청 시 import (서버 기동 시간 단축)
+    return dict(
+        id_image=load_image(req.source_image_base64, req.source_image_id),
+        makeup_image=load_image(req.style_image_base64, req.style_image_id),
+        guidance_scale=getattr(req, "guidance", 1.6),
+        size=getattr(req, "resolution", 512),
+        num_inference_steps=getattr(req, "steps", 30),
+        seed=getattr(req, "seed", None),
+        face_crop=getattr(req, "face_crop", False),
+        quality=getattr(req, "quality", "final"),
+        strength=getattr(req, "strength", 1.0),
+        device="cuda" if torch.cuda.is_available() else "cpu",  # ✅ torch 사용 가능
+    )
+
+
+async def _run_until_disconnected(request: Request, token: CancellationToken, fn):
+    """
+    블로킹 추론(fn)을 makeup executor에서 실행하면서 클라이언트 연결 상태를 주기적으로 확인.
+    연결이 끊기면 토큰을 취소 → 디퓨전 루프가 다음 step에서 중단된다.
+    (대기열이 가득 차면 HTTP 429)
+    """
+    poll = get_settings().DISCONNECT_POLL_SEC
+    task = asyncio.ensure_future(run_model("makeup", fn))
     try:
-        # 입력 검증
-        if not req.source_image_base64:
-            return MakeupResponse(
-                status="error", message="source_image_base64가 필요합니다."
-            )
-        if not req.style_image_base64:
-            return MakeupResponse(
-                status="error", message="style_image_base64가 필요합니다."
-            )
+        while not task.done():
+            await asyncio.wait({task}, timeout=poll)
+            if not task.done() and await request.is_disconnected():
+                token.cancel("client_disconnected")
+    except asyncio.CancelledError:
+        token.cancel("client_disconnected")
+        raise
+    return await task
 
-        id_img = _b64_to_pil(req.source_image_base64)
-        ref_img = _b64_to_pil(req.style_image_base64)
 
-        result_img = run_inference(
-            id_image=id_img,
-            makeup_image=ref_img,
-            guidance_scale=getattr(req, "guidance", 1.6),
-            size=getattr(req, "resolution", 512),
-            num_inference_steps=getattr(req, "steps", 30),
-            seed=getattr(req, "seed", None),
-            device="cuda" if torch.cuda.is_available() else "cpu",  # ✅ torch 사용 가능
-        )
+@router.post("/simulate", response_model=MakeupResponse, response_model_exclude_none=True)
+async def simulate(req: MakeupRequest, request: Request):
+    timeout = get_settings().MAKEUP_REQUEST_TIMEOUT_SEC
+    token = CancellationToken(timeout=timeout if timeout > 0 else None)
+    try:
+        # 입력 검증(이미지 누락)은 MakeupRequest 스키마에서 422로 처리
+        from service.makeup_service import run_inference_encoded, lookup_cached_result
+        kwargs = await run_in_threadpool(_inference_kwargs, req)
 
-        buf = BytesIO()
-        result_img.save(buf, format="PNG")
-        return MakeupResponse(status="success", result_image_base64=base64.b64encode(buf.getvalue()).decode())
+        # seed 고정 요청은 결과 캐시부터 확인 (히트 시 executor 대기 없이 반환)
+        png = await run_in_threadpool(lookup_cached_result, **kwargs)
+        if png is None:
+            png = await _run_until_disconnected(request, token, partial(
+                run_inference_encoded, **kwargs, cancel_token=token,
+            ))
 
+        return MakeupResponse(status="success", result_image_base64=base64.b64encode(png).decode())
+
+    except HTTPException:
+        raise
+    except InferenceCancelled as e:
+        return MakeupResponse(status="error", message=e.message)
     except Exception as e:
         return MakeupResponse(status="error", message=f"Internal Server Error: {e}")
+
+
+# ------------------------------------------------------------
+# 비동기 Job API
+# ------------------------------------------------------------
+def _makeup_job(req: MakeupRequest):
+    """job 워커에서 실행될 함수(fn(token) -> 결과 dict)"""
+    def _run(token: CancellationToken) -> dict:
+        from service.makeup_service import run_inference_encoded, lookup_cached_result
+        kwargs = _inference_kwargs(req)
+        png = lookup_cached_result(**kwargs)
+        if png is None:
+            png = get_executor("makeup").call(
+                run_inference_encoded,
+                priority=get_settings().priority_class("makeup_job"),
+                **kwargs,
+                cancel_token=token,
+            )
+        return {"status": "success", "result_image_base64": base64.b64encode(png).decode()}
+    return _run
+
+
+@router.post("/jobs", response_model=JobSubmitResponse, response_model_exclude_none=True, status_code=202,
+             summary="메이크업 전이 작업 등록(비동기)")
+def submit_makeup_job(req: MakeupRequest):
+    try:
+        job = get_job_manager().submit("makeup", _makeup_job(req))
+    except JobQueueFull as e:
+        raise too_many_requests(str(e), retry_after=5)
+    return JobSubmitResponse(status="success", job_id=job["job_id"], job_status=job["status"])
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse, response_model_exclude_none=True,
+            summary="메이크업 작업 상태/결과 조회")
+def get_makeup_job(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None or job.get("kind") != "makeup":
+        raise not_found(f"job을 찾을 수 없습니다(만료되었을 수 있음): {job_id}")
+    return JobStatusResponse(**job_to_response(job))
+
+
+@router.delete("/jobs/{job_id}", response_model=JobStatusResponse, response_model_exclude_none=True,
+               summary="메이크업 작업 취소")
+def cancel_makeup_job(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None or job.get("kind") != "makeup":
+        raise not_found(f"job을 찾을 수 없습니다(만료되었을 수 있음): {job_id}")
+    return JobStatusResponse(**job_to_response(get_job_manager().cancel(job_id) or job))
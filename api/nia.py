@@ -3,8 +3,9 @@
 NIA 피부 분석 API
 POST /v1/nia/analyze - 얼굴 이미지 기반 피부 상태 분석
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from schemas import NIARequest, NIAResponse
+from utils.executors import run_model
 import sys
 from pathlib import Path
 
@@ -21,7 +22,7 @@ async def analyze_skin(request: NIARequest) -> NIAResponse:
 
         # 1. 피부 분석 실행
         payload = request.model_dump()
-        result = run_inference(payload)
+        result = await run_model("nia", run_inference, payload)
 
         if result.get("status") != "success":
             return NIAResponse(
@@ -42,7 +43,11 @@ async def analyze_skin(request: NIARequest) -> NIAResponse:
         }
 
         # 3. 피드백 생성 실행
-        feedback_result = feedback_inference(feedback_payload)
+        try:
+            feedback_result = await run_model("llm", feedback_inference, feedback_payload, endpoint="nia")
+        except HTTPException:
+            # LLM 대기열 포화 시 피드백 없이 분석 결과만 반환
+            feedback_result = {}
         feedback_text = None
 
         if feedback_result.get("status") == "success":
@@ -53,6 +58,8 @@ async def analyze_skin(request: NIARequest) -> NIAResponse:
             status="success", predictions=predictions, feedback=feedback_text
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
         return NIAResponse(status="error", message=str(e))
     except Exception as e:
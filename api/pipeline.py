@@ -0,0 +1,40 @@
+# api/pipeline.py
+"""
+전체 파이프라인 API
+POST /v1/pipeline/run - 얼굴 이미지 1회 업로드로 NIA / Feedback / Product / Style / Makeup / Customization 실행
+  stream=true(기본): 단계가 끝나는 순서대로 한 줄씩 JSON (application/x-ndjson), 마지막 줄은 stage="pipeline" 요약
+  stream=false: 모든 단계를 모아 PipelineResponse 로 응답
+"""
+import json
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from schemas import PipelineRequest, PipelineResponse, PipelineStageResult
+from service.pipeline_service import run_pipeline
+
+router = APIRouter(prefix="/pipeline", tags=["Pipeline"])
+
+
+@router.post("/run", response_model=PipelineResponse, response_model_exclude_none=True,
+             summary="전체 파이프라인 실행(단계별 스트리밍)")
+async def run(req: PipelineRequest, request: Request):
+    if req.stream:
+        async def _ndjson():
+            events = run_pipeline(req)
+            try:
+                async for event in events:
+                    if await request.is_disconnected():
+                        break
+                    yield json.dumps(event, ensure_ascii=False) + "\n"
+            finally:
+                await events.aclose()  # 이탈 시 남은 단계 취소
+
+        return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+    stages, summary = {}, {}
+    async for event in run_pipeline(req):
+        if event["stage"] == "pipeline":
+            summary = event
+        else:
+            stages[event["stage"]] = PipelineStageResult(**event)
+    return PipelineResponse(status=summary.get("status", "error"), stages=stages, timings=summary.get("timings", {}))
@@ -3,8 +3,9 @@
 Product 제품 추천 이유 생성 API
 POST /v1/product/reason - LLM 기반 개인화 제품 추천 이유 생성
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from schemas import ProductRequest, ProductResponse
+from utils.executors import run_model
 import sys
 from pathlib import Path
 
@@ -16,7 +17,7 @@ router = APIRouter(prefix="/product", tags=["Product - 제품 추천"])
 async def generate_recommendation_reason(request: ProductRequest) -> ProductResponse:
     try:
         from service.product_service import run_inference
-        result = run_inference(request.model_dump())
+        result = await run_model("llm", run_inference, request.model_dump(), endpoint="product")
 
         if result.get("status") == "success":
             return ProductResponse(status="success", recommendations=result.get("recommendations", []))
@@ -27,6 +28,8 @@ async def generate_recommendation_reason(request: ProductRequest) -> ProductResp
             error_code=result.get("error_code", "UNKNOWN_ERROR"),
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
         return ProductResponse(status="error", message=str(e), error_code="INVALID_REQUEST")
     except Exception as e:
@@ -8,6 +8,8 @@ from api.product import router as product_router
 from api.style import router as style_router
 from api.makeup import router as makeup_router
 from api.customization import router as customization_router
+from api.pipeline import router as pipeline_router
+from api.images import router as images_router
 
 api_router = APIRouter()
 api_router.include_router(health_router)          # /health, /ready, /version
@@ -17,3 +19,5 @@ api_router.include_router(product_router)         # /product/...
 api_router.include_router(style_router)           # /style/...
 api_router.include_router(makeup_router)          # /makeup/...
 api_router.include_router(customization_router)   # /custom/...
+api_router.include_router(pipeline_router)        # /pipeline/...
+api_router.include_router(images_router)          # /images
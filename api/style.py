@@ -1,26 +1,35 @@
 # api/style.py
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from schemas import StyleRequest, StyleResponse, StyleResult
+from utils.executors import run_model
 import os
 
 router = APIRouter(prefix="/style", tags=["Style Recommendation"])
 
 @router.post("/recommend", response_model=StyleResponse, response_model_exclude_none=True)
-def recommend_style(request: StyleRequest):
+async def recommend_style(request: StyleRequest):
     try:
         from service.style_service import run_inference
         json_dir = os.path.join("data", "style-recommendation")
         if not os.path.exists(json_dir):
             return StyleResponse(status="error", message="데이터 경로를 찾을 수 없습니다: data/style-recommendation")
 
-        svc = run_inference(request.model_dump(), json_dir=json_dir)
+        svc = await run_model("style", run_inference, request.model_dump(), json_dir=json_dir)
 
         if svc.get("status") != "success":
             return StyleResponse(status="error", message=svc.get("message", "스타일 추천 실패"))
 
         results_out = [StyleResult(style_id=r.get("style_id",""), style_image_base64=r.get("style_image_base64","")) 
                        for r in svc.get("results", [])[:3]]
+
+        # 다음 단계(/makeup/simulate, Top-1 스타일) 대비 추측 실행 (opt-in, 유휴 시에만)
+        if results_out:
+            from service.speculation_service import speculate_after_style
+            speculate_after_style(request.source_image_base64, results_out[0].style_image_base64,
+                                  source_image_id=request.source_image_id)
         return StyleResponse(status="success", results=results_out)
 
+    except HTTPException:
+        raise
     except Exception as e:
         return StyleResponse(status="error", message=f"스타일 추천 처리 중 오류: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""
+메이크업 모델 번들 굽기 (오프라인 배포용 단일 아티팩트)
+- SD1.5 + 메이크업 체크포인트 + CLIP-L 을 조립한 파이프라인을 목표 dtype으로
+  <out>/<version>/{manifest.json, model.safetensors, 설정 파일들} 에 저장
+- 서버는 MAKEUP_BUNDLE_DIR=<out>/<version> 으로 실행하면 번들만으로 로드 (HF Hub 접근 없음)
+
+실행: python bake_makeup_bundle.py [--out ./checkpoints/bundles] [--dtype float16] [--version stable-makeup-sd15-v1]
+"""
+import argparse
+
+import torch
+
+from model_manager.makeup_bundle import bake_bundle, load_bundle
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", default="./checkpoints/bundles")
+    ap.add_argument("--model-id", default="runwayml/stable-diffusion-v1-5")
+    ap.add_argument("--checkpoint-dir", default="./checkpoints/makeup")
+    ap.add_argument("--image-encoder-dir", default="./models/image_encoder_l")
+    ap.add_argument("--dtype", default="float16", choices=["float16", "bfloat16", "float32"])
+    ap.add_argument("--version", default=None, help="기본: MAKEUP_MODEL_VERSION")
+    ap.add_argument("--check", action="store_true", help="굽고 나서 번들을 CPU로 다시 로드해 확인")
+    args = ap.parse_args()
+
+    bundle_dir = bake_bundle(
+        args.out,
+        model_id=args.model_id,
+        checkpoint_path=args.checkpoint_dir,
+        image_encoder_path=args.image_encoder_dir,
+        dtype=getattr(torch, args.dtype),
+        version=args.version,
+    )
+    if args.check:
+        load_bundle(bundle_dir, device="cpu", verify=True)
+    print(f"\nMAKEUP_BUNDLE_DIR={bundle_dir}")
+
+
+if __name__ == "__main__":
+    main()
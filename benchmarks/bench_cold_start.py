@@ -0,0 +1,77 @@
+# benchmarks/bench_cold_start.py
+"""
+메이크업 모델 콜드 스타트 측정 (변경 전/후 비교)
+- 모드마다 새 프로세스에서 load_model()을 호출해 import / 로드 시간과 최대 RSS를 잰다.
+  before: MAKEUP_WEIGHTS_FORMAT=bin, MAKEUP_FAST_INIT=0 (pickle 전체 로드 + from_unet 초기화 + HF CLIP 경유)
+  after : MAKEUP_WEIGHTS_FORMAT=auto, MAKEUP_FAST_INIT=1 (safetensors mmap + meta 디바이스 생성)
+- after 모드는 convert_checkpoints.py 로 .safetensors 를 만든 뒤 실행할 것
+- OS 페이지 캐시 영향을 줄이려면 --repeat 로 여러 번 돌려 중앙값을 본다.
+
+실행: python -m benchmarks.bench_cold_start [--device cuda] [--repeat 3] [--modes before,after]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    "before": {"MAKEUP_WEIGHTS_FORMAT": "bin", "MAKEUP_FAST_INIT": "0"},
+    "after": {"MAKEUP_WEIGHTS_FORMAT": "auto", "MAKEUP_FAST_INIT": "1"},
+}
+
+CHILD = r"""
+import json, resource, sys, time
+t0 = time.perf_counter()
+import torch
+from model_manager.makeup_manager import load_model
+t1 = time.perf_counter()
+load_model(device=sys.argv[1])
+if sys.argv[1] == "cuda":
+    torch.cuda.synchronize()
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_sec": t1 - t0,
+    "load_sec": t2 - t1,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "gpu_peak_mb": torch.cuda.max_memory_allocated() / 2**20 if sys.argv[1] == "cuda" else None,
+}))
+"""
+
+
+def run_once(mode: str, device: str) -> dict:
+    env = dict(os.environ, **MODES[mode])
+    proc = subprocess.run([sys.executable, "-c", CHILD, device], cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(proc.stderr[-3000:])
+        raise SystemExit(f"{mode}: load_model 실패")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--device", default="cuda")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--modes", default="before,after")
+    args = ap.parse_args()
+
+    summary = {}
+    for mode in args.modes.split(","):
+        runs = [run_once(mode, args.device) for _ in range(args.repeat)]
+        summary[mode] = {
+            key: round(statistics.median(r[key] for r in runs), 3)
+            for key in runs[0] if runs[0][key] is not None
+        }
+        print(f"[{mode}] " + " ".join(f"{k}={v}" for k, v in summary[mode].items()))
+
+    if "before" in summary and "after" in summary:
+        b, a = summary["before"], summary["after"]
+        print(f"[cold start] load {b['load_sec']:.1f}s → {a['load_sec']:.1f}s "
+              f"(x{b['load_sec'] / a['load_sec']:.2f}), max RSS {b['max_rss_mb']:.0f} → {a['max_rss_mb']:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_cpu_step.py
+"""
+CPU 실행 프로파일별 디퓨전 step 지연 측정
+- 프로파일마다 새 프로세스에서 device=cpu 로 모델을 로드하고 합성 이미지로 generate()를 실행
+- 매 step 콜백 사이 간격을 step 지연으로 기록 (첫 step은 워밍업/컴파일이 섞이므로 제외)
+- 결과: 프로파일별 step 지연 중앙값 / p90 (ms), fp32 대비 배율
+
+실행: python -m benchmarks.bench_cpu_step [--steps 10] [--size 512] [--profiles fp32,bf16,bf16-cl,bf16-cl-compile]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILES = {
+    "fp32": {"MAKEUP_CPU_DTYPE": "float32", "MAKEUP_CPU_CHANNELS_LAST": "0", "MAKEUP_CPU_COMPILE": "0"},
+    "bf16": {"MAKEUP_CPU_DTYPE": "bfloat16", "MAKEUP_CPU_CHANNELS_LAST": "0", "MAKEUP_CPU_COMPILE": "0"},
+    "bf16-cl": {"MAKEUP_CPU_DTYPE": "bfloat16", "MAKEUP_CPU_CHANNELS_LAST": "1", "MAKEUP_CPU_COMPILE": "0"},
+    "bf16-cl-compile": {"MAKEUP_CPU_DTYPE": "bfloat16", "MAKEUP_CPU_CHANNELS_LAST": "1", "MAKEUP_CPU_COMPILE": "1"},
+}
+
+CHILD = r"""
+import json, sys, time
+import numpy as np
+from PIL import Image
+from model_manager.makeup_manager import load_model, active_profile
+
+steps, size = int(sys.argv[1]), int(sys.argv[2])
+pipeline, makeup_encoder = load_model(device="cpu")
+rng = np.random.default_rng(0)
+face = Image.fromarray(rng.integers(0, 255, (size, size, 3), dtype=np.uint8))
+pose = Image.new("RGB", (size, size))
+
+marks = []
+def on_step(step, timestep, latents):
+    marks.append(time.perf_counter())
+
+t0 = time.perf_counter()
+makeup_encoder.generate(
+    id_image=[face, pose], makeup_image=face, pipe=pipeline,
+    num_inference_steps=steps, seed=0, callback=on_step, callback_steps=1,
+)
+total = time.perf_counter() - t0
+step_ms = [(b - a) * 1000 for a, b in zip(marks, marks[1:])]
+print(json.dumps({"profile": active_profile(), "step_ms": step_ms, "total_sec": total}))
+"""
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    idx = min(len(values) - 1, max(0, round(q * (len(values) - 1))))
+    return values[idx]
+
+
+def run_profile(name: str, steps: int, size: int) -> dict:
+    env = dict(os.environ, **PROFILES[name])
+    proc = subprocess.run([sys.executable, "-c", CHILD, str(steps), str(size)],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(proc.stderr[-3000:])
+        raise SystemExit(f"{name}: 실행 실패")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--steps", type=int, default=10)
+    ap.add_argument("--size", type=int, default=512)
+    ap.add_argument("--profiles", default=",".join(PROFILES))
+    args = ap.parse_args()
+
+    summary = {}
+    for name in args.profiles.split(","):
+        r = run_profile(name, args.steps, args.size)
+        ms = r["step_ms"]
+        summary[name] = {"p50_ms": percentile(ms, 0.5), "p90_ms": percentile(ms, 0.9)}
+        print(f"[{name}] step p50={summary[name]['p50_ms']:.0f}ms p90={summary[name]['p90_ms']:.0f}ms "
+              f"total={r['total_sec']:.1f}s profile={r['profile']}")
+
+    if "fp32" in summary:
+        base = summary["fp32"]["p50_ms"]
+        for name, s in summary.items():
+            print(f"  {name:>16}: x{base / s['p50_ms']:.2f} vs fp32")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/bench_import_time.py
+"""
+서버 기동 비용 측정 (import-time 예산)
+- `python -X importtime -c "import main"` 을 새 프로세스에서 실행해
+  main(app) import 누적 시간을 측정하고, 예산을 넘으면 종료 코드 1
+- 무거운 스택(torch, diffusers, spiga, facelib, transformers, mediapipe, google.generativeai)이
+  import 시점에 로드되면 실패로 처리 (모델 생성은 모두 첫 사용 시점으로 미뤄져 있어야 함)
+- 별도 프로세스에서 app import 후 첫 /health 응답까지의 시간도 출력
+
+실행: python -m benchmarks.bench_import_time [--budget-ms 1000] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = (
+    "torch", "torchvision", "diffusers", "transformers", "spiga", "facelib",
+    "mediapipe", "google.generativeai", "matplotlib", "pandas",
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr: str) -> list:
+    """[(self_us, cumulative_us, module)] — importtime 출력 파싱"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cum_us), name.strip()))
+    return rows
+
+
+def measure_import(runs: int) -> tuple:
+    """가장 빠른 run 기준 (main 누적 us, 로드된 모듈 행)"""
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import main"],
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(proc.stderr[-2000:])
+            raise SystemExit(f"import main 실패 (exit {proc.returncode})")
+        rows = parse_importtime(proc.stderr)
+        total = next(cum for _, cum, name in rows if name == "main")
+        if best is None or total < best[0]:
+            best = (total, rows)
+    return best
+
+
+def measure_health() -> tuple:
+    """(import 시간 ms, 첫 /health 응답 시간 ms) — 새 프로세스에서 측정"""
+    code = (
+        "import time; t0 = time.perf_counter(); import main; t1 = time.perf_counter();"
+        "from fastapi.testclient import TestClient;"
+        "r = TestClient(main.app).get('/health'); t2 = time.perf_counter();"
+        "assert r.status_code == 200, r.text;"
+        "print(f'{(t1 - t0) * 1000:.1f} {(t2 - t1) * 1000:.1f}')"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        raise SystemExit("/health 측정 실패")
+    imp, health = proc.stdout.split()
+    return float(imp), float(health)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "1000")))
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--top", type=int, default=15)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    total_us, rows = measure_import(args.runs)
+    total_ms = total_us / 1000
+
+    print(f"[import] main: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms, best of {args.runs})")
+    print(f"[import] 누적 시간 상위 {args.top} 모듈 (self ms / cumulative ms)")
+    for self_us, cum_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} {cum_us / 1000:8.1f}  {name}")
+
+    loaded = {name for _, _, name in rows}
+    heavy = [m for m in HEAVY_MODULES if m in loaded]
+
+    imp_ms, health_ms = measure_health()
+    print(f"[health] import {imp_ms:.1f} ms + 첫 /health {health_ms:.1f} ms")
+    print(f"[bench] elapsed {time.perf_counter() - t0:.1f}s")
+
+    ok = True
+    if heavy:
+        print(f"FAIL: import 시점에 무거운 모듈이 로드됨: {', '.join(heavy)}")
+        ok = False
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import 시간 {total_ms:.1f} ms > 예산 {args.budget_ms:.0f} ms")
+        ok = False
+    if ok:
+        print("OK")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# benchmarks/bench_pose_render.py
+"""
+포즈 맵 렌더러 비교 (OpenCV 래스터 vs 기존 matplotlib)
+- 픽셀 차이: 두 렌더러 출력의 평균 절대 오차 / 크게 다른 픽셀 비율 → 기준 초과 시 종료 코드 1
+- 마이크로 벤치마크: 렌더 1회당 평균 시간(ms)
+
+실행: python -m benchmarks.bench_pose_render [--size 512] [--iters 50]
+"""
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+
+from libs.pose_render import render_pose, render_pose_matplotlib
+
+
+def synthetic_landmarks(size: int, cx: float = None, cy: float = None, scale: float = None) -> list:
+    """테스트용 68점 얼굴 랜드마크 (300W 배치 순서)"""
+    cx = size / 2 if cx is None else cx
+    cy = size / 2 if cy is None else cy
+    s = size * 0.3 if scale is None else scale
+    pts = []
+    # 0-16 턱선
+    for i in range(17):
+        t = math.pi * (0.05 + 0.9 * i / 16)
+        pts.append((cx - s * math.cos(t), cy + s * 0.2 + s * 0.9 * math.sin(t) - s * 0.2))
+    # 17-26 눈썹
+    for side in (-1, 1):
+        for i in range(5):
+            x = cx + s * (0.15 + 0.12 * i) if side > 0 else cx - s * (0.63 - 0.12 * i)
+            pts.append((x, cy - s * 0.45 - s * 0.08 * math.sin(math.pi * i / 4)))
+    # 27-30 콧대, 31-35 콧볼
+    for i in range(4):
+        pts.append((cx, cy - s * 0.3 + s * 0.12 * i))
+    for i in range(5):
+        pts.append((cx - s * 0.16 + s * 0.08 * i, cy + s * 0.2))
+    # 36-47 눈
+    for ex in (cx - s * 0.38, cx + s * 0.38):
+        for i in range(6):
+            t = 2 * math.pi * i / 6
+            pts.append((ex - s * 0.13 * math.cos(t), cy - s * 0.25 - s * 0.06 * math.sin(t)))
+    # 48-59 바깥 입술, 60-67 안쪽 입술
+    for i in range(12):
+        t = 2 * math.pi * i / 12
+        pts.append((cx - s * 0.3 * math.cos(t), cy + s * 0.5 - s * 0.12 * math.sin(t)))
+    for i in range(8):
+        t = 2 * math.pi * i / 8
+        pts.append((cx - s * 0.2 * math.cos(t), cy + s * 0.5 - s * 0.04 * math.sin(t)))
+    assert len(pts) == 68
+    return [list(p) for p in pts]
+
+
+def pixel_diff(a, b) -> dict:
+    """
+    mean_abs: 전체 평균 절대 오차
+    differing_px_ratio: 채널 최대 차이가 64를 넘는 픽셀 비율
+    tolerant_ratio: 1px 이동을 허용했을 때도 다른(안티앨리어싱 경계가 아닌) 픽셀의 비율 (그려진 영역 기준)
+    """
+    a = np.asarray(a, dtype=np.int16)
+    b = np.asarray(b, dtype=np.int16)
+    diff = np.abs(a - b).max(axis=2)
+    drawn = (a.max(axis=2) > 0) | (b.max(axis=2) > 0)
+
+    h, w = diff.shape
+    pad = np.pad(b, ((1, 1), (1, 1), (0, 0)), mode="edge")
+    tol = np.full(diff.shape, 255, dtype=np.int16)
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            shifted = pad[dy:dy + h, dx:dx + w]
+            tol = np.minimum(tol, np.abs(a - shifted).max(axis=2))
+    return {
+        "mean_abs": float(np.abs(a - b).mean()),
+        "differing_px_ratio": float((diff > 64).mean()),
+        "tolerant_ratio": float((tol[drawn] > 64).mean()) if drawn.any() else 0.0,
+    }
+
+
+def bench(fn, landmarks, size: int, iters: int) -> float:
+    fn(landmarks, size=size)  # 웜업
+    t0 = time.perf_counter()
+    for _ in range(iters):
+        fn(landmarks, size=size)
+    return (time.perf_counter() - t0) / iters * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=512)
+    ap.add_argument("--iters", type=int, default=50)
+    ap.add_argument("--max-mean-abs", type=float, default=4.0, help="허용 평균 절대 오차(0~255)")
+    ap.add_argument("--max-tolerant-ratio", type=float, default=0.02,
+                    help="1px 허용 후에도 크게 다른 픽셀 비율 상한(그려진 영역 기준)")
+    args = ap.parse_args()
+
+    size = args.size
+    faces = [
+        synthetic_landmarks(size),
+        synthetic_landmarks(size, cx=size * 0.3, cy=size * 0.35, scale=size * 0.12),
+    ]
+
+    ok = True
+    for name, landmarks in (("1 face", faces[:1]), ("2 faces", faces)):
+        new = render_pose(landmarks, size=size)
+        old = render_pose_matplotlib(landmarks, size=size)
+        d = pixel_diff(new, old)
+        passed = d["mean_abs"] <= args.max_mean_abs and d["tolerant_ratio"] <= args.max_tolerant_ratio
+        ok &= passed
+        print(f"[diff] {name}: mean_abs={d['mean_abs']:.3f} "
+              f"differing_px={d['differing_px_ratio']:.4f} "
+              f"tolerant={d['tolerant_ratio']:.4f} -> {'OK' if passed else 'FAIL'}")
+
+    t_new = bench(render_pose, faces[:1], size, args.iters)
+    t_old = bench(render_pose_matplotlib, faces[:1], size, max(1, args.iters // 5))
+    print(f"[time] opencv={t_new:.3f}ms matplotlib={t_old:.3f}ms speedup=x{t_old / t_new:.1f}")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# benchmarks/bench_quantize.py
+"""
+CPU int8 동적 양자화 모드 비교 (float32 vs MAKEUP_QUANTIZE=int8)
+- 모드마다 새 프로세스에서 device=cpu 로 모델을 로드하고 같은 입력/시드로 generate() 실행
+- 속도: 전체 추론 시간, step 지연 중앙값 (첫 step 제외) → float 대비 배율
+- 메모리: 최대 RSS, 양자화 대상 모델(UNet / ControlNet / CLIP-L) 가중치 직렬화 크기
+- 품질: 두 결과 이미지의 PSNR / 평균 절대 오차 → PSNR이 --min-psnr 미만이면 종료 코드 1
+
+실행: python -m benchmarks.bench_quantize [--id data/inference.jpg] [--ref ref.jpg] [--steps 20] [--size 512]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    "float32": {"MAKEUP_QUANTIZE": "", "MAKEUP_CPU_DTYPE": "float32", "MAKEUP_CPU_COMPILE": "0", "MAKEUP_COMPILE": "0"},
+    "int8": {"MAKEUP_QUANTIZE": "int8", "MAKEUP_CPU_COMPILE": "0", "MAKEUP_COMPILE": "0"},
+}
+
+CHILD = r"""
+import io, json, resource, sys, time
+import torch
+from PIL import Image
+from model_manager.makeup_manager import load_model, active_profile
+from service.makeup_service import get_landmark_engine, resize_with_padding
+from libs.spiga_draw import get_draw
+
+id_path, ref_path, out_path, steps, size = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4]), int(sys.argv[5])
+id_img = resize_with_padding(Image.open(id_path).convert("RGB"), target=size)
+ref_img = resize_with_padding(Image.open(ref_path).convert("RGB"), target=size)
+pose = get_draw(id_img, size=size, engine=get_landmark_engine())
+
+pipeline, makeup_encoder = load_model(device="cpu")
+
+def serialized_mb(module):
+    buf = io.BytesIO()
+    torch.save(module.state_dict(), buf)
+    return buf.tell() / 2**20
+
+weights_mb = serialized_mb(pipeline.unet) + serialized_mb(makeup_encoder.image_encoder)
+weights_mb += sum(serialized_mb(net) for net in pipeline.controlnet.nets)
+
+marks = []
+def on_step(step, timestep, latents):
+    marks.append(time.perf_counter())
+
+t0 = time.perf_counter()
+result = makeup_encoder.generate(
+    id_image=[id_img, pose], makeup_image=ref_img, pipe=pipeline,
+    num_inference_steps=steps, seed=0, callback=on_step, callback_steps=1,
+)
+total = time.perf_counter() - t0
+result.save(out_path)
+print(json.dumps({
+    "profile": active_profile(),
+    "total_sec": total,
+    "step_ms": [(b - a) * 1000 for a, b in zip(marks, marks[1:])],
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "weights_mb": weights_mb,
+}))
+"""
+
+
+def run_mode(mode: str, id_path: str, ref_path: str, out_path: str, steps: int, size: int) -> dict:
+    env = dict(os.environ, **MODES[mode])
+    proc = subprocess.run([sys.executable, "-c", CHILD, id_path, ref_path, out_path, str(steps), str(size)],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(proc.stderr[-3000:])
+        raise SystemExit(f"{mode}: 실행 실패")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def image_similarity(a_path: str, b_path: str) -> dict:
+    a = np.asarray(Image.open(a_path).convert("RGB"), dtype=np.float64)
+    b = np.asarray(Image.open(b_path).convert("RGB"), dtype=np.float64)
+    mse = float(np.mean((a - b) ** 2))
+    psnr = float("inf") if mse == 0 else 10 * np.log10(255.0 ** 2 / mse)
+    return {"psnr_db": round(psnr, 2), "mean_abs": round(float(np.mean(np.abs(a - b))), 2)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--id", default="data/inference.jpg", help="대상 얼굴 이미지")
+    ap.add_argument("--ref", default=None, help="참조 메이크업 이미지 (기본: --id 와 동일)")
+    ap.add_argument("--steps", type=int, default=20)
+    ap.add_argument("--size", type=int, default=512)
+    ap.add_argument("--min-psnr", type=float, default=25.0)
+    args = ap.parse_args()
+
+    id_path = os.path.abspath(args.id)
+    ref_path = os.path.abspath(args.ref or args.id)
+    out_dir = tempfile.mkdtemp(prefix="bench_quantize_")
+
+    results = {}
+    for mode in MODES:
+        out_path = os.path.join(out_dir, f"{mode}.png")
+        r = run_mode(mode, id_path, ref_path, out_path, args.steps, args.size)
+        r["out"] = out_path
+        r["step_p50_ms"] = statistics.median(r["step_ms"])
+        results[mode] = r
+        print(f"[{mode}] total={r['total_sec']:.1f}s step_p50={r['step_p50_ms']:.0f}ms "
+              f"max_rss={r['max_rss_mb']:.0f}MB weights={r['weights_mb']:.0f}MB profile={r['profile']}")
+
+    f, q = results["float32"], results["int8"]
+    sim = image_similarity(f["out"], q["out"])
+    print(f"[speedup] total x{f['total_sec'] / q['total_sec']:.2f}, step x{f['step_p50_ms'] / q['step_p50_ms']:.2f}")
+    print(f"[memory] max RSS {f['max_rss_mb']:.0f} → {q['max_rss_mb']:.0f} MB, "
+          f"weights {f['weights_mb']:.0f} → {q['weights_mb']:.0f} MB")
+    print(f"[similarity] PSNR={sim['psnr_db']}dB mean_abs={sim['mean_abs']} (outputs: {out_dir})")
+
+    if sim["psnr_db"] < args.min_psnr:
+        print(f"❌ PSNR {sim['psnr_db']}dB < {args.min_psnr}dB")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_token_merge.py
+"""
+UNet self-attention 토큰 병합 벤치마크
+- layer: down_blocks.0 attn1 과 같은 형상(320채널, 8헤드, 64×64 = 4096 토큰, CFG 배치 2)의 Attention 한 층을
+  원래 프로세서 vs ToMeAttnProcessor(ratio별)로 실행 → 평균 지연(ms), 출력 상대 오차
+- --e2e: 체크포인트가 있으면 MAKEUP_TOME_RATIO 별로 새 프로세스에서 CPU 디퓨전 step 지연 중앙값 비교
+  (bench_cpu_step 과 같은 측정 방식)
+
+실행: python -m benchmarks.bench_token_merge [--ratios 0.3,0.5,0.7] [--iters 20] [--e2e --steps 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def bench_layer(ratios, iters: int, tokens_side: int = 64, channels: int = 320, heads: int = 8) -> None:
+    import torch
+    from diffusers.models.attention_processor import Attention
+    from libs.detail_encoder.attention_processor import AttnProcessor2_0
+    from libs.detail_encoder.token_merging import ToMeAttnProcessor
+
+    torch.manual_seed(0)
+    attn = Attention(query_dim=channels, heads=heads, dim_head=channels // heads).eval()
+    # 실제 UNet 활성값처럼 공간적으로 매끄러운 입력 (인접 토큰끼리 유사)
+    grid = torch.randn(2, channels, tokens_side // 8, tokens_side // 8)
+    x = torch.nn.functional.interpolate(grid, size=(tokens_side, tokens_side), mode="bilinear", align_corners=False)
+    x = (x + 0.1 * torch.randn_like(x)).flatten(2).transpose(1, 2).contiguous()
+
+    def run(processor) -> tuple:
+        attn.set_processor(processor)
+        with torch.inference_mode():
+            out = attn(x)
+            t0 = time.perf_counter()
+            for _ in range(iters):
+                attn(x)
+        return out, (time.perf_counter() - t0) / iters * 1000
+
+    base_out, base_ms = run(AttnProcessor2_0())
+    print(f"[layer] tokens={x.shape[1]} channels={channels} baseline={base_ms:.2f}ms")
+    for ratio in ratios:
+        out, ms = run(ToMeAttnProcessor(AttnProcessor2_0(), ratio=ratio))
+        rel = ((out - base_out).norm() / base_out.norm()).item()
+        print(f"  ratio={ratio:.2f}: {ms:.2f}ms (x{base_ms / ms:.2f}), relative error={rel:.4f}")
+
+
+def bench_e2e(ratios, steps: int, size: int) -> None:
+    from benchmarks.bench_cpu_step import CHILD
+
+    base = None
+    for ratio in [0.0] + list(ratios):
+        env = dict(os.environ, MAKEUP_TOME_RATIO=str(ratio))
+        proc = subprocess.run([sys.executable, "-c", CHILD, str(steps), str(size)],
+                              cwd=ROOT, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(proc.stderr[-3000:])
+            raise SystemExit(f"ratio={ratio}: 실행 실패")
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        p50 = statistics.median(r["step_ms"])
+        base = base or p50
+        print(f"[e2e] ratio={ratio:.2f}: step p50={p50:.0f}ms (x{base / p50:.2f}) total={r['total_sec']:.1f}s")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ratios", default="0.3,0.5,0.7")
+    ap.add_argument("--iters", type=int, default=20)
+    ap.add_argument("--e2e", action="store_true")
+    ap.add_argument("--steps", type=int, default=10)
+    ap.add_argument("--size", type=int, default=512)
+    args = ap.parse_args()
+
+    ratios = [float(r) for r in args.ratios.split(",") if r.strip()]
+    bench_layer(ratios, args.iters)
+    if args.e2e:
+        bench_e2e(ratios, args.steps, args.size)
+
+
+if __name__ == "__main__":
+    main()
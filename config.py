@@ -17,12 +17,168 @@ class Settings:
     OUTPUT_DIR = DATA_DIR / "output"
     CHECKPOINTS_DIR = PROJECT_ROOT / "checkpoints"
     MAKEUP_CKPT_DIR = CHECKPOINTS_DIR / "makeup"
+    JOB_DIR = DATA_DIR / "jobs"
+    MAKEUP_CACHE_DIR = OUTPUT_DIR / "cache"
+    IMAGE_STORE_DIR = OUTPUT_DIR / "images"
 
     # ====== 기본 설정 ======
     DEFAULT_RESOLUTION: int = 512
     DEFAULT_STEPS: int = 30
     DEFAULT_GUIDANCE: float = 2.0
 
+    # ====== 메이크업 결과 캐시 (seed 고정 요청) ======
+    # 캐시 키에 포함되는 모델 버전 — 체크포인트 교체 시 올려서 캐시 무효화
+    MAKEUP_MODEL_VERSION: str = os.getenv("MAKEUP_MODEL_VERSION", "stable-makeup-sd15-v1")
+    MAKEUP_CACHE_MEM_MB: int = int(os.getenv("MAKEUP_CACHE_MEM_MB", "256"))
+    MAKEUP_CACHE_DISK: bool = os.getenv("MAKEUP_CACHE_DISK", "0").lower() in ("1", "true", "yes")
+    MAKEUP_CACHE_TTL_SEC: float = float(os.getenv("MAKEUP_CACHE_TTL_SEC", "86400"))
+
+    # 품질 단계 preview: 기준 해상도(면적 ≈ size²), 최대 steps, 종횡비 버킷 후보 (w:h)
+    MAKEUP_PREVIEW_SIZE: int = int(os.getenv("MAKEUP_PREVIEW_SIZE", "384"))
+    MAKEUP_PREVIEW_STEPS: int = int(os.getenv("MAKEUP_PREVIEW_STEPS", "12"))
+    MAKEUP_PREVIEW_ASPECTS = [
+        tuple(int(v) for v in a.split(":"))
+        for a in os.getenv("MAKEUP_PREVIEW_ASPECTS", "1:1,3:4,4:3,2:3,3:2").split(",") if a.strip()
+    ]
+
+    # img2img(strength < 1) 소스 잠재값 캐시 항목 수
+    MAKEUP_SOURCE_LATENT_CACHE: int = int(os.getenv("MAKEUP_SOURCE_LATENT_CACHE", "32"))
+
+    # 참조 이미지 CLIP 임베딩 캐시 항목 수
+    MAKEUP_REFERENCE_EMBED_CACHE: int = int(os.getenv("MAKEUP_REFERENCE_EMBED_CACHE", "32"))
+
+    # ====== 추측 실행 (/style/recommend 직후 다음 /makeup/simulate 대비) ======
+    # 유휴 상태일 때만 Top-1 스타일 기준 랜드마크/참조 임베딩을 미리 계산 (opt-in)
+    MAKEUP_SPECULATE: bool = os.getenv("MAKEUP_SPECULATE", "0").lower() in ("1", "true", "yes")
+    # Top-1 결과 이미지까지 미리 생성 (seed 미지정 요청에 1회 제공)
+    MAKEUP_SPECULATE_RESULT: bool = os.getenv("MAKEUP_SPECULATE_RESULT", "0").lower() in ("1", "true", "yes")
+    MAKEUP_SPECULATE_MEM_MB: int = int(os.getenv("MAKEUP_SPECULATE_MEM_MB", "64"))
+    MAKEUP_SPECULATE_TTL_SEC: float = float(os.getenv("MAKEUP_SPECULATE_TTL_SEC", "600"))
+
+    # face_crop 모드: 얼굴 박스 대비 여백 비율, 합성 마스크 가장자리 폭(크롭 변 대비)
+    MAKEUP_FACE_CROP_MARGIN: float = float(os.getenv("MAKEUP_FACE_CROP_MARGIN", "0.6"))
+    MAKEUP_FACE_CROP_FEATHER: float = float(os.getenv("MAKEUP_FACE_CROP_FEATHER", "0.08"))
+
+    # ====== 업로드 이미지 저장소 (POST /v1/images → image_id) ======
+    IMAGE_STORE_MEM_MB: int = int(os.getenv("IMAGE_STORE_MEM_MB", "256"))
+    IMAGE_STORE_DISK: bool = os.getenv("IMAGE_STORE_DISK", "0").lower() in ("1", "true", "yes")
+    IMAGE_STORE_TTL_SEC: float = float(os.getenv("IMAGE_STORE_TTL_SEC", "3600"))
+    # 디코딩된 RGB 배열 캐시 상한 (512x512 ≈ 0.75MB)
+    IMAGE_STORE_DECODED_MB: int = int(os.getenv("IMAGE_STORE_DECODED_MB", "256"))
+    IMAGE_UPLOAD_MAX_MB: int = int(os.getenv("IMAGE_UPLOAD_MAX_MB", "20"))
+
+    # ====== 랜드마크 엔진 ======
+    # 검출 박스와 랜드마크 박스의 IoU가 이 값 미만일 때만 SPIGA 2차 추론 (1.0 = 항상)
+    SPIGA_REFINE_IOU: float = float(os.getenv("SPIGA_REFINE_IOU", "0.5"))
+
+    # ====== 메이크업 가중치 로딩 ======
+    # "auto": .safetensors 우선, 없으면 .bin | "safetensors" | "bin" (비교/롤백용)
+    MAKEUP_WEIGHTS_FORMAT: str = os.getenv("MAKEUP_WEIGHTS_FORMAT", "auto")
+    # ControlNet / CLIP을 meta 디바이스에 만든 뒤 가중치를 바로 꽂는다 (0 = 기존 초기화 경로)
+    MAKEUP_FAST_INIT: bool = os.getenv("MAKEUP_FAST_INIT", "1").lower() in ("1", "true", "yes")
+
+    # 사전 조립 번들 디렉토리 (bake_makeup_bundle.py 결과, 예: ./checkpoints/bundles/stable-makeup-sd15-v1)
+    # 지정 시 HF Hub / 개별 체크포인트 없이 번들 하나로 로드
+    MAKEUP_BUNDLE_DIR: str = os.getenv("MAKEUP_BUNDLE_DIR", "")
+
+    # CPU 실행 프로파일 (device=cpu 일 때 자동 적용)
+    MAKEUP_CPU_DTYPE: str = os.getenv("MAKEUP_CPU_DTYPE", "auto")  # "auto"(bf16 지원 시 bf16, 아니면 fp32) | "bfloat16" | "float32"
+    MAKEUP_CPU_CHANNELS_LAST: bool = os.getenv("MAKEUP_CPU_CHANNELS_LAST", "1").lower() in ("1", "true", "yes")
+    MAKEUP_CPU_COMPILE: bool = os.getenv("MAKEUP_CPU_COMPILE", "0").lower() in ("1", "true", "yes")
+    MAKEUP_CPU_THREADS: int = int(os.getenv("MAKEUP_CPU_THREADS", "0"))  # 0 = 사용 가능한 코어 수
+    # CPU 양자화 모드: "" = 끔 | "int8" = UNet / ControlNet / SSR / CLIP-L Linear int8 동적 양자화 (fp32 대비 속도↑, 메모리↓)
+    MAKEUP_QUANTIZE: str = os.getenv("MAKEUP_QUANTIZE", "").lower()
+
+    # 그래프 컴파일 (opt-in) — UNet / ControlNet / VAE decoder 를 형상 버킷(해상도 × 배치)별로 기동 시 컴파일
+    MAKEUP_COMPILE: bool = os.getenv("MAKEUP_COMPILE", "0").lower() in ("1", "true", "yes")
+    MAKEUP_COMPILE_MODE: str = os.getenv("MAKEUP_COMPILE_MODE", "")  # "" = 자동(cuda: reduce-overhead) | "default" | "max-autotune" ...
+    # 기본값에 preview 해상도를 포함해 preview 단계도 컴파일된 저해상도 버킷으로 실행 (없으면 512로 라우팅됨)
+    MAKEUP_COMPILE_SIZES = [int(x) for x in os.getenv("MAKEUP_COMPILE_SIZES", f"{MAKEUP_PREVIEW_SIZE},512").split(",") if x.strip()]
+    MAKEUP_COMPILE_BATCH_SIZES = [int(x) for x in os.getenv("MAKEUP_COMPILE_BATCH_SIZES", "1").split(",") if x.strip()]
+    MAKEUP_COMPILE_CACHE_DIR: str = os.getenv("MAKEUP_COMPILE_CACHE_DIR", str(OUTPUT_DIR / "compile_cache"))
+
+    # UNet self-attention 토큰 병합 비율 (0 = 끔, 예: 0.5 = 해당 블록 attn1 토큰 절반 병합)
+    MAKEUP_TOME_RATIO: float = float(os.getenv("MAKEUP_TOME_RATIO", "0"))
+    # 적용 블록 prefix (쉼표 구분) — 기본은 512²에서 4096 토큰을 보는 첫 down / 마지막 up 블록
+    MAKEUP_TOME_BLOCKS = [b.strip() for b in os.getenv("MAKEUP_TOME_BLOCKS", "down_blocks.0.,up_blocks.3.").split(",") if b.strip()]
+
+    # 워커 최대 RSS 상한(MB). 지정 시 attention query chunk / VAE slicing·tiling 을 자동 설정 (0 = 끔)
+    MAKEUP_PEAK_RSS_MB: int = int(os.getenv("MAKEUP_PEAK_RSS_MB", "0"))
+    # attention / VAE 외 활성값(conv feature map 등)용 예약분(MB)
+    MAKEUP_ACTIVATION_RESERVE_MB: int = int(os.getenv("MAKEUP_ACTIVATION_RESERVE_MB", "512"))
+
+    # ====== 모델 레지스트리 ======
+    # 상주 모델 RAM 예산(MB). 초과 시 사용 중이 아닌 모델 패밀리를 LRU 순으로 언로드 (0 = 무제한)
+    MODEL_RAM_BUDGET_MB: int = int(os.getenv("MODEL_RAM_BUDGET_MB", "0"))
+
+    # ====== 기동 시 프리로드 / 웜업 ======
+    # 쉼표 구분 패밀리 목록 (nia, style, custom, makeup, llm). 비어 있으면 첫 요청 시 로드
+    PRELOAD_MODELS = [m.strip() for m in os.getenv("PRELOAD_MODELS", "").split(",") if m.strip()]
+    PRELOAD_WARMUP: bool = os.getenv("PRELOAD_WARMUP", "1").lower() in ("1", "true", "yes")
+    # 메이크업 웜업 추론 스텝 수
+    MAKEUP_WARMUP_STEPS: int = int(os.getenv("MAKEUP_WARMUP_STEPS", "2"))
+
+    # ====== 요청 취소 ======
+    # 메이크업 요청 최대 처리 시간(초). 초과 시 디퓨전 루프를 중단한다. (0 이하 = 무제한)
+    MAKEUP_REQUEST_TIMEOUT_SEC: float = float(os.getenv("MAKEUP_REQUEST_TIMEOUT_SEC", "600"))
+    # 클라이언트 연결 끊김 확인 주기(초)
+    DISCONNECT_POLL_SEC: float = float(os.getenv("DISCONNECT_POLL_SEC", "0.5"))
+
+    # ====== 비동기 작업(Job) ======
+    JOB_BACKEND: str = os.getenv("JOB_BACKEND", "memory")        # "memory" | "file"
+    JOB_QUEUE_SIZE: int = int(os.getenv("JOB_QUEUE_SIZE", "16"))  # 대기열 최대 길이
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "1"))         # 워커 스레드 수
+    JOB_TTL_SEC: float = float(os.getenv("JOB_TTL_SEC", "3600"))  # 완료 결과 보관 시간
+
+    # ====== 모델 패밀리별 executor (동시 실행 수, 대기열 길이) ======
+    # 환경변수 EXECUTOR_<FAMILY>_CONCURRENCY / EXECUTOR_<FAMILY>_QUEUE 로 덮어쓰기
+    EXECUTOR_DEFAULTS = {
+        "makeup": (1, 4),    # 디퓨전: GPU/CPU 1개 작업씩
+        "nia": (2, 16),
+        "style": (2, 16),
+        "custom": (2, 16),
+        "llm": (8, 32),      # Gemini 호출: I/O 대기 위주
+    }
+
+    # I/O 위주 패밀리: 스케줄러 compute 슬롯을 점유하지 않음
+    IO_FAMILIES = ("llm",)
+
+    # ====== 우선순위 스케줄러 ======
+    # 클래스: (WFQ 가중치, 지연 SLO 초)
+    PRIORITY_CLASSES = {
+        "interactive": (8.0, float(os.getenv("SLO_INTERACTIVE_SEC", "1.0"))),
+        "standard": (4.0, float(os.getenv("SLO_STANDARD_SEC", "15.0"))),
+        "batch": (1.0, float(os.getenv("SLO_BATCH_SEC", "600.0"))),
+        # 추측 실행: 다른 작업이 대기하면 중단되므로 사실상 SLO 없음
+        "speculative": (0.25, float(os.getenv("SLO_SPECULATIVE_SEC", "86400.0"))),
+    }
+    # 엔드포인트(또는 패밀리) → 우선순위 클래스
+    ENDPOINT_PRIORITY = {
+        "nia": "interactive",
+        "style": "interactive",
+        "feedback": "standard",
+        "product": "standard",
+        "llm": "standard",
+        "custom": "standard",
+        "custom_job": "batch",
+        "makeup": "batch",
+        "makeup_job": "batch",
+        "makeup_speculative": "speculative",
+    }
+    # 연산 위주 작업이 동시에 점유할 수 있는 전역 슬롯 수
+    SCHEDULER_COMPUTE_SLOTS: int = int(os.getenv("SCHEDULER_COMPUTE_SLOTS", "2"))
+
+    def priority_class(self, endpoint: str) -> str:
+        return os.getenv(f"PRIORITY_{endpoint.upper()}", self.ENDPOINT_PRIORITY.get(endpoint, "standard"))
+
+    def executor_limits(self, family: str) -> tuple:
+        concurrency, max_queue = self.EXECUTOR_DEFAULTS.get(family, (1, 8))
+        prefix = f"EXECUTOR_{family.upper()}"
+        return (
+            int(os.getenv(f"{prefix}_CONCURRENCY", concurrency)),
+            int(os.getenv(f"{prefix}_QUEUE", max_queue)),
+        )
+
     # 유효성 점검(필수 아님)
     def readiness_checks(self) -> dict:
         def exists(p: Path) -> bool:
@@ -0,0 +1,67 @@
+"""
+체크포인트 변환 스크립트 (.bin → .safetensors)
+- checkpoints/makeup/pytorch_model*.bin 을 같은 이름의 .safetensors 로 변환
+- 로컬 이미지 인코더(models/image_encoder_l/pytorch_model.bin)는 model.safetensors 로 변환
+- 변환 후 텐서 값이 같은지 확인한다. 원본 .bin 은 지우지 않음 (MAKEUP_WEIGHTS_FORMAT=bin 으로 되돌릴 수 있음)
+
+실행: python convert_checkpoints.py [--checkpoint-dir ./checkpoints/makeup] [--image-encoder-dir ./models/image_encoder_l]
+"""
+import argparse
+import os
+
+import torch
+
+
+def _to_plain_state_dict(obj) -> dict:
+    if isinstance(obj, dict) and "state_dict" in obj and isinstance(obj["state_dict"], dict):
+        obj = obj["state_dict"]
+    # safetensors는 저장소를 공유하는 텐서를 저장할 수 없으므로 각각 연속 메모리로 복사
+    return {k: v.detach().contiguous().clone() for k, v in obj.items() if isinstance(v, torch.Tensor)}
+
+
+def convert(src: str, dst: str, overwrite: bool = False) -> None:
+    from safetensors.torch import save_file, load_file
+
+    if os.path.exists(dst) and not overwrite:
+        print(f"  skip (exists): {dst}")
+        return
+    state_dict = _to_plain_state_dict(torch.load(src, map_location="cpu"))
+    tmp = dst + ".tmp"
+    save_file(state_dict, tmp, metadata={"format": "pt", "source": os.path.basename(src)})
+
+    # 검증
+    reloaded = load_file(tmp)
+    assert reloaded.keys() == state_dict.keys(), "key mismatch"
+    for k, v in state_dict.items():
+        assert torch.equal(reloaded[k], v), f"tensor mismatch: {k}"
+    os.replace(tmp, dst)
+
+    size = os.path.getsize(dst) / 2**20
+    print(f"  ✓ {os.path.basename(src)} → {os.path.basename(dst)} ({len(state_dict)} tensors, {size:.0f} MB)")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--checkpoint-dir", default="./checkpoints/makeup")
+    ap.add_argument("--image-encoder-dir", default="./models/image_encoder_l")
+    ap.add_argument("--overwrite", action="store_true")
+    args = ap.parse_args()
+
+    print(f"[makeup] {args.checkpoint_dir}")
+    for stem in ("pytorch_model", "pytorch_model_1", "pytorch_model_2"):
+        src = os.path.join(args.checkpoint_dir, f"{stem}.bin")
+        if os.path.exists(src):
+            convert(src, os.path.join(args.checkpoint_dir, f"{stem}.safetensors"), args.overwrite)
+        else:
+            print(f"  ❌ not found: {src}")
+
+    src = os.path.join(args.image_encoder_dir, "pytorch_model.bin")
+    print(f"[image encoder] {args.image_encoder_dir}")
+    if os.path.exists(src):
+        convert(src, os.path.join(args.image_encoder_dir, "model.safetensors"), args.overwrite)
+    else:
+        print(f"  skip: {src} 없음 (이미 safetensors 이거나 HF 모델 사용)")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,47 @@ if is_xformers_available():
 else:
     xformers = None
 
+
+def chunked_sdpa(query, key, value, attn_mask=None, chunk_size=None):
+    """
+    scaled_dot_product_attention 을 query 축으로 chunk_size 씩 나눠 계산.
+    (batch, heads, Lq, Lk) 점수 텐서 대신 (batch, heads, chunk_size, Lk) 만 잡는다. chunk_size=None 이면 한 번에.
+    """
+    q_len = query.shape[-2]
+    if not chunk_size or q_len <= chunk_size:
+        return F.scaled_dot_product_attention(query, key, value, attn_mask=attn_mask, dropout_p=0.0, is_causal=False)
+    out = query.new_empty(*query.shape[:-1], value.shape[-1])
+    for i in range(0, q_len, chunk_size):
+        mask = attn_mask[..., i:i + chunk_size, :] if attn_mask is not None and attn_mask.shape[-2] > 1 else attn_mask
+        out[..., i:i + chunk_size, :] = F.scaled_dot_product_attention(
+            query[..., i:i + chunk_size, :], key, value, attn_mask=mask, dropout_p=0.0, is_causal=False
+        )
+    return out
+
+
+def chunked_bmm_attention(attn, query, key, value, attention_mask=None, chunk_size=None):
+    """get_attention_scores + bmm 을 query 축으로 나눠 계산 (query/key/value: (batch * heads, L, head_dim))"""
+    q_len = query.shape[1]
+    if not chunk_size or q_len <= chunk_size:
+        return torch.bmm(attn.get_attention_scores(query, key, attention_mask), value)
+    out = query.new_empty(query.shape[0], q_len, value.shape[-1])
+    for i in range(0, q_len, chunk_size):
+        mask = attention_mask
+        if mask is not None and mask.shape[1] > 1:
+            mask = mask[:, i:i + chunk_size]
+        probs = attn.get_attention_scores(query[:, i:i + chunk_size], key, mask)
+        out[:, i:i + chunk_size] = torch.bmm(probs, value)
+    return out
+
+
 class SSRAttnProcessor(nn.Module):
     r"""
     Attention processor for SSR-Adapater.
     """
 
+    # query 축 chunk 크기 (None = 한 번에)
+    query_chunk_size = None
+
     def __init__(self, hidden_size, cross_attention_dim=None, scale=1):
         super().__init__()
         self.hidden_size = hidden_size
@@ -65,8 +101,7 @@ class SSRAttnProcessor(nn.Module):
         _value = self.to_v_SSR(_hidden_states)
         _key = attn.head_to_batch_dim(_key)
         _value = attn.head_to_batch_dim(_value)
-        _attention_probs = attn.get_attention_scores(query, _key, None)
-        _hidden_states = torch.bmm(_attention_probs, _value)
+        _hidden_states = chunked_bmm_attention(attn, query, _key, _value, None, self.query_chunk_size)
         _hidden_states = attn.batch_to_head_dim(_hidden_states)
         hidden_states = self.scale * _hidden_states
 
@@ -91,6 +126,9 @@ class SSRAttnProcessor2_0(torch.nn.Module):
     Attention processor for SSR-Adapater for PyTorch 2.0.
     """
 
+    # query 축 chunk 크기 (None = 한 번에)
+    query_chunk_size = None
+
     def __init__(self, hidden_size, cross_attention_dim=None, scale=1.0):
         super().__init__()
 
@@ -158,9 +196,7 @@ class SSRAttnProcessor2_0(torch.nn.Module):
 
         # the output of sdp = (batch, num_heads, seq_len, head_dim)
         # TODO: add support for attn.scale when we move to Torch 2.1
-        _hidden_states = F.scaled_dot_product_attention(
-            query, _key, _value, attn_mask=None, dropout_p=0.0, is_causal=False
-        )
+        _hidden_states = chunked_sdpa(query, _key, _value, None, self.query_chunk_size)
 
         _hidden_states = _hidden_states.transpose(1, 2).reshape(batch_size, -1, attn.heads * head_dim)
         _hidden_states = _hidden_states.to(query.dtype)
@@ -188,6 +224,9 @@ class AttnProcessor2_0(torch.nn.Module):
     Processor for implementing scaled dot-product attention (enabled by default if you're using PyTorch 2.0).
     """
 
+    # query 축 chunk 크기 (None = 한 번에)
+    query_chunk_size = None
+
     def __init__(
             self,
             hidden_size=None,
@@ -249,9 +288,7 @@ class AttnProcessor2_0(torch.nn.Module):
 
         # the output of sdp = (batch, num_heads, seq_len, head_dim)
         # TODO: add support for attn.scale when we move to Torch 2.1
-        hidden_states = F.scaled_dot_product_attention(
-            query, key, value, attn_mask=attention_mask, dropout_p=0.0, is_causal=False
-        )
+        hidden_states = chunked_sdpa(query, key, value, attention_mask, self.query_chunk_size)
 
         hidden_states = hidden_states.transpose(1, 2).reshape(batch_size, -1, attn.heads * head_dim)
         hidden_states = hidden_states.to(query.dtype)
@@ -275,6 +312,10 @@ class AttnProcessor(nn.Module):
     r"""
     Default processor for performing attention-related computations.
     """
+
+    # query 축 chunk 크기 (None = 한 번에)
+    query_chunk_size = None
+
     def __init__(
         self,
         hidden_size=None,
@@ -323,8 +364,7 @@ class AttnProcessor(nn.Module):
         key = attn.head_to_batch_dim(key)
         value = attn.head_to_batch_dim(value)
 
-        attention_probs = attn.get_attention_scores(query, key, attention_mask)
-        hidden_states = torch.bmm(attention_probs, value)
+        hidden_states = chunked_bmm_attention(attn, query, key, value, attention_mask, self.query_chunk_size)
         hidden_states = attn.batch_to_head_dim(hidden_states)
 
         # linear proj
@@ -26,75 +26,111 @@ else:
     from .attention_processor import SSRAttnProcessor, AttnProcessor
 
 
+def _load_local_clip(image_encoder_path):
+    """
+    로컬 CLIP 디렉토리(config.json + model.safetensors | pytorch_model.bin)에서
+    HF CLIPVisionModel을 거치지 않고 로컬 CLIPVisionModel을 meta 디바이스에 만든 뒤 가중치를 꽂는다.
+    불가능하면 None (HF 경유 로드로 대체)
+    """
+    from utils.weights import resolve_weights, load_state_dict, empty_init, assign_state_dict
+
+    if not os.path.isfile(os.path.join(image_encoder_path, "config.json")):
+        return None
+    weights = resolve_weights(image_encoder_path, "model") or resolve_weights(image_encoder_path, "pytorch_model")
+    ctx = empty_init()
+    if weights is None or ctx is None:
+        return None
+
+    from transformers import CLIPVisionConfig
+    config = CLIPVisionConfig.from_pretrained(image_encoder_path)
+    config.attn_implementation = "eager"
+    with ctx:
+        image_encoder = CLIPVisionModel(config)
+    state_dict = load_state_dict(weights, prefix="vision_model.")
+    if not assign_state_dict(image_encoder, state_dict):
+        print(f"[detail_encoder] {os.path.basename(weights)} does not cover all CLIP weights, loading via transformers")
+        return None
+    return image_encoder
+
+
+def _load_clip_via_hf(image_encoder_path, dtype):
+    """HF CLIPVisionModel 로드 후 로컬 구현으로 가중치 복사 (HF 모델명 / TF 가중치 등)"""
+    # HuggingFace 모델명인지 로컬 경로인지 체크
+    is_hf_model = "/" in image_encoder_path and not os.path.isabs(
+        image_encoder_path
+    )
+
+    if is_hf_model:
+        # HuggingFace 모델명인 경우 바로 사용
+        use_from_tf = False
+    else:
+        # 로컬 경로인 경우 TF/PT 자동 인식
+        has_pt = os.path.exists(
+            os.path.join(image_encoder_path, "pytorch_model.bin")
+        )
+        has_tf = os.path.exists(
+            os.path.join(image_encoder_path, "tf_model.h5")
+        ) or any(
+            name.endswith(".index") or name.endswith(".data-00000-of-00001")
+            for name in os.listdir(image_encoder_path)
+            if os.path.isfile(os.path.join(image_encoder_path, name))
+        )
+        force_tf = os.getenv(
+            "MAKEUP_IMAGE_ENCODER_FROM_TF", ""
+        ).strip().lower() in ("1", "true", "yes")
+        use_from_tf = force_tf or ((not has_pt) and has_tf)
+
+    try:
+        clip_encoder = OriginalCLIPVisionModel.from_pretrained(
+            image_encoder_path,
+            attn_implementation="eager",
+            from_tf=use_from_tf,                 # ✅ 핵심
+            torch_dtype=dtype                    # 메모리 절약/일관성
+        )
+    except Exception as e:
+        # 메타데이터 상충 등으로 실패 시 반대 플래그로 한 번 더 시도
+        clip_encoder = OriginalCLIPVisionModel.from_pretrained(
+            image_encoder_path,
+            attn_implementation="eager",
+            from_tf=not use_from_tf,             # ✅ 토글 재시도
+            torch_dtype=dtype
+        )
+
+    # Be explicit in case transformers tries to flip it later
+    clip_encoder.config.attn_implementation = "eager"
+
+    # Our local implementation that mirrors the config
+    image_encoder = CLIPVisionModel(clip_encoder.config)
+
+    # Copy weights from the HF model
+    state_dict = clip_encoder.state_dict()
+    missing, unexpected = image_encoder.load_state_dict(state_dict, strict=False)
+    if missing or unexpected:
+        # Not fatal; just loggable (leave as print to avoid importing logger here)
+        print(f"[detail_encoder] Loaded CLIP weights with missing={len(missing)}, unexpected={len(unexpected)}")
+    del clip_encoder
+    return image_encoder
+
+
 class detail_encoder(nn.Module):
     """from SSR-encoder"""
-    def __init__(self, unet, image_encoder_path, device="cuda", dtype=torch.float32):
+    def __init__(self, unet, image_encoder_path, device="cuda", dtype=torch.float32, image_encoder=None):
         super().__init__()
         self.device = device
         self.dtype = dtype
 
         # ---- Load CLIP-ViT-L/14 (force eager attention to avoid SDPA issue) ----
-        # HuggingFace 모델명인지 로컬 경로인지 체크
-        is_hf_model = "/" in image_encoder_path and not os.path.isabs(
-            image_encoder_path
-        )
-
-        if is_hf_model:
-            # HuggingFace 모델명인 경우 바로 사용
-            use_from_tf = False
-        else:
-            # 로컬 경로인 경우 TF/PT 자동 인식
-            has_pt = os.path.exists(
-                os.path.join(image_encoder_path, "pytorch_model.bin")
-            )
-            has_tf = os.path.exists(
-                os.path.join(image_encoder_path, "tf_model.h5")
-            ) or any(
-                name.endswith(".index") or name.endswith(".data-00000-of-00001")
-                for name in os.listdir(image_encoder_path)
-                if os.path.isfile(os.path.join(image_encoder_path, name))
-            )
-            force_tf = os.getenv(
-                "MAKEUP_IMAGE_ENCODER_FROM_TF", ""
-            ).strip().lower() in ("1", "true", "yes")
-            use_from_tf = force_tf or ((not has_pt) and has_tf)
-
-        try:
-            clip_encoder = OriginalCLIPVisionModel.from_pretrained(
-                image_encoder_path,
-                attn_implementation="eager",
-                from_tf=use_from_tf,                 # ✅ 핵심
-                torch_dtype=self.dtype               # 메모리 절약/일관성
-            )
-        except Exception as e:
-            # 메타데이터 상충 등으로 실패 시 반대 플래그로 한 번 더 시도
-            clip_encoder = OriginalCLIPVisionModel.from_pretrained(
-                image_encoder_path,
-                attn_implementation="eager",
-                from_tf=not use_from_tf,             # ✅ 토글 재시도
-                torch_dtype=self.dtype
-            )
-
-        # Be explicit in case transformers tries to flip it later
-        clip_encoder.config.attn_implementation = "eager"
-
-        # Our local implementation that mirrors the config
-        self.image_encoder = CLIPVisionModel(clip_encoder.config)
-
-        # Copy weights from the HF model
-        state_dict = clip_encoder.state_dict()
-        missing, unexpected = self.image_encoder.load_state_dict(state_dict, strict=False)
-        if missing or unexpected:
-            # Not fatal; just loggable (leave as print to avoid importing logger here)
-            print(f"[detail_encoder] Loaded CLIP weights with missing={len(missing)}, unexpected={len(unexpected)}")
+        # image_encoder가 주어지면 그대로 사용 (번들 로더: meta 디바이스에서 생성 후 가중치 assign)
+        # 로컬 디렉토리면 HF 모델을 만들지 않고 로컬 구현에 가중치를 바로 로드, 아니면 HF 경유
+        self.image_encoder = image_encoder if image_encoder is not None else _load_local_clip(image_encoder_path)
+        if self.image_encoder is None:
+            self.image_encoder = _load_clip_via_hf(image_encoder_path, self.dtype)
 
         # Move to device/dtype and freeze (no grad)
         self.image_encoder.to(self.device, dtype=self.dtype)
         for p in self.image_encoder.parameters():
             p.requires_grad = False
 
-        del clip_encoder
-
         self.clip_image_processor = CLIPImageProcessor()
 
         # ---- Install SSR Attention processors on UNet ----
@@ -185,13 +221,33 @@ class detail_encoder(nn.Module):
         guidance_scale=2,
         num_inference_steps=30,
         pipe=None,
+        cancel_token=None,
+        image_embeds=None,
         **kwargs,
     ):
         """
         id_image: list or tuple like [id_rgb, pose_rgb] as used by your pipeline
         makeup_image: PIL.Image (reference)
+        cancel_token: utils.cancellation.CancellationToken (optional).
+            Checked on every denoising step; raises InferenceCancelled to abort the loop.
+        image_embeds: (cond, uncond) from get_image_embeds(makeup_image), if already computed
+            (e.g. concurrently with landmark extraction). makeup_image is ignored when given.
         """
-        image_prompt_embeds, uncond_image_prompt_embeds = self.get_image_embeds(makeup_image)
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+            user_callback = kwargs.pop("callback", None)
+
+            def _check_cancel(step, timestep, latents):
+                cancel_token.raise_if_cancelled()
+                if user_callback is not None:
+                    user_callback(step, timestep, latents)
+
+            kwargs["callback"] = _check_cancel
+            kwargs["callback_steps"] = 1
+
+        if image_embeds is None:
+            image_embeds = self.get_image_embeds(makeup_image)
+        image_prompt_embeds, uncond_image_prompt_embeds = image_embeds
 
         prompt_embeds = image_prompt_embeds
         negative_prompt_embeds = uncond_image_prompt_embeds
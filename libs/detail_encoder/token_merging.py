@@ -0,0 +1,173 @@
+# detail_encoder/token_merging.py
+"""
+UNet self-attention(attn1) 토큰 병합 (ToMe for SD 방식)
+- 512² 입력에서 down_blocks.0 / up_blocks.3 의 attn1 은 64×64 = 4096 토큰 self-attention 을 한다.
+- 2×2 칸마다 좌상단 토큰을 dst, 나머지를 src 로 나눈 뒤(결정적), src 중 dst 와 코사인 유사도가 높은
+  r = ratio × N 개를 가장 가까운 dst 에 평균 병합 → 줄어든 토큰으로 attention → 병합된 자리에 dst 결과를 복사해 복원
+- 기존 프로세서(AttnProcessor / AttnProcessor2_0)를 감싸는 래퍼라서 detail_encoder 가 SSR 프로세서를
+  설치한 뒤에 적용/해제할 수 있다. SSR(attn2, cross-attention)은 건드리지 않는다.
+"""
+import math
+from typing import Callable, Iterable, Tuple
+
+import torch
+import torch.nn as nn
+
+DEFAULT_BLOCKS = ("down_blocks.0.", "up_blocks.3.")
+
+
+def _identity(x: torch.Tensor) -> torch.Tensor:
+    return x
+
+
+def _grid(num_tokens: int, aspect: float) -> Tuple[int, int]:
+    """토큰 수와 종횡비(w / h)로 잠재 격자 (h, w) 추정. 맞지 않으면 (0, 0)"""
+    h = int(round(math.sqrt(num_tokens / aspect)))
+    if h <= 0 or num_tokens % h:
+        return 0, 0
+    return h, num_tokens // h
+
+
+def bipartite_soft_matching_2d(
+    metric: torch.Tensor, h: int, w: int, r: int, sx: int = 2, sy: int = 2
+) -> Tuple[Callable, Callable]:
+    """
+    metric: (B, N, C), N = h * w
+    r: 제거할 토큰 수
+    Returns: (merge, unmerge)
+    """
+    B, N, _ = metric.shape
+    if r <= 0:
+        return _identity, _identity
+
+    with torch.no_grad():
+        hsy, wsx = h // sy, w // sx
+        device = metric.device
+
+        # 각 sy×sx 칸의 첫 토큰을 dst(-1), 나머지를 src(0)로 표시
+        idx_buffer_view = torch.zeros(hsy, wsx, sy * sx, device=device, dtype=torch.int64)
+        idx_buffer_view[:, :, 0] = -1
+        idx_buffer_view = idx_buffer_view.view(hsy, wsx, sy, sx).transpose(1, 2).reshape(hsy * sy, wsx * sx)
+        if hsy * sy < h or wsx * sx < w:
+            idx_buffer = torch.zeros(h, w, device=device, dtype=torch.int64)
+            idx_buffer[: hsy * sy, : wsx * sx] = idx_buffer_view
+        else:
+            idx_buffer = idx_buffer_view
+
+        order = torch.argsort(idx_buffer.reshape(1, -1, 1), dim=1, stable=True)
+        num_dst = hsy * wsx
+        a_idx = order[:, num_dst:, :]  # src
+        b_idx = order[:, :num_dst, :]  # dst
+
+        def split(x: torch.Tensor):
+            C = x.shape[-1]
+            src = torch.gather(x, dim=1, index=a_idx.expand(B, N - num_dst, C))
+            dst = torch.gather(x, dim=1, index=b_idx.expand(B, num_dst, C))
+            return src, dst
+
+        metric = metric / metric.norm(dim=-1, keepdim=True)
+        a, b = split(metric)
+        scores = a @ b.transpose(-1, -2)
+
+        r = min(a.shape[1], r)
+        node_max, node_idx = scores.max(dim=-1)
+        edge_idx = node_max.argsort(dim=-1, descending=True, stable=True)[..., None]
+        unm_idx = edge_idx[..., r:, :]  # 남는 src
+        src_idx = edge_idx[..., :r, :]  # 병합되는 src
+        dst_idx = torch.gather(node_idx[..., None], dim=-2, index=src_idx)
+
+    def merge(x: torch.Tensor) -> torch.Tensor:
+        src, dst = split(x)
+        n, t1, c = src.shape
+        unm = torch.gather(src, dim=-2, index=unm_idx.expand(n, t1 - r, c))
+        src = torch.gather(src, dim=-2, index=src_idx.expand(n, r, c))
+        dst = dst.scatter_reduce(-2, dst_idx.expand(n, r, c), src, reduce="mean")
+        return torch.cat([unm, dst], dim=1)
+
+    def unmerge(x: torch.Tensor) -> torch.Tensor:
+        unm_len = unm_idx.shape[1]
+        unm, dst = x[..., :unm_len, :], x[..., unm_len:, :]
+        c = unm.shape[-1]
+        src = torch.gather(dst, dim=-2, index=dst_idx.expand(B, r, c))
+
+        out = torch.zeros(B, N, c, device=x.device, dtype=x.dtype)
+        a_full = a_idx.expand(B, a_idx.shape[1], 1)
+        out.scatter_(dim=-2, index=b_idx.expand(B, num_dst, c), src=dst)
+        out.scatter_(dim=-2, index=torch.gather(a_full, dim=1, index=unm_idx).expand(B, unm_len, c), src=unm)
+        out.scatter_(dim=-2, index=torch.gather(a_full, dim=1, index=src_idx).expand(B, r, c), src=src)
+        return out
+
+    return merge, unmerge
+
+
+class ToMeAttnProcessor(nn.Module):
+    r"""
+    Self-attention 프로세서 래퍼: attention 전에 토큰 병합, 후에 복원.
+    3D 입력의 self-attention(encoder_hidden_states=None)에만 적용하고 나머지는 원래 프로세서로 그대로 넘긴다.
+    """
+
+    def __init__(self, processor, ratio: float = 0.5, aspect: float = 1.0):
+        super().__init__()
+        self.processor = processor
+        self.ratio = ratio
+        self.aspect = aspect  # 잠재 격자 w / h (정사각 입력 = 1.0)
+
+    def __call__(
+            self,
+            attn,
+            hidden_states,
+            encoder_hidden_states=None,
+            attention_mask=None,
+            temb=None,
+    ):
+        if encoder_hidden_states is not None or hidden_states.ndim != 3 or self.ratio <= 0:
+            return self.processor(attn, hidden_states, encoder_hidden_states, attention_mask, temb)
+
+        h, w = _grid(hidden_states.shape[1], self.aspect)
+        if not h:
+            return self.processor(attn, hidden_states, encoder_hidden_states, attention_mask, temb)
+
+        r = int(hidden_states.shape[1] * self.ratio)
+        merge, unmerge = bipartite_soft_matching_2d(hidden_states, h, w, r)
+        out = self.processor(attn, merge(hidden_states), None, attention_mask, temb)
+        return unmerge(out)
+
+
+def apply_token_merging(unet, ratio: float = 0.5, blocks: Iterable[str] = DEFAULT_BLOCKS) -> int:
+    """
+    blocks 로 시작하는 attn1 프로세서를 ToMeAttnProcessor 로 감싼다 (SSR 설치 이후 호출).
+    이미 감싼 프로세서는 ratio 만 갱신. Returns: 적용된 프로세서 수
+    """
+    blocks = tuple(blocks)
+    procs = dict(unet.attn_processors)
+    count = 0
+    for name, proc in procs.items():
+        if not name.endswith("attn1.processor") or not name.startswith(blocks):
+            continue
+        if isinstance(proc, ToMeAttnProcessor):
+            proc.ratio = ratio
+        else:
+            procs[name] = ToMeAttnProcessor(proc, ratio=ratio)
+        count += 1
+    unet.set_attn_processor(procs)
+    return count
+
+
+def remove_token_merging(unet) -> int:
+    """ToMeAttnProcessor 래퍼를 벗겨 원래 프로세서로 되돌린다."""
+    procs = dict(unet.attn_processors)
+    count = 0
+    for name, proc in procs.items():
+        if isinstance(proc, ToMeAttnProcessor):
+            procs[name] = proc.processor
+            count += 1
+    if count:
+        unet.set_attn_processor(procs)
+    return count
+
+
+def set_token_merging_aspect(unet, aspect: float) -> None:
+    """비정사각 입력일 때 잠재 격자 종횡비(w / h) 지정"""
+    for proc in unet.attn_processors.values():
+        if isinstance(proc, ToMeAttnProcessor):
+            proc.aspect = aspect
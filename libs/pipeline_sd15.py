@@ -708,6 +708,37 @@ class StableDiffusionControlNetPipeline(
         latents = latents * self.scheduler.init_noise_sigma
         return latents
 
+    # Adapted from diffusers.pipelines.stable_diffusion.pipeline_stable_diffusion_img2img.StableDiffusionImg2ImgPipeline.get_timesteps
+    def get_timesteps(self, num_inference_steps, strength):
+        # at least one denoising step, otherwise the loop is skipped and timesteps[:1] is empty
+        init_timestep = max(1, min(int(num_inference_steps * strength), num_inference_steps))
+        t_start = max(num_inference_steps - init_timestep, 0)
+        timesteps = self.scheduler.timesteps[t_start * self.scheduler.order :]
+        return timesteps, num_inference_steps - t_start
+
+    @torch.no_grad()
+    def encode_source_latents(self, image, height=None, width=None):
+        """
+        Encode the (padded) source image with the VAE. Uses the posterior mean so the result is deterministic
+        and can be cached per source image. Returns latents already scaled by `vae.config.scaling_factor`.
+        """
+        image = self.image_processor.preprocess(image, height=height, width=width)
+        image = image.to(device=self._execution_device, dtype=self.vae.dtype)
+        latents = self.vae.encode(image).latent_dist.mean
+        return latents * self.vae.config.scaling_factor
+
+    def prepare_img2img_latents(self, source_latents, timestep, batch_size, dtype, device, generator):
+        init_latents = source_latents.to(device=device, dtype=dtype)
+        if init_latents.shape[0] != batch_size:
+            if batch_size % init_latents.shape[0] != 0:
+                raise ValueError(
+                    f"Cannot duplicate `source_latents` of batch size {init_latents.shape[0]} to {batch_size} images."
+                )
+            init_latents = init_latents.repeat(batch_size // init_latents.shape[0], 1, 1, 1)
+
+        noise = randn_tensor(init_latents.shape, generator=generator, device=device, dtype=dtype)
+        return self.scheduler.add_noise(init_latents, noise, timestep.repeat(batch_size))
+
     # Copied from diffusers.pipelines.stable_diffusion.pipeline_stable_diffusion.StableDiffusionPipeline.enable_freeu
     def enable_freeu(self, s1: float, s2: float, b1: float, b2: float):
         r"""Enables the FreeU mechanism as in https://arxiv.org/abs/2309.11497.
@@ -763,6 +794,8 @@ class StableDiffusionControlNetPipeline(
         control_guidance_start: Union[float, List[float]] = 0.0,
         control_guidance_end: Union[float, List[float]] = 1.0,
         clip_skip: Optional[int] = None,
+        strength: float = 1.0,
+        source_latents: Optional[torch.FloatTensor] = None,
     ):
         r"""
         The call function to the pipeline for generation.
@@ -837,6 +870,13 @@ class StableDiffusionControlNetPipeline(
             clip_skip (`int`, *optional*):
                 Number of layers to be skipped from CLIP while computing the prompt embeddings. A value of 1 means that
                 the output of the pre-final layer will be used for computing the prompt embeddings.
+            strength (`float`, *optional*, defaults to 1.0):
+                img2img mode. With `source_latents`, the source latents are noised to the timestep at
+                `strength` of the schedule and only the remaining `int(num_inference_steps * strength)` steps
+                are denoised. 1.0 starts from pure noise (default behaviour).
+            source_latents (`torch.FloatTensor`, *optional*):
+                VAE latents of the source image (already multiplied by `vae.config.scaling_factor`), e.g. from
+                [`~StableDiffusionControlNetPipeline.encode_source_latents`]. Ignored when `strength` is 1.0.
 
         Examples:
 
@@ -958,19 +998,32 @@ class StableDiffusionControlNetPipeline(
         # 5. Prepare timesteps
         self.scheduler.set_timesteps(num_inference_steps, device=device)
         timesteps = self.scheduler.timesteps
+        img2img = source_latents is not None and strength < 1.0
+        if img2img:
+            timesteps, num_inference_steps = self.get_timesteps(num_inference_steps, strength)
 
         # 6. Prepare latent variables
         num_channels_latents = self.unet.config.in_channels
-        latents = self.prepare_latents(
-            batch_size * num_images_per_prompt,
-            num_channels_latents,
-            height,
-            width,
-            prompt_embeds.dtype,
-            device,
-            generator,
-            latents,
-        )
+        if img2img:
+            latents = self.prepare_img2img_latents(
+                source_latents,
+                timesteps[:1],
+                batch_size * num_images_per_prompt,
+                prompt_embeds.dtype,
+                device,
+                generator,
+            )
+        else:
+            latents = self.prepare_latents(
+                batch_size * num_images_per_prompt,
+                num_channels_latents,
+                height,
+                width,
+                prompt_embeds.dtype,
+                device,
+                generator,
+                latents,
+            )
 
         # 7. Prepare extra step kwargs. TODO: Logic should ideally just be moved out of the pipeline
         extra_step_kwargs = self.prepare_extra_step_kwargs(generator, eta)
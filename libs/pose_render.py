@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+SPIGA 68점 랜드마크 → 색상 코드 포즈 맵 렌더러
+- render_pose(): OpenCV 폴리라인/채우기로 uint8 버퍼에 직접 그린다.
+  (matplotlib figure 생성/캔버스 읽기 없이, 스레드별 버퍼 재사용)
+- render_pose_matplotlib(): 기존 matplotlib 렌더러 (비교/검증용, matplotlib 지연 import)
+
+색상/두께는 기존 matplotlib 출력에 맞춘다. (lw=4pt @72dpi = 4px, 눈/입술은 같은 색으로 채움)
+검증: tests/test_pose_render.py
+"""
+import threading
+from typing import Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# (랜드마크 구간, RGB 색상, 닫힌 도형 여부) — matplotlib 색 이름과 같은 값
+POSE_PARTS = (
+    (slice(0, 17), (0, 255, 0), False),      # 얼굴 윤곽 (lime)
+    (slice(17, 22), (255, 255, 0), False),   # 왼쪽 눈썹 (yellow)
+    (slice(22, 27), (255, 255, 0), False),   # 오른쪽 눈썹 (yellow)
+    (slice(27, 31), (255, 165, 0), False),   # 콧대 (orange)
+    (slice(31, 36), (255, 165, 0), False),   # 콧볼 (orange)
+    (slice(36, 42), (255, 0, 255), True),    # 왼쪽 눈 (magenta)
+    (slice(42, 48), (255, 0, 255), True),    # 오른쪽 눈 (magenta)
+    (slice(48, 60), (0, 255, 255), True),    # 바깥 입술 (cyan)
+    (slice(60, 68), (0, 0, 255), True),      # 안쪽 입술 (blue)
+)
+LINE_WIDTH = 4
+# cv2 LINE_AA 선의 실제 폭(가로선 단면 커버리지 실측): thickness 2 → 3.4px, 3·4 → 5.4px, 5 → 7.4px
+# (짝수 두께는 홀수로 올려 그린 뒤 AA 가장자리가 더해진다). matplotlib 4px 에 가장 가까운 2 를 쓴다.
+_CV_THICKNESS = 2
+_SHIFT = 4  # 서브픽셀 좌표 정밀도 (1/16 px)
+
+_local = threading.local()
+
+
+def _hw(size) -> Tuple[int, int]:
+    """size: 정사각 한 변(int) 또는 (width, height) → (height, width)"""
+    if isinstance(size, (tuple, list)):
+        return int(size[1]), int(size[0])
+    return int(size), int(size)
+
+
+def _buffer(size) -> np.ndarray:
+    """스레드별로 재사용하는 (height, width, 3) uint8 버퍼"""
+    h, w = _hw(size)
+    buf = getattr(_local, "buf", None)
+    if buf is None or buf.shape[:2] != (h, w):
+        buf = _local.buf = np.empty((h, w, 3), dtype=np.uint8)
+    buf.fill(0)
+    return buf
+
+
+def render_pose_array(landmarks_, size=512, out: np.ndarray = None) -> np.ndarray:
+    """
+    얼굴별 랜드마크 리스트를 (height, width, 3) RGB uint8 배열에 그린다.
+    size: 정사각 한 변 또는 (width, height)
+    out: 재사용할 버퍼 (없으면 스레드별 버퍼). 반환값은 out 자체이므로 보관하려면 복사할 것.
+    """
+    if out is None:
+        out = _buffer(size)
+    else:
+        out.fill(0)
+
+    scale = float(1 << _SHIFT)
+    for landmarks in landmarks_:
+        pts_all = np.asarray(landmarks, dtype=np.float64).reshape(-1, 2)
+        for part, color, closed in POSE_PARTS:
+            pts = np.rint(pts_all[part] * scale).astype(np.int32).reshape(-1, 1, 2)
+            if len(pts) == 0:
+                continue
+            if closed:
+                cv2.fillPoly(out, [pts], color, lineType=cv2.LINE_AA, shift=_SHIFT)
+            cv2.polylines(out, [pts], closed, color, thickness=_CV_THICKNESS, lineType=cv2.LINE_AA, shift=_SHIFT)
+    return out
+
+
+def render_pose(landmarks_, size=512) -> Image.Image:
+    """포즈 맵 PIL 이미지 (RGB). PIL이 버퍼를 복사하므로 스레드 버퍼 재사용과 무관하게 안전"""
+    return Image.fromarray(render_pose_array(landmarks_, size=size))
+
+
+# ------------------------------------------------------------
+# 기존 matplotlib 렌더러 (비교용)
+# ------------------------------------------------------------
+_MPL_COLORS = ("lime", "yellow", "yellow", "orange", "orange", "magenta", "magenta", "cyan", "blue")
+
+
+def render_pose_matplotlib(landmarks_, size: int = 512) -> Image.Image:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as patches
+    from matplotlib.path import Path
+
+    def get_patch(landmarks, color="lime", closed=False):
+        contour = list(landmarks)
+        ops = [Path.MOVETO] + [Path.LINETO] * (len(contour) - 1)
+        facecolor = (0, 0, 0, 0)
+        if closed:
+            contour.append(contour[0])
+            ops.append(Path.CLOSEPOLY)
+            facecolor = color
+        path = Path(contour, ops)
+        return patches.PathPatch(path, facecolor=facecolor, edgecolor=color, lw=LINE_WIDTH)
+
+    dpi = 72
+    fig, ax = plt.subplots(1, figsize=[size / dpi, size / dpi], tight_layout={"pad": 0})
+    fig.set_dpi(dpi)
+    ax.imshow(np.zeros((size, size, 3)))
+
+    for landmarks in landmarks_:
+        landmarks = [tuple(p) for p in landmarks]
+        for (part, _, closed), color in zip(POSE_PARTS, _MPL_COLORS):
+            ax.add_patch(get_patch(landmarks[part], color=color, closed=closed))
+        plt.axis("off")
+        fig.canvas.draw()
+
+    buffer, (width, height) = fig.canvas.print_to_buffer()
+    assert width == height == size
+    buffer = np.frombuffer(buffer, np.uint8).reshape((height, width, 4))[:, :, 0:3]
+    plt.close(fig)
+    return Image.fromarray(np.ascontiguousarray(buffer))
@@ -1,29 +1,43 @@
+import hashlib
 import os
+import threading
+from collections import OrderedDict
 import cv2
-import tqdm
 import numpy as np
 from PIL import Image
-from facelib import FaceDetector
-from spiga.inference.config import ModelConfig
-from spiga.inference.framework import SPIGAFramework
+
+from libs.pose_render import render_pose
 
 # SPIGA 체크포인트 경로 설정 (checkpoints/makeup 폴더)
 spiga_ckpt = "./checkpoints/makeup/spiga_300wpublic.pt"
 
-# 체크포인트 존재 확인
-if not os.path.exists(spiga_ckpt):
-    raise FileNotFoundError(
-        f"SPIGA checkpoint not found at {spiga_ckpt}\n"
-        "Please download manually:\n"
-        "1. Download: https://drive.google.com/file/d/1YrbScfMzrAAWMJQYgxdLZ9l57nmTdpQC/view\n"
-        f"2. Place at: {spiga_ckpt}"
-    )
-
-# SPIGA 설정
-spiga_config = ModelConfig("300wpublic")
-spiga_config.load_model_url = False
-spiga_config.model_weights_path = os.path.dirname(spiga_ckpt)
-processor = SPIGAFramework(spiga_config)
+# SPIGA는 import 시점이 아니라 첫 사용 시 생성 (get_spiga_processor)
+_PROCESSOR = None
+_PROCESSOR_LOCK = threading.Lock()
+
+
+def get_spiga_processor():
+    """SPIGAFramework 싱글톤 (체크포인트 확인 + 모델 생성은 최초 호출 시 1회)"""
+    global _PROCESSOR
+    with _PROCESSOR_LOCK:
+        if _PROCESSOR is None:
+            # 체크포인트 존재 확인
+            if not os.path.exists(spiga_ckpt):
+                raise FileNotFoundError(
+                    f"SPIGA checkpoint not found at {spiga_ckpt}\n"
+                    "Please download manually:\n"
+                    "1. Download: https://drive.google.com/file/d/1YrbScfMzrAAWMJQYgxdLZ9l57nmTdpQC/view\n"
+                    f"2. Place at: {spiga_ckpt}"
+                )
+            from spiga.inference.config import ModelConfig
+            from spiga.inference.framework import SPIGAFramework
+
+            # SPIGA 설정
+            spiga_config = ModelConfig("300wpublic")
+            spiga_config.load_model_url = False
+            spiga_config.model_weights_path = os.path.dirname(spiga_ckpt)
+            _PROCESSOR = SPIGAFramework(spiga_config)
+        return _PROCESSOR
 
 def center_crop(image, size):
     width, height = image.size
@@ -66,7 +80,7 @@ def get_landmarks(image, detector):
     if len(box_ls) == 0:
         return []
     else:
-        features = processor.inference(image, box_ls)
+        features = get_spiga_processor().inference(image, box_ls)
         landmarks = np.array(features['landmarks'])
         return landmarks
 
@@ -104,68 +118,129 @@ def spiga_process(example, detector):
         image = np.array(image)
         image = image[:, :, ::-1]
         bbox = bbox_from_landmarks(ldms)
-        features = processor.inference(image, [*bbox])
+        features = get_spiga_processor().inference(image, [*bbox])
         landmarks = features["landmarks"]
         spigas = landmarks
         return spigas
 
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.path import Path
-import PIL
+def _box_iou(a, b):
+    """(x, y, w, h) 박스 IoU"""
+    ax1, ay1, ax2, ay2 = a[0], a[1], a[0] + a[2], a[1] + a[3]
+    bx1, by1, bx2, by2 = b[0], b[1], b[0] + b[2], b[1] + b[3]
+    iw = max(0.0, min(ax2, bx2) - max(ax1, bx1))
+    ih = max(0.0, min(ay2, by2) - max(ay1, by1))
+    inter = iw * ih
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union > 0 else 0.0
+
+
+class LandmarkEngine:
+    """
+    얼굴 검출기 + SPIGA를 소유하는 단일 패스 랜드마크 엔진
+    - 검출은 이미지당 1회
+    - SPIGA 2차(랜드마크 기반 박스) 추론은 검출 박스와 랜드마크 박스의
+      IoU가 refine_iou 미만인 얼굴에 대해서만 수행
+    - landmarks_batch(): 여러 이미지를 한 번에 처리
+      (SPIGAFramework는 이미지 단위 입력이므로, 이미지별로 모든 얼굴 박스를 한 번에 추론)
+    - cached_landmarks(): 원본 좌표계 랜드마크를 이미지 픽셀 해시로 캐시
+      (preview / final 등 해상도가 다른 요청은 좌표만 변환해 포즈 맵을 다시 그린다)
+    """
+
+    def __init__(self, detector=None, spiga_processor=None, refine_iou=0.5, cache_size=32):
+        if detector is None:
+            from facelib import FaceDetector
+            detector = FaceDetector()
+        self.detector = detector
+        self.processor = spiga_processor if spiga_processor is not None else get_spiga_processor()
+        self.refine_iou = refine_iou
+        self._lock = threading.Lock()  # facelib / SPIGA 모두 스레드 안전하지 않음
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+
+    def detect(self, image_bgr):
+        """검출 박스 목록 (x, y, w, h)"""
+        faces, boxes, scores, landmarks = self.detector.detect_align(image_bgr)
+        boxes = boxes.cpu().numpy()
+        return [(float(x), float(y), float(x1 - x), float(y1 - y)) for x, y, x1, y1 in boxes]
+
+    def _landmarks_bgr(self, image_bgr):
+        boxes = self.detect(image_bgr)
+        if len(boxes) == 0:
+            return []
+        landmarks = list(self.processor.inference(image_bgr, boxes)["landmarks"])
+
+        # 랜드마크 박스가 검출 박스와 크게 어긋나는 얼굴만 2차 추론
+        ldm_boxes = bbox_from_landmarks(landmarks)
+        refine_idx = [i for i, (det, ldm) in enumerate(zip(boxes, ldm_boxes)) if _box_iou(det, ldm) < self.refine_iou]
+        if refine_idx:
+            refined = self.processor.inference(image_bgr, [ldm_boxes[i] for i in refine_idx])["landmarks"]
+            for i, ldm in zip(refine_idx, refined):
+                landmarks[i] = ldm
+        return landmarks
 
+    def landmarks(self, pil_img):
+        """PIL(RGB) 이미지 → 얼굴별 68점 랜드마크 리스트 (얼굴 없으면 [])"""
+        image_bgr = np.ascontiguousarray(np.asarray(pil_img.convert("RGB"))[:, :, ::-1])
+        with self._lock:
+            return self._landmarks_bgr(image_bgr)
 
-def get_patch(landmarks, color='lime', closed=False):
-    contour = landmarks
-    ops = [Path.MOVETO] + [Path.LINETO] * (len(contour) - 1)
-    facecolor = (0, 0, 0, 0)
-    if closed:
-        contour.append(contour[0])
-        ops.append(Path.CLOSEPOLY)
-        facecolor = color
-    path = Path(contour, ops)
-    return patches.PathPatch(path, facecolor=facecolor, edgecolor=color, lw=4)
+    def face_boxes(self, pil_img):
+        """PIL(RGB) 이미지 → 얼굴 검출 박스 목록 (x, y, w, h), SPIGA는 돌리지 않음"""
+        image_bgr = np.ascontiguousarray(np.asarray(pil_img.convert("RGB"))[:, :, ::-1])
+        with self._lock:
+            return self.detect(image_bgr)
+
+    def cached_landmarks(self, pil_img, max_side=512):
+        """
+        원본 이미지 좌표계의 랜드마크 (얼굴 없으면 []).
+        검출/SPIGA는 긴 변 max_side 로 줄인 사본에서 1회 수행하고 좌표만 원본 크기로 되돌린다.
+        """
+        pil_img = pil_img.convert("RGB")
+        key = hashlib.sha256(pil_img.tobytes()).hexdigest() + f":{pil_img.size}:{max_side}"
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        w, h = pil_img.size
+        scale = min(1.0, max_side / max(w, h))
+        small = pil_img if scale == 1.0 else pil_img.resize((round(w * scale), round(h * scale)), Image.LANCZOS)
+        landmarks = [(np.asarray(ldm, dtype=np.float64) / scale).tolist() for ldm in self.landmarks(small)]
+
+        with self._lock:
+            self._cache[key] = landmarks
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return landmarks
+
+    def landmarks_batch(self, pil_images):
+        """여러 이미지의 랜드마크를 한 번의 호출로 계산"""
+        images_bgr = [np.ascontiguousarray(np.asarray(img.convert("RGB"))[:, :, ::-1]) for img in pil_images]
+        with self._lock:
+            return [self._landmarks_bgr(img) for img in images_bgr]
 
 
 def conditioning_from_landmarks(landmarks_, size=512):
-    dpi = 72
-    fig, ax = plt.subplots(1, figsize=[size / dpi, size / dpi], tight_layout={'pad': 0})
-    fig.set_dpi(dpi)
-    black = np.zeros((size, size, 3))
-    ax.imshow(black)
-    
-    for landmarks in landmarks_:
-        face_patch = get_patch(landmarks[0:17])
-        l_eyebrow  = get_patch(landmarks[17:22], color='yellow')
-        r_eyebrow  = get_patch(landmarks[22:27], color='yellow')
-        nose_v     = get_patch(landmarks[27:31], color='orange')
-        nose_h     = get_patch(landmarks[31:36], color='orange')
-        l_eye      = get_patch(landmarks[36:42], color='magenta', closed=True)
-        r_eye      = get_patch(landmarks[42:48], color='magenta', closed=True)
-        outer_lips = get_patch(landmarks[48:60], color='cyan', closed=True)
-        inner_lips = get_patch(landmarks[60:68], color='blue', closed=True)
-        
-        ax.add_patch(face_patch)
-        ax.add_patch(l_eyebrow)
-        ax.add_patch(r_eyebrow)
-        ax.add_patch(nose_v)
-        ax.add_patch(nose_h)
-        ax.add_patch(l_eye)
-        ax.add_patch(r_eye)
-        ax.add_patch(outer_lips)
-        ax.add_patch(inner_lips)
-        
-        plt.axis('off')
-        fig.canvas.draw()
-    
-    buffer, (width, height) = fig.canvas.print_to_buffer()
-    assert width == height
-    assert width == size
-    buffer = np.frombuffer(buffer, np.uint8).reshape((height, width, 4))
-    buffer = buffer[:, :, 0:3]
-    plt.close(fig)
-    return PIL.Image.fromarray(buffer)
+    """포즈 맵 렌더링 (OpenCV 래스터 렌더러, 기존 matplotlib 출력과 같은 색/두께)"""
+    return render_pose(landmarks_, size=size)
+
+
+def transform_landmarks(landmarks_, scale, offset=(0.0, 0.0)):
+    """랜드마크 좌표 변환: p * scale + offset (리사이즈 + 패딩 배치에 맞춤)"""
+    ox, oy = offset
+    return [(np.asarray(ldm, dtype=np.float64) * scale + (ox, oy)).tolist() for ldm in landmarks_]
+
+
+def pose_from_landmarks(landmarks_, size, scale=1.0, offset=(0.0, 0.0)):
+    """
+    캐시된 원본 좌표 랜드마크 → 목표 배치(scale, offset)의 포즈 맵.
+    size: 정사각 한 변 또는 (width, height). 얼굴이 없으면 검은 이미지
+    """
+    if len(landmarks_) == 0:
+        wh = tuple(size) if isinstance(size, (tuple, list)) else (size, size)
+        return Image.new("RGB", wh, color=(0, 0, 0))
+    return render_pose(transform_landmarks(landmarks_, scale, offset), size=size)
 
 
 def spiga_segmentation(spiga, size):
@@ -174,18 +249,17 @@ def spiga_segmentation(spiga, size):
     return spiga_seg
 
 
-def get_draw(pil_img, size):
+def get_draw(pil_img, size, engine=None):
     """
     포즈 이미지 생성 (service/makeup_service.py에서 호출)
+    engine: LandmarkEngine (없으면 makeup_service 의 공용 싱글톤 — 검출기/SPIGA를 요청마다 만들지 않음)
     """
-    from facelib import FaceDetector
-    
-    # FaceDetector는 service에서 전달받지 않고 여기서 생성
-    # (또는 service에서 전달받도록 수정 가능)
-    detector = FaceDetector()
-    
-    spigas = spiga_process(pil_img, detector)
-    if spigas == False:
+    if engine is None:
+        from service.makeup_service import get_landmark_engine  # 순환 import 방지 (지연)
+        engine = get_landmark_engine()
+
+    spigas = engine.landmarks(pil_img)
+    if len(spigas) == 0:
         width, height = pil_img.size
         black_image_pil = Image.new("RGB", (width, height), color=(0, 0, 0))
         return black_image_pil
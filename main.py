@@ -1,13 +1,24 @@
 # main.py
 import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from api.router import api_router
 from api.health import router as health_router
+from model_manager.preloader import get_preloader
 
 ROOT_PATH = os.getenv("ROOT_PATH", "")  # 예: "/proxy/8000" (환경에 맞게)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # PRELOAD_MODELS 패밀리를 백그라운드 스레드에서 병렬 로드/웜업 (완료 전까지 /ready = 503)
+    get_preloader().start()
+    yield
+
+
 app = FastAPI(
     title="Beautiq API",
+    lifespan=lifespan,
     version="0.1.0",
     root_path=ROOT_PATH,        # ✅ 중요: 프록시 경로
     docs_url="/docs",           # 기본 유지 (root_path가 앞에 자동으로 붙습니다)
@@ -1,16 +1,35 @@
+import threading
+
 import torch
 from transformers import CLIPProcessor, CLIPModel
 
-_model = None
-_processor = None
+from model_manager.registry import get_registry
+
+REGISTRY_KEY = "style"
+
+_model_name = "openai/clip-vit-base-patch32"
+_LOCK = threading.Lock()
 
 def load_clip(model_name="openai/clip-vit-base-patch32"):
     """
-    CLIP 모델과 Processor를 한 번만 로드하고 반환
+    CLIP 모델과 Processor를 한 번만 로드하고 반환 (레지스트리 캐시)
+    레지스트리 키는 패밀리("style") 하나이므로, 다른 model_name 으로 이미 로드되어 있으면 ValueError
+    (바꾸려면 get_registry().unload("style") 후 호출)
     """
-    global _model, _processor
+    global _model_name
+    with _LOCK:
+        if model_name != _model_name and get_registry().is_loaded(REGISTRY_KEY):
+            raise ValueError(f"CLIP이 이미 {_model_name}(으)로 로드되어 있습니다 (요청: {model_name})")
+        _model_name = model_name
+        return get_registry().get(REGISTRY_KEY)
+
+
+def _build_clip():
+    """레지스트리 로더: (model, processor, device)"""
     device = "cuda" if torch.cuda.is_available() else "cpu"
-    if _model is None or _processor is None:
-        _model = CLIPModel.from_pretrained(model_name).to(device)
-        _processor = CLIPProcessor.from_pretrained(model_name)
-    return _model, _processor, device
\ No newline at end of file
+    model = CLIPModel.from_pretrained(_model_name).to(device)
+    processor = CLIPProcessor.from_pretrained(_model_name)
+    return model, processor, device
+
+
+get_registry().register(REGISTRY_KEY, _build_clip)
@@ -0,0 +1,164 @@
+# model_manager/compile_manager.py
+"""
+메이크업 파이프라인 그래프 컴파일 (opt-in: MAKEUP_COMPILE=1, CPU 만: MAKEUP_CPU_COMPILE=1)
+- UNet / ControlNet 2개 / VAE decoder 를 torch.compile(dynamic=False) 로 감싼다.
+- 형상 버킷(해상도 × 배치) 을 기동 시 모두 웜업해 그래프를 미리 만든다.
+  요청 해상도는 route_size() 로 가장 가까운 버킷에 맞추므로 서빙 중에는 재컴파일이 일어나지 않는다.
+- 컴파일 산출물(Inductor FX graph cache, 가능하면 mega-cache 아티팩트)은 MAKEUP_COMPILE_CACHE_DIR 에 저장해
+  다음 기동 시 재사용한다.
+
+버킷은 CFG 사용(guidance_scale > 1, API 기본값) 기준으로 웜업한다.
+"""
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from config import get_settings
+
+_ARTIFACT_FILE = "mega_cache.bin"
+_CONFIGURED = False
+_LOCK = threading.Lock()
+
+
+def compile_enabled(device: str = "cpu") -> bool:
+    """
+    device 에서 파이프라인을 컴파일하는지 (execution_profile.select_profile 과 같은 조건)
+    cuda: MAKEUP_COMPILE / cpu: MAKEUP_COMPILE 또는 MAKEUP_CPU_COMPILE
+    """
+    s = get_settings()
+    if str(device).startswith("cuda"):
+        return s.MAKEUP_COMPILE
+    return s.MAKEUP_COMPILE or s.MAKEUP_CPU_COMPILE
+
+
+def buckets() -> List[Tuple[int, int]]:
+    """(해상도, 배치) 버킷 목록"""
+    s = get_settings()
+    return [(size, batch) for size in s.MAKEUP_COMPILE_SIZES for batch in s.MAKEUP_COMPILE_BATCH_SIZES]
+
+
+def route_size(size: int, device: str = "cpu") -> int:
+    """
+    요청 해상도를 컴파일된 버킷 해상도로 맞춘다.
+    size 이상인 가장 작은 버킷, 없으면 가장 큰 버킷 (device 에서 컴파일 비활성 시 그대로)
+    """
+    if not compile_enabled(device):
+        return size
+    sizes = sorted(get_settings().MAKEUP_COMPILE_SIZES)
+    for bucket in sizes:
+        if bucket >= size:
+            return bucket
+    return sizes[-1]
+
+
+# ------------------------------------------------------------
+# 디스크 캐시
+# ------------------------------------------------------------
+def configure_cache() -> None:
+    """Inductor 캐시 디렉토리 / FX graph cache / dynamo 캐시 한도 설정 (1회)"""
+    global _CONFIGURED
+    with _LOCK:
+        if _CONFIGURED:
+            return
+        s = get_settings()
+        cache_dir = os.path.abspath(s.MAKEUP_COMPILE_CACHE_DIR)
+        os.makedirs(cache_dir, exist_ok=True)
+        os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", os.path.join(cache_dir, "inductor"))
+        os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+
+        import torch
+        import torch._dynamo
+        import torch._inductor.config as inductor_config
+
+        inductor_config.fx_graph_cache = True
+        # 버킷마다 그래프 1개 + CFG 유무 여유분. 한도를 넘으면 dynamo가 eager로 떨어진다.
+        limit = max(8, 2 * len(buckets()) + 2)
+        torch._dynamo.config.cache_size_limit = max(torch._dynamo.config.cache_size_limit, limit)
+
+        artifact = os.path.join(cache_dir, _ARTIFACT_FILE)
+        if os.path.exists(artifact) and hasattr(torch.compiler, "load_cache_artifacts"):
+            try:
+                with open(artifact, "rb") as f:
+                    torch.compiler.load_cache_artifacts(f.read())
+                print(f"✓ Loaded compile cache artifacts: {artifact}")
+            except Exception as e:
+                print(f"⚠️ compile cache artifacts ignored: {e}")
+        _CONFIGURED = True
+
+
+def save_cache_artifacts() -> Optional[str]:
+    """웜업 후 컴파일 산출물을 한 파일로 저장 (torch>=2.6 mega-cache, 미지원이면 FX graph cache만 사용)"""
+    import torch
+    if not hasattr(torch.compiler, "save_cache_artifacts"):
+        return None
+    result = torch.compiler.save_cache_artifacts()
+    if result is None:
+        return None
+    data = result[0]
+    path = os.path.join(os.path.abspath(get_settings().MAKEUP_COMPILE_CACHE_DIR), _ARTIFACT_FILE)
+    with open(path + ".tmp", "wb") as f:
+        f.write(data)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+# ------------------------------------------------------------
+# 컴파일 / 웜업
+# ------------------------------------------------------------
+def _mode(device: str) -> Optional[str]:
+    mode = get_settings().MAKEUP_COMPILE_MODE
+    if mode:
+        return None if mode == "default" else mode
+    # CUDA: CUDA graph 사용 (파이프라인이 step마다 cudagraph_mark_step_begin 호출)
+    return "reduce-overhead" if str(device).startswith("cuda") else None
+
+
+def compile_pipeline(pipeline, device: str):
+    """UNet / ControlNet 각각 / VAE decoder 를 고정 형상으로 컴파일 (MultiControlNetModel 래퍼는 유지)"""
+    import torch
+
+    configure_cache()
+    mode = _mode(device)
+    opts = {"dynamic": False, "fullgraph": False}
+    if mode:
+        opts["mode"] = mode
+
+    pipeline.unet = torch.compile(pipeline.unet, **opts)
+    nets = getattr(pipeline.controlnet, "nets", None)
+    if nets is not None:
+        for i in range(len(nets)):
+            nets[i] = torch.compile(nets[i], **opts)
+    else:
+        pipeline.controlnet = torch.compile(pipeline.controlnet, **opts)
+    pipeline.vae.decoder = torch.compile(pipeline.vae.decoder, **opts)
+    print(f"✓ Makeup pipeline compiled (mode={mode or 'default'}, buckets={buckets()})")
+    return pipeline
+
+
+def warm_buckets(pipeline, makeup_encoder, steps: int = 2) -> dict:
+    """모든 버킷을 한 번씩 실행해 그래프를 만든다. 버킷별 소요 시간(초) 반환"""
+    from PIL import Image
+    from model_manager.memory_planner import plan_memory
+
+    timings = {}
+    for size, batch in buckets():
+        img = Image.new("RGB", (size, size), color=(128, 128, 128))
+        plan_memory(pipeline, makeup_encoder, size, size, batch=2 * batch)
+        t0 = time.perf_counter()
+        makeup_encoder.generate(
+            id_image=[img, img],
+            makeup_image=img,
+            pipe=pipeline,
+            guidance_scale=get_settings().DEFAULT_GUIDANCE,
+            num_inference_steps=steps,
+            num_images_per_prompt=batch,
+            seed=0,
+        )
+        timings[f"{size}x{batch}"] = round(time.perf_counter() - t0, 2)
+        print(f"  ✓ compile bucket {size}px × {batch}: {timings[f'{size}x{batch}']}s")
+
+    path = save_cache_artifacts()
+    if path:
+        print(f"✓ Saved compile cache artifacts: {path}")
+    return timings
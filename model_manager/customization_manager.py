@@ -2,17 +2,25 @@
 import torch
 from transformers import SegformerImageProcessor, SegformerForSemanticSegmentation
 
-_model = None
-_processor = None
+from model_manager.registry import get_registry
+
+REGISTRY_KEY = "custom"
+
 _device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
 def load_customization_model():
     """
-    SegFormer 모델을 전역 1회만 로드하여 재사용
+    SegFormer 모델을 전역 1회만 로드하여 재사용 (레지스트리 캐시)
     """
-    global _model, _processor
-    if _model is None or _processor is None:
-        _processor = SegformerImageProcessor.from_pretrained("jonathandinu/face-parsing")
-        _model = SegformerForSemanticSegmentation.from_pretrained("jonathandinu/face-parsing")
-        _model.to(_device).eval()
-    return _model, _processor, _device
\ No newline at end of file
+    return get_registry().get(REGISTRY_KEY)
+
+
+def _build_customization_model():
+    """레지스트리 로더: (model, processor, device)"""
+    processor = SegformerImageProcessor.from_pretrained("jonathandinu/face-parsing")
+    model = SegformerForSemanticSegmentation.from_pretrained("jonathandinu/face-parsing")
+    model.to(_device).eval()
+    return model, processor, _device
+
+
+get_registry().register(REGISTRY_KEY, _build_customization_model)
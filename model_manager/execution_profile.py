@@ -0,0 +1,111 @@
+# model_manager/execution_profile.py
+"""
+메이크업 파이프라인 실행 프로파일 (디바이스별 자동 선택)
+- cuda: float16 (기존 동작)
+- cpu : bf16 지원 CPU(AVX512-BF16 / AMX)면 bfloat16, 아니면 float32 (CPU fp16 커널은 느리거나 미지원)
+        UNet / ControlNet / VAE 를 channels_last 로 변환 (oneDNN 컨볼루션 경로)
+        intra-op 스레드 수 설정, 선택적으로 torch.compile
+- 환경변수로 개별 항목 덮어쓰기: MAKEUP_CPU_DTYPE, MAKEUP_CPU_CHANNELS_LAST, MAKEUP_CPU_COMPILE, MAKEUP_CPU_THREADS
+- 컴파일(MAKEUP_COMPILE / MAKEUP_CPU_COMPILE)은 compile_manager 가 형상 버킷별로 수행
+- MAKEUP_QUANTIZE=int8 (CPU 전용): Linear 가중치를 int8 동적 양자화 → dtype은 float32 고정
+  (양자화 단계는 makeup_manager.quantize_models)
+"""
+import os
+from typing import Optional
+
+import torch
+
+from config import get_settings
+
+
+class ExecutionProfile:
+    def __init__(self, name: str, device: str, dtype: torch.dtype, channels_last: bool = False,
+                 compile: bool = False, threads: Optional[int] = None, quantize: str = ""):
+        self.name = name
+        self.device = device
+        self.dtype = dtype
+        self.channels_last = channels_last
+        self.compile = compile
+        self.threads = threads
+        self.quantize = quantize
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "device": self.device,
+            "dtype": str(self.dtype).replace("torch.", ""),
+            "channels_last": self.channels_last,
+            "compile": self.compile,
+            "threads": self.threads,
+            "quantize": self.quantize or None,
+        }
+
+
+def cpu_supports_bf16() -> bool:
+    """oneDNN bf16 네이티브 지원 여부 (AVX512-BF16 / AMX)"""
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except Exception:
+        pass
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            flags = f.read()
+        return "avx512_bf16" in flags or "amx_bf16" in flags
+    except OSError:
+        return False
+
+
+def select_profile(device: str) -> ExecutionProfile:
+    """디바이스에 맞는 실행 프로파일"""
+    from model_manager.compile_manager import compile_enabled
+    if str(device).startswith("cuda"):
+        if get_settings().MAKEUP_QUANTIZE:
+            print("⚠️ MAKEUP_QUANTIZE is CPU-only, ignored on cuda")
+        return ExecutionProfile("cuda-fp16", device, torch.float16, compile=compile_enabled(device))
+
+    s = get_settings()
+    quantize = s.MAKEUP_QUANTIZE
+    if quantize and quantize != "int8":
+        raise ValueError(f"지원하지 않는 MAKEUP_QUANTIZE: {quantize} (int8)")
+    if quantize:
+        dtype = torch.float32  # 동적 양자화 커널은 fp32 활성값을 받는다
+    elif s.MAKEUP_CPU_DTYPE == "auto":
+        dtype = torch.bfloat16 if cpu_supports_bf16() else torch.float32
+    else:
+        dtype = getattr(torch, s.MAKEUP_CPU_DTYPE)
+    threads = s.MAKEUP_CPU_THREADS
+    if not threads:
+        threads = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    name = f"cpu-{quantize or str(dtype).replace('torch.', '')}"
+    return ExecutionProfile(
+        name, device, dtype,
+        channels_last=s.MAKEUP_CPU_CHANNELS_LAST,
+        compile=compile_enabled(device),
+        threads=threads,
+        quantize=quantize,
+    )
+
+
+def apply_threads(profile: ExecutionProfile) -> None:
+    if profile.threads:
+        torch.set_num_threads(profile.threads)
+
+
+def apply_profile(pipeline, makeup_encoder, profile: ExecutionProfile):
+    """로드된 파이프라인에 프로파일 적용 (dtype은 로드 시점에 이미 반영됨)"""
+    apply_threads(profile)
+
+    if profile.channels_last:
+        pipeline.unet.to(memory_format=torch.channels_last)
+        for net in getattr(pipeline.controlnet, "nets", [pipeline.controlnet]):
+            net.to(memory_format=torch.channels_last)
+        pipeline.vae.to(memory_format=torch.channels_last)
+
+    print(f"✓ Makeup execution profile: {profile.as_dict()}")
+
+    if profile.compile:
+        # 로드 시점에 모든 형상 버킷을 컴파일/웜업 → 서빙 중 재컴파일 없음
+        from model_manager.compile_manager import compile_pipeline, warm_buckets
+        compile_pipeline(pipeline, profile.device)
+        warm_buckets(pipeline, makeup_encoder, steps=get_settings().MAKEUP_WARMUP_STEPS)
+    return pipeline, makeup_encoder
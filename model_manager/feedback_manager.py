@@ -4,13 +4,18 @@ import os
 import threading
 from typing import Optional
 
-try:
-    import google.generativeai as genai
-except ImportError as e:
-    raise ImportError(
-        "google-generativeai 가 설치되어 있지 않습니다. "
-        "requirements_org/requirements_feedback.txt 를 참고하여 설치하세요."
-    ) from e
+
+def _genai():
+    """google.generativeai 지연 import (모듈 import 시점에 SDK를 로드하지 않음)"""
+    try:
+        import google.generativeai as genai
+    except ImportError as e:
+        raise ImportError(
+            "google-generativeai 가 설치되어 있지 않습니다. "
+            "requirements_org/requirements_feedback.txt 를 참고하여 설치하세요."
+        ) from e
+    return genai
+
 
 _model_lock = threading.Lock()
 _model_obj: Optional["genai.GenerativeModel"] = None
@@ -20,7 +25,7 @@ def _configure() -> None:
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise ValueError("GEMINI_API_KEY 환경변수가 설정되어 있지 않습니다.")
-    genai.configure(api_key=api_key)
+    _genai().configure(api_key=api_key)
 
 def load_model(model_name: Optional[str] = None) -> "genai.GenerativeModel":
     """
@@ -39,7 +44,7 @@ def load_model(model_name: Optional[str] = None) -> "genai.GenerativeModel":
         gen_cfg = {}
         gen_cfg = gen_cfg if any(gen_cfg.values()) else None
 
-        _model_obj = genai.GenerativeModel(model_name=_model_name, generation_config=gen_cfg)
+        _model_obj = _genai().GenerativeModel(model_name=_model_name, generation_config=gen_cfg)
         return _model_obj
 
 def get_loaded_model_name() -> Optional[str]:
@@ -0,0 +1,236 @@
+# model_manager/makeup_bundle.py
+"""
+메이크업 모델 번들 (사전 조립된 단일 아티팩트)
+- bake_bundle(): 전체 파이프라인(SSR 프로세서가 설치된 UNet, ControlNet 2개, VAE, 텍스트 인코더,
+  detail encoder의 CLIP + resampler)을 목표 dtype으로 조립해 하나의 model.safetensors 로 저장
+- load_bundle(): 설정 파일만으로 모듈을 meta 디바이스에 만들고, 구성요소(prefix)별로 텐서를 읽어 assign
+  (HF Hub / 원본 체크포인트 / 네트워크 접근 없음)
+
+번들 구조:
+    <out>/<version>/
+        manifest.json          포맷/버전/dtype/구성요소 prefix/원본 체크포인트 해시
+        model.safetensors      "unet.", "controlnet.0.", "controlnet.1.", "vae.", "text_encoder.", "detail_encoder." prefix
+        unet/ controlnet_0/ controlnet_1/ vae/ text_encoder/ image_encoder/   config.json
+        tokenizer/             CLIPTokenizer 파일
+        scheduler/             DDIM scheduler_config.json
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Optional, Tuple
+
+import torch
+
+BUNDLE_FORMAT = "beautiq-makeup-bundle"
+BUNDLE_FORMAT_VERSION = 1
+WEIGHTS_FILE = "model.safetensors"
+MANIFEST_FILE = "manifest.json"
+
+
+def _sha256(path: str, chunk: int = 16 * 2**20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _prefixed(prefix: str, state_dict: dict, dtype: torch.dtype, skip: Tuple[str, ...] = ()) -> dict:
+    out = {}
+    for k, v in state_dict.items():
+        if k.startswith(skip):
+            continue
+        v = v.detach()
+        if v.is_floating_point():
+            v = v.to(dtype)
+        out[prefix + k] = v.contiguous().clone()  # 저장소 공유 텐서 분리 (safetensors 제약)
+    return out
+
+
+# ------------------------------------------------------------
+# Bake
+# ------------------------------------------------------------
+def bake_bundle(
+    out_dir: str,
+    model_id: str = "runwayml/stable-diffusion-v1-5",
+    checkpoint_path: str = "./checkpoints/makeup",
+    image_encoder_path: str = "./models/image_encoder_l",
+    dtype: torch.dtype = torch.float16,
+    version: Optional[str] = None,
+) -> str:
+    """조립된 파이프라인을 번들로 저장하고 번들 디렉토리 경로를 반환"""
+    from safetensors.torch import save_file
+    from config import get_settings
+    from model_manager.makeup_manager import _build_model
+    from utils.weights import resolve_weights
+
+    version = version or get_settings().MAKEUP_MODEL_VERSION
+    bundle_dir = os.path.join(out_dir, version)
+    if os.path.exists(os.path.join(bundle_dir, MANIFEST_FILE)):
+        raise FileExistsError(f"bundle already exists: {bundle_dir}")
+    os.makedirs(bundle_dir, exist_ok=True)
+
+    t0 = time.perf_counter()
+    pipeline, makeup_encoder = _build_model(
+        model_id=model_id,
+        checkpoint_path=checkpoint_path,
+        image_encoder_path=image_encoder_path,
+        device="cpu",
+        dtype=dtype,
+    )
+    controlnets = list(pipeline.controlnet.nets)
+    print(f"  assembled pipeline ({time.perf_counter() - t0:.1f}s)")
+
+    # 설정 파일
+    pipeline.unet.save_config(os.path.join(bundle_dir, "unet"))
+    for i, net in enumerate(controlnets):
+        net.save_config(os.path.join(bundle_dir, f"controlnet_{i}"))
+    pipeline.vae.save_config(os.path.join(bundle_dir, "vae"))
+    pipeline.text_encoder.config.save_pretrained(os.path.join(bundle_dir, "text_encoder"))
+    makeup_encoder.image_encoder.config.save_pretrained(os.path.join(bundle_dir, "image_encoder"))
+    pipeline.tokenizer.save_pretrained(os.path.join(bundle_dir, "tokenizer"))
+    pipeline.scheduler.save_config(os.path.join(bundle_dir, "scheduler"))
+
+    # 가중치 (SSR_layers 는 UNet attention processor와 같은 모듈이므로 unet.* 에만 저장)
+    tensors = {}
+    tensors.update(_prefixed("unet.", pipeline.unet.state_dict(), dtype))
+    for i, net in enumerate(controlnets):
+        tensors.update(_prefixed(f"controlnet.{i}.", net.state_dict(), dtype))
+    tensors.update(_prefixed("vae.", pipeline.vae.state_dict(), dtype))
+    tensors.update(_prefixed("text_encoder.", pipeline.text_encoder.state_dict(), dtype))
+    tensors.update(_prefixed("detail_encoder.", makeup_encoder.state_dict(), dtype, skip=("SSR_layers.",)))
+
+    weights_path = os.path.join(bundle_dir, WEIGHTS_FILE)
+    save_file(tensors, weights_path + ".tmp", metadata={"format": "pt", "bundle": BUNDLE_FORMAT, "version": version})
+    os.replace(weights_path + ".tmp", weights_path)
+    n_tensors = len(tensors)
+    del tensors
+
+    sources = {}
+    for stem in ("pytorch_model", "pytorch_model_1", "pytorch_model_2"):
+        path = resolve_weights(checkpoint_path, stem)
+        if path is not None:
+            sources[os.path.basename(path)] = _sha256(path)
+
+    import diffusers
+    import transformers
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "version": version,
+        "dtype": str(dtype).replace("torch.", ""),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "weights": {"file": WEIGHTS_FILE, "tensors": n_tensors, "sha256": _sha256(weights_path)},
+        "components": {
+            "unet": {"prefix": "unet.", "config": "unet"},
+            "controlnets": [{"prefix": f"controlnet.{i}.", "config": f"controlnet_{i}"} for i in range(len(controlnets))],
+            "vae": {"prefix": "vae.", "config": "vae"},
+            "text_encoder": {"prefix": "text_encoder.", "config": "text_encoder"},
+            "tokenizer": {"config": "tokenizer"},
+            "scheduler": {"config": "scheduler"},
+            "detail_encoder": {"prefix": "detail_encoder.", "image_encoder_config": "image_encoder"},
+        },
+        "source": {"model_id": model_id, "checkpoints": sources},
+        "libraries": {"torch": torch.__version__, "diffusers": diffusers.__version__, "transformers": transformers.__version__},
+    }
+    with open(os.path.join(bundle_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    size = os.path.getsize(weights_path) / 2**20
+    print(f"  ✓ bundle written: {bundle_dir} ({n_tensors} tensors, {size:.0f} MB, {time.perf_counter() - t0:.1f}s)")
+    return bundle_dir
+
+
+# ------------------------------------------------------------
+# Load
+# ------------------------------------------------------------
+def read_manifest(bundle_dir: str) -> dict:
+    with open(os.path.join(bundle_dir, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != BUNDLE_FORMAT or manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+        raise ValueError(
+            f"지원하지 않는 번들 포맷: {manifest.get('format')} v{manifest.get('format_version')} "
+            f"(필요: {BUNDLE_FORMAT} v{BUNDLE_FORMAT_VERSION})"
+        )
+    return manifest
+
+
+def load_bundle(bundle_dir: str, device: str = "cuda", dtype: Optional[torch.dtype] = None, verify: bool = False):
+    """
+    번들에서 (pipeline, makeup_encoder) 로드 — 오프라인, 단일 패스.
+    verify=True 면 가중치 파일 sha256을 manifest와 비교 (대용량이라 기본 off)
+    """
+    from accelerate import init_empty_weights
+    from diffusers import AutoencoderKL, ControlNetModel, DDIMScheduler, UNet2DConditionModel
+    from safetensors import safe_open
+    from transformers import CLIPTextConfig, CLIPTextModel, CLIPTokenizer, CLIPVisionConfig
+
+    from libs.detail_encoder._clip import CLIPVisionModel
+    from libs.detail_encoder.encoder_plus import detail_encoder
+    from libs.pipeline_sd15 import StableDiffusionControlNetPipeline
+    from utils.weights import has_meta_tensors
+
+    t0 = time.perf_counter()
+    manifest = read_manifest(bundle_dir)
+    comps = manifest["components"]
+    dtype = dtype or getattr(torch, manifest["dtype"])
+    weights_path = os.path.join(bundle_dir, manifest["weights"]["file"])
+    if verify and _sha256(weights_path) != manifest["weights"]["sha256"]:
+        raise ValueError(f"번들 가중치 해시 불일치: {weights_path}")
+
+    def cfg(name: str) -> str:
+        return os.path.join(bundle_dir, name)
+
+    # 1) 설정만으로 골격 생성 (파라미터는 meta)
+    with init_empty_weights():
+        unet = UNet2DConditionModel.from_config(UNet2DConditionModel.load_config(cfg(comps["unet"]["config"])))
+        controlnets = [
+            ControlNetModel.from_config(ControlNetModel.load_config(cfg(c["config"])))
+            for c in comps["controlnets"]
+        ]
+        vae = AutoencoderKL.from_config(AutoencoderKL.load_config(cfg(comps["vae"]["config"])))
+        text_encoder = CLIPTextModel(CLIPTextConfig.from_pretrained(cfg(comps["text_encoder"]["config"])))
+        vision_config = CLIPVisionConfig.from_pretrained(cfg(comps["detail_encoder"]["image_encoder_config"]))
+        vision_config.attn_implementation = "eager"
+        # detail_encoder 생성 시 UNet에 SSR attention processor가 설치된다.
+        makeup_encoder = detail_encoder(unet, None, device="meta", dtype=dtype, image_encoder=CLIPVisionModel(vision_config))
+
+    # 2) 구성요소별로 필요한 텐서만 읽어 assign 후 바로 디바이스/dtype 이동
+    #    (파일 전체를 한 번에 올리지 않음 — 호스트 메모리 피크는 가장 큰 구성요소 하나)
+    #    UNet 먼저: SSR_layers는 UNet processor와 같은 모듈
+    modules = [(unet, comps["unet"]["prefix"])]
+    modules += [(net, c["prefix"]) for net, c in zip(controlnets, comps["controlnets"])]
+    modules += [
+        (vae, comps["vae"]["prefix"]),
+        (text_encoder, comps["text_encoder"]["prefix"]),
+        (makeup_encoder, comps["detail_encoder"]["prefix"]),
+    ]
+    with safe_open(weights_path, framework="pt", device="cpu") as f:
+        keys = list(f.keys())
+        for module, prefix in modules:
+            part = {k[len(prefix):]: f.get_tensor(k) for k in keys if k.startswith(prefix)}
+            module.load_state_dict(part, strict=False, assign=True)
+            del part
+            if has_meta_tensors(module):
+                raise RuntimeError(f"번들에 빠진 가중치가 있습니다: {prefix}")
+            module.to(device, dtype=dtype).eval()
+
+    # 3) 파이프라인 조립
+    makeup_encoder.device = device
+    makeup_encoder.dtype = dtype
+
+    pipeline = StableDiffusionControlNetPipeline(
+        vae=vae,
+        text_encoder=text_encoder,
+        tokenizer=CLIPTokenizer.from_pretrained(cfg(comps["tokenizer"]["config"])),
+        unet=unet,
+        controlnet=controlnets,
+        scheduler=DDIMScheduler.from_pretrained(cfg(comps["scheduler"]["config"])),
+        safety_checker=None,
+        feature_extractor=None,
+        requires_safety_checker=False,
+    ).to(device)
+
+    print(f"✓ Loaded makeup bundle {manifest['version']} ({time.perf_counter() - t0:.1f}s)")
+    return pipeline, makeup_encoder
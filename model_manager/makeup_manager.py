@@ -13,15 +13,13 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-# libs에서 import
-from libs.pipeline_sd15 import StableDiffusionControlNetPipeline
-from diffusers import DDIMScheduler, ControlNetModel
-from diffusers import UNet2DConditionModel as OriginalUNet2DConditionModel
-from libs.detail_encoder.encoder_plus import detail_encoder
+from model_manager.registry import get_registry
+from utils.weights import resolve_weights, load_state_dict, empty_init, assign_state_dict
 
-# 글로벌 캐시
-_CACHED_PIPELINE = None
-_CACHED_MAKEUP_ENCODER = None
+REGISTRY_KEY = "makeup"
+
+# 레지스트리 로더가 사용할 로드 인자 (load_model 호출 시 갱신)
+_LOAD_ARGS = {}
 
 
 def load_model(
@@ -29,42 +27,61 @@ def load_model(
     checkpoint_path: str = "./checkpoints/makeup",  # 🔧 루트 경로
     image_encoder_path: str = "./models/image_encoder_l",  # 🔧 루트 경로 (또는 HF)
     device: str = "cuda",
-    dtype: torch.dtype = torch.float16,
+    dtype: Optional[torch.dtype] = None,
     force_reload: bool = False
 ) -> Tuple[object, object]:
     """
-    메이크업 모델 로드 (캐시 사용)
+    메이크업 모델 로드 (모델 레지스트리 캐시 사용 — 동시 첫 요청도 1회만 로드)
     
     Args:
         model_id: Stable Diffusion 모델 ID
         checkpoint_path: 체크포인트 디렉토리 경로 (기본: ./checkpoints/makeup)
         image_encoder_path: CLIP 이미지 인코더 경로 (기본: ./models/image_encoder_l)
         device: 실행 디바이스
-        dtype: 모델 데이터 타입
+        dtype: 모델 데이터 타입 (None이면 디바이스별 실행 프로파일: cuda=fp16, cpu=bf16|fp32)
         force_reload: 강제 재로드 여부
     
     Returns:
         (pipeline, makeup_encoder) 튜플
     """
-    global _CACHED_PIPELINE, _CACHED_MAKEUP_ENCODER
-    
-    # 캐시 확인
-    if not force_reload and _CACHED_PIPELINE is not None and _CACHED_MAKEUP_ENCODER is not None:
-        return _CACHED_PIPELINE, _CACHED_MAKEUP_ENCODER
+    registry = get_registry()
+    _LOAD_ARGS.update(
+        model_id=model_id,
+        checkpoint_path=checkpoint_path,
+        image_encoder_path=image_encoder_path,
+        device=device,
+        dtype=dtype,
+    )
+    if force_reload:
+        registry.unload(REGISTRY_KEY, force=True)
+    return registry.get(REGISTRY_KEY)
+
+
+def _build_model(
+    model_id: str = "runwayml/stable-diffusion-v1-5",
+    checkpoint_path: str = "./checkpoints/makeup",
+    image_encoder_path: str = "./models/image_encoder_l",
+    device: str = "cuda",
+    dtype: torch.dtype = torch.float16,
+) -> Tuple[object, object]:
+    """(pipeline, makeup_encoder) 생성 — 레지스트리 로더"""
+    # diffusers / 파이프라인 모듈은 실제 로드 시점에 import (모듈 import 비용 최소화)
+    from libs.pipeline_sd15 import StableDiffusionControlNetPipeline
+    from diffusers import DDIMScheduler, ControlNetModel
+    from diffusers import UNet2DConditionModel as OriginalUNet2DConditionModel
+    from libs.detail_encoder.encoder_plus import detail_encoder
     
-    # 체크포인트 경로 설정
-    makeup_encoder_path_file = os.path.join(checkpoint_path, "pytorch_model.bin")
-    id_encoder_path_file = os.path.join(checkpoint_path, "pytorch_model_1.bin")
-    pose_encoder_path_file = os.path.join(checkpoint_path, "pytorch_model_2.bin")
+    # 체크포인트 경로 설정 (.safetensors 우선, 없으면 .bin — convert_checkpoints.py 로 변환)
+    stems = {"makeup": "pytorch_model", "id": "pytorch_model_1", "pose": "pytorch_model_2"}
+    weight_files = {name: resolve_weights(checkpoint_path, stem) for name, stem in stems.items()}
     
     # 체크포인트 존재 확인
-    required_files = [makeup_encoder_path_file, id_encoder_path_file, pose_encoder_path_file]
-    missing_files = [f for f in required_files if not os.path.exists(f)]
+    missing_files = [stems[name] for name, path in weight_files.items() if path is None]
     
     if missing_files:
         raise FileNotFoundError(
             f"Required checkpoint files not found in {checkpoint_path}:\n" +
-            "\n".join(f"  - {os.path.basename(f)}" for f in missing_files)
+            "\n".join(f"  - {stem}.safetensors | {stem}.bin" for stem in missing_files)
         )
     
     # image_encoder_path가 로컬 경로인지 HF 모델명인지 확인
@@ -80,9 +97,9 @@ def load_model(
         torch_dtype=dtype
     ).to(device)
     
-    # ControlNet 초기화
-    id_encoder = ControlNetModel.from_unet(unet)
-    pose_encoder = ControlNetModel.from_unet(unet)
+    # ControlNet: meta 디바이스에 골격만 만들고 체크포인트 텐서를 바로 꽂는다
+    id_encoder = _controlnet_from_checkpoint(ControlNetModel, unet, weight_files["id"])
+    pose_encoder = _controlnet_from_checkpoint(ControlNetModel, unet, weight_files["pose"])
     
     # Makeup Encoder 초기화
     makeup_encoder = detail_encoder(
@@ -93,13 +110,7 @@ def load_model(
     )
     
     # 체크포인트 로드
-    id_state_dict = torch.load(id_encoder_path_file, map_location="cpu")
-    pose_state_dict = torch.load(pose_encoder_path_file, map_location="cpu")
-    makeup_state_dict = torch.load(makeup_encoder_path_file, map_location="cpu")
-    
-    id_encoder.load_state_dict(id_state_dict, strict=False)
-    pose_encoder.load_state_dict(pose_state_dict, strict=False)
-    makeup_encoder.load_state_dict(makeup_state_dict, strict=False)
+    makeup_encoder.load_state_dict(load_state_dict(weight_files["makeup"]), strict=False)
     
     # GPU로 이동
     id_encoder.to(device, dtype=dtype)
@@ -117,19 +128,96 @@ def load_model(
     
     pipeline.scheduler = DDIMScheduler.from_config(pipeline.scheduler.config)
     
-    # 캐시 저장
-    _CACHED_PIPELINE = pipeline
-    _CACHED_MAKEUP_ENCODER = makeup_encoder
-    
     return pipeline, makeup_encoder
 
 
+def _controlnet_from_checkpoint(ControlNetModel, unet, path: str):
+    """
+    ControlNet 생성 + 체크포인트 로드.
+    빠른 경로: from_unet(load_weights_from_unet=False)를 meta 디바이스에서 만들고 assign 로드
+    (UNet 가중치 복사/랜덤 초기화 없음). 체크포인트가 전체 가중치를 덮지 못하면 기존 방식으로 생성.
+    """
+    state_dict = load_state_dict(path)
+    ctx = empty_init()
+    if ctx is not None:
+        with ctx:
+            controlnet = ControlNetModel.from_unet(unet, load_weights_from_unet=False)
+        if assign_state_dict(controlnet, state_dict):
+            return controlnet
+        print(f"  {os.path.basename(path)} does not cover all ControlNet weights, falling back to from_unet init")
+    controlnet = ControlNetModel.from_unet(unet)
+    controlnet.load_state_dict(state_dict, strict=False)
+    return controlnet
+
+
+def _load_registered():
+    """
+    레지스트리 로더: MAKEUP_BUNDLE_DIR 번들이 있으면 번들(오프라인 단일 패스), 없으면 개별 체크포인트 조립.
+    토큰 병합(MAKEUP_TOME_RATIO) / 양자화 후 디바이스별 실행 프로파일(dtype / channels_last / 스레드 / compile)을 적용한다.
+    """
+    from config import get_settings
+    from model_manager.execution_profile import select_profile, apply_profile
+
+    args = dict(_LOAD_ARGS)
+    profile = select_profile(args.get("device", "cuda"))
+    args["dtype"] = args.get("dtype") or profile.dtype
+    profile.dtype = args["dtype"]
+
+    bundle_dir = get_settings().MAKEUP_BUNDLE_DIR
+    if bundle_dir:
+        from model_manager.makeup_bundle import load_bundle
+        pipeline, makeup_encoder = load_bundle(bundle_dir, device=args.get("device", "cuda"), dtype=args["dtype"])
+    else:
+        pipeline, makeup_encoder = _build_model(**args)
+
+    s = get_settings()
+    if s.MAKEUP_TOME_RATIO > 0:
+        from libs.detail_encoder.token_merging import apply_token_merging
+        n = apply_token_merging(pipeline.unet, ratio=s.MAKEUP_TOME_RATIO, blocks=s.MAKEUP_TOME_BLOCKS)
+        print(f"✓ Token merging on {n} self-attention layers (ratio={s.MAKEUP_TOME_RATIO})")
+
+    if profile.quantize:
+        quantize_models(pipeline, makeup_encoder)
+
+    global _ACTIVE_PROFILE
+    _ACTIVE_PROFILE = profile
+    return apply_profile(pipeline, makeup_encoder, profile)
+
+
+def quantize_models(pipeline, makeup_encoder) -> dict:
+    """
+    CPU int8 동적 양자화 (가중치 int8, 활성값은 실행 시 양자화).
+    대상: UNet(to_q/k/v/out, FF, SSR to_k_SSR/to_v_SSR 포함), ControlNet 각각, detail encoder의 CLIP-L 의 nn.Linear
+    inplace로 바꿔서 makeup_encoder.SSR_layers 와 UNet이 같은 SSR 프로세서 객체를 계속 공유하게 한다.
+    Returns: 구성요소별 양자화된 Linear 수
+    """
+    import torch.nn as nn
+    from torch.ao.quantization import quantize_dynamic
+
+    targets = {"unet": pipeline.unet, "image_encoder": makeup_encoder.image_encoder}
+    for i, net in enumerate(getattr(pipeline.controlnet, "nets", [pipeline.controlnet])):
+        targets[f"controlnet_{i}"] = net
+
+    counts = {}
+    for name, module in targets.items():
+        before = sum(isinstance(m, nn.Linear) for m in module.modules())
+        quantize_dynamic(module, {nn.Linear}, dtype=torch.qint8, inplace=True)
+        counts[name] = before - sum(isinstance(m, nn.Linear) for m in module.modules())
+    print(f"✓ Makeup models quantized (int8 dynamic): {counts}")
+    return counts
+
+
+_ACTIVE_PROFILE = None
+
+
+def active_profile() -> Optional[dict]:
+    """현재 로드된 모델의 실행 프로파일 (미로드 시 None)"""
+    return _ACTIVE_PROFILE.as_dict() if _ACTIVE_PROFILE is not None else None
+
+
+get_registry().register(REGISTRY_KEY, _load_registered)
+
+
 def clear_cache():
-    """캐시된 모델 해제"""
-    global _CACHED_PIPELINE, _CACHED_MAKEUP_ENCODER
-    
-    _CACHED_PIPELINE = None
-    _CACHED_MAKEUP_ENCODER = None
-    
-    if torch.cuda.is_available():
-        torch.cuda.empty_cache()
+    """캐시된 모델 해제 (레지스트리 언로드 + CUDA 캐시 비우기)"""
+    get_registry().unload(REGISTRY_KEY, force=True)
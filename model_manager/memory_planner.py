@@ -0,0 +1,130 @@
+# model_manager/memory_planner.py
+"""
+메이크업 추론 메모리 플래너 (MAKEUP_PEAK_RSS_MB 상한, 0 = 끔)
+- 한 호스트에 워커 여러 개를 띄울 때 각 워커의 최대 RSS를 상한 아래로 유지하기 위한 설정을 고른다.
+- 예산 = 상한 - 현재 RSS(로드된 가중치 포함) - 기타 활성값 예약분(MAKEUP_ACTIVATION_RESERVE_MB)
+- attention: 레이어별 점수 텐서 (batch × heads × chunk × Lk × 원소 크기 × 2[scores + softmax]) 가 예산 안에
+  들어오도록 프로세서마다 query_chunk_size 를 정한다. (CPU SDPA math 경로 기준 보수적 추정)
+    self-attention(attn1): Lk = Lq = 해당 블록의 잠재 토큰 수
+    SSR cross-attention(attn2): Lk = detail encoder 토큰 수 (CLIP hidden state 12개 × 257)
+- VAE: 상한이 있으면 slicing(배치를 이미지 단위로 디코드), 이미지 1장 디코드 추정치도 예산을 넘으면 tiling
+- 같은 (해상도, 배치) 계획은 다시 계산하지 않는다.
+"""
+import os
+import threading
+from typing import Optional
+
+from config import get_settings
+
+_MIN_CHUNK = 64
+_LAST_PLAN = {"key": None, "plan": None}
+_LOCK = threading.Lock()
+
+
+def current_rss_bytes() -> int:
+    """현재 프로세스 RSS (Linux: /proc/self/statm, 그 외: 최대 RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _base_processor(proc):
+    # ToMeAttnProcessor 등 래퍼 안쪽의 실제 프로세서
+    while not hasattr(proc, "query_chunk_size") and hasattr(proc, "processor"):
+        proc = proc.processor
+    return proc
+
+
+def _latent_tokens(name: str, latent_h: int, latent_w: int) -> int:
+    """UNet attention 모듈 이름으로 해당 블록의 잠재 토큰 수 계산 (SD1.5: 블록마다 1/2 다운샘플)"""
+    if name.startswith("down_blocks."):
+        level = int(name.split(".")[1])
+    elif name.startswith("up_blocks."):
+        level = 3 - int(name.split(".")[1])
+    else:  # mid_block
+        level = 3
+    return (latent_h >> level) * (latent_w >> level)
+
+
+def _context_tokens(makeup_encoder) -> int:
+    config = makeup_encoder.image_encoder.config
+    per_layer = (config.image_size // config.patch_size) ** 2 + 1
+    return (config.num_hidden_layers // 2) * per_layer  # hidden_states[2::2]
+
+
+def _chunk_for(budget: int, batch: int, heads: int, q_len: int, k_len: int, elem: int) -> Optional[int]:
+    per_row = batch * heads * k_len * elem * 2
+    chunk = budget // per_row if budget > 0 else 0
+    if chunk >= q_len:
+        return None
+    return max(_MIN_CHUNK, chunk // _MIN_CHUNK * _MIN_CHUNK)
+
+
+def plan_memory(pipeline, makeup_encoder, height: int, width: int, batch: int = 2) -> dict:
+    """
+    (height, width) 입력, UNet 배치 batch (CFG면 2 × 이미지 수)에 맞춰 attention chunk / VAE slicing·tiling 설정.
+    상한이 꺼져 있으면 chunk 를 모두 해제한다. Returns: 적용한 계획
+    """
+    s = get_settings()
+    cap = s.MAKEUP_PEAK_RSS_MB * 2**20
+    key = (height, width, batch, cap)
+    with _LOCK:
+        if _LAST_PLAN["key"] == key:
+            return _LAST_PLAN["plan"]
+
+        unet = pipeline.unet
+        unet = getattr(unet, "_orig_mod", unet)
+        elem = unet.dtype.itemsize if hasattr(unet.dtype, "itemsize") else 4
+        rss = current_rss_bytes()
+        budget = cap - rss - s.MAKEUP_ACTIVATION_RESERVE_MB * 2**20 if cap else 0
+
+        latent_h, latent_w = height // 8, width // 8
+        context = _context_tokens(makeup_encoder)
+        chunks = {}
+        for name, module in unet.named_modules():
+            proc = getattr(module, "processor", None)
+            if proc is None or not hasattr(module, "heads"):
+                continue
+            proc = _base_processor(proc)
+            if not hasattr(proc, "query_chunk_size"):
+                continue
+            if not cap:
+                proc.query_chunk_size = None
+                continue
+            q_len = _latent_tokens(name, latent_h, latent_w)
+            k_len = q_len if name.endswith("attn1") else context
+            proc.query_chunk_size = _chunk_for(budget, batch, module.heads, q_len, k_len, elem)
+            if proc.query_chunk_size:
+                chunks[name] = proc.query_chunk_size
+
+        # VAE decoder: 최대 해상도 단계(128채널)에서 동시에 살아 있는 텐서 몇 개 기준 추정
+        vae_per_image = 128 * height * width * elem * 6
+        slicing = bool(cap)
+        tiling = bool(cap) and vae_per_image > budget
+        if slicing:
+            pipeline.enable_vae_slicing()
+        else:
+            pipeline.disable_vae_slicing()
+        if tiling:
+            pipeline.enable_vae_tiling()
+        else:
+            pipeline.disable_vae_tiling()
+
+        plan = {
+            "cap_mb": s.MAKEUP_PEAK_RSS_MB or None,
+            "rss_mb": round(rss / 2**20),
+            "budget_mb": round(budget / 2**20) if cap else None,
+            "chunked_layers": len(chunks),
+            "min_chunk": min(chunks.values()) if chunks else None,
+            "vae_slicing": slicing,
+            "vae_tiling": tiling,
+        }
+        if cap:
+            if budget <= 0:
+                print(f"⚠️ Memory plan: RSS {plan['rss_mb']}MB already near cap {s.MAKEUP_PEAK_RSS_MB}MB")
+            print(f"✓ Memory plan {height}x{width} (batch {batch}): {plan}")
+        _LAST_PLAN.update(key=key, plan=plan)
+        return plan
@@ -2,10 +2,16 @@ import torch
 import torch.nn as nn
 from torchvision import models
 import os
+import threading
 from pathlib import Path
 
-_regression_models = None
+from model_manager.registry import get_registry
+
+REGISTRY_KEY = "nia"
+
 _device = None
+_checkpoint_path = None
+_LOCK = threading.Lock()
 
 def get_checkpoint_path():
     """체크포인트 기본 경로 반환 (상대경로)"""
@@ -14,15 +20,30 @@ def get_checkpoint_path():
     checkpoint_dir = current_dir / "checkpoints" / "nia"
     return str(checkpoint_dir)
 
+def _default_regression_path():
+    return os.path.join(get_checkpoint_path(), "regression")
+
 def load_regression_models(checkpoint_path=None):
-    """Regression 모델 로딩 (moisture, elasticity_R2, wrinkle_Ra, pigmentation, pore)"""
-    global _regression_models, _device
-    
-    if _regression_models is not None:
-        return _regression_models, _device
-    
-    if checkpoint_path is None:
-        checkpoint_path = os.path.join(get_checkpoint_path(), "regression")
+    """
+    Regression 모델 로딩 (moisture, elasticity_R2, wrinkle_Ra, pigmentation, pore) — 레지스트리 캐시
+    checkpoint_path=None 이면 현재(또는 기본) 경로. 다른 경로로 이미 로드되어 있으면 ValueError
+    (바꾸려면 get_registry().unload("nia") 후 호출)
+    """
+    global _checkpoint_path
+    with _LOCK:
+        if checkpoint_path is not None:
+            current = _checkpoint_path or _default_regression_path()
+            if os.path.abspath(checkpoint_path) != os.path.abspath(current) and get_registry().is_loaded(REGISTRY_KEY):
+                raise ValueError(f"NIA 모델이 이미 {current} 에서 로드되어 있습니다 (요청: {checkpoint_path})")
+            _checkpoint_path = checkpoint_path
+        return get_registry().get(REGISTRY_KEY)
+
+
+def _build_regression_models():
+    """레지스트리 로더"""
+    global _device
+
+    checkpoint_path = _checkpoint_path or _default_regression_path()
     
     _device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     
@@ -34,7 +55,7 @@ def load_regression_models(checkpoint_path=None):
         "pore": 1,
     }
     
-    _regression_models = {}
+    regression_models = {}
     
     for key, num_outputs in model_num_class.items():
         model = models.resnet50(weights=models.ResNet50_Weights.DEFAULT)
@@ -53,10 +74,13 @@ def load_regression_models(checkpoint_path=None):
         
         model = model.to(_device)
         model.eval()
-        _regression_models[key] = model
+        regression_models[key] = model
         print(f"✓ Loaded regression model: {key}")
     
-    return _regression_models, _device
+    return regression_models, _device
+
+
+get_registry().register(REGISTRY_KEY, _build_regression_models)
 
 def get_device():
     global _device
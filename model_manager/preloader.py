@@ -0,0 +1,203 @@
+# model_manager/preloader.py
+"""
+서버 기동 시 모델 프리로드 + 웜업
+- PRELOAD_MODELS 에 지정된 패밀리(nia, style, custom, makeup, llm)를 패밀리별 스레드에서 병렬 로드
+- 로드 후 합성 입력으로 1회 추론(웜업)해 커널/할당기 초기화 비용을 미리 치른다.
+  (makeup 웜업은 실제 요청과 같은 executor 를 거쳐 동시 실행 상한을 지킨다)
+- 패밀리별 상태(pending → loading → warming → ready | failed)와 로드/웜업 시간은
+  /ready 에서 확인할 수 있고, 모든 패밀리가 ready가 되기 전까지 /ready 는 503을 반환한다.
+- 모델 관련 모듈은 각 로더 안에서 import (이 모듈 import 자체는 가볍게 유지)
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from config import get_settings
+
+PENDING = "pending"
+LOADING = "loading"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+
+# ------------------------------------------------------------
+# 패밀리별 로더 / 웜업
+# ------------------------------------------------------------
+def _load_nia():
+    from model_manager.nia_manager import load_regression_models
+    return load_regression_models()
+
+
+def _warm_nia(loaded):
+    import torch
+    models, device = loaded
+    x = torch.zeros(1, 3, 256, 256, device=device)
+    with torch.no_grad():
+        for model in models.values():
+            model(x)
+
+
+def _load_style():
+    from model_manager.clip_manager import load_clip
+    return load_clip()
+
+
+def _warm_style(loaded):
+    import torch
+    from PIL import Image
+    model, processor, device = loaded
+    inputs = processor(text=["warm up"], images=Image.new("RGB", (224, 224)), return_tensors="pt", padding=True)
+    inputs = {k: v.to(device) for k, v in inputs.items()}
+    with torch.no_grad():
+        model(**inputs)
+
+
+def _load_custom():
+    from model_manager.customization_manager import load_customization_model
+    return load_customization_model()
+
+
+def _warm_custom(loaded):
+    import torch
+    from PIL import Image
+    model, processor, device = loaded
+    inputs = processor(images=Image.new("RGB", (512, 512)), return_tensors="pt")
+    with torch.no_grad():
+        model(pixel_values=inputs["pixel_values"].to(device))
+
+
+def _load_makeup():
+    import torch
+    from model_manager.makeup_manager import load_model
+    from service.makeup_service import get_landmark_engine
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    load_model(device=device)
+    get_landmark_engine()
+    return device
+
+
+def _warm_makeup(device):
+    """
+    실제 요청과 같은 makeup executor 로 실행 (/ready 전에 들어온 /makeup 요청과 동시에 디퓨전을 돌리지 않도록
+    admission / 스케줄링을 거친다). 대기 시간을 뺀 실행 시간(초)을 반환
+    """
+    from PIL import Image
+    from service.makeup_service import run_inference
+    from utils.executors import get_executor
+    s = get_settings()
+    img = Image.new("RGB", (s.DEFAULT_RESOLUTION, s.DEFAULT_RESOLUTION), color=(128, 128, 128))
+
+    def _run():
+        t0 = time.perf_counter()
+        run_inference(
+            id_image=img,
+            makeup_image=img,
+            size=s.DEFAULT_RESOLUTION,
+            num_inference_steps=s.MAKEUP_WARMUP_STEPS,
+            seed=0,
+            device=device,
+        )
+        return time.perf_counter() - t0
+
+    return get_executor("makeup").call(_run, priority=s.priority_class("makeup"))
+
+
+def _load_llm():
+    from model_manager.feedback_manager import load_model
+    return load_model()
+
+
+FAMILIES: Dict[str, Tuple[Callable, Optional[Callable]]] = {
+    "nia": (_load_nia, _warm_nia),
+    "style": (_load_style, _warm_style),
+    "custom": (_load_custom, _warm_custom),
+    "makeup": (_load_makeup, _warm_makeup),
+    "llm": (_load_llm, None),  # 외부 API: 클라이언트 생성만
+}
+
+
+# ------------------------------------------------------------
+# 프리로더
+# ------------------------------------------------------------
+class ModelPreloader:
+    def __init__(self, families, warmup: bool = True):
+        unknown = [f for f in families if f not in FAMILIES]
+        if unknown:
+            raise ValueError(f"알 수 없는 PRELOAD_MODELS 항목: {', '.join(unknown)} (가능: {', '.join(FAMILIES)})")
+        self.families = list(families)
+        self.warmup = warmup
+        self._lock = threading.Lock()
+        self._state = {
+            f: {"state": PENDING, "load_sec": None, "warmup_sec": None, "error": None}
+            for f in self.families
+        }
+        self._threads = []
+
+    def start(self) -> None:
+        """패밀리별 스레드로 병렬 로드 시작 (중복 호출 무시)"""
+        with self._lock:
+            if self._threads:
+                return
+            for family in self.families:
+                t = threading.Thread(target=self._run, args=(family,), name=f"preload-{family}", daemon=True)
+                self._threads.append(t)
+        for t in self._threads:
+            t.start()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """모든 프리로드 스레드 종료 대기 (CLI/테스트용)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for t in self._threads:
+            t.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return self.ready
+
+    def _set(self, family: str, **kwargs) -> None:
+        with self._lock:
+            self._state[family].update(kwargs)
+
+    def _run(self, family: str) -> None:
+        load_fn, warm_fn = FAMILIES[family]
+        try:
+            self._set(family, state=LOADING)
+            t0 = time.perf_counter()
+            loaded = load_fn()
+            self._set(family, load_sec=round(time.perf_counter() - t0, 3))
+            print(f"✓ Preloaded {family} ({time.perf_counter() - t0:.1f}s)")
+
+            if self.warmup and warm_fn is not None:
+                self._set(family, state=WARMING)
+                t0 = time.perf_counter()
+                elapsed = warm_fn(loaded)
+                # 웜업 함수가 실행 시간을 돌려주면(executor 경유 시 대기 시간 제외) 그 값을 기록
+                elapsed = elapsed if isinstance(elapsed, (int, float)) else time.perf_counter() - t0
+                self._set(family, warmup_sec=round(elapsed, 3))
+                print(f"✓ Warmed up {family} ({elapsed:.1f}s)")
+
+            self._set(family, state=READY)
+        except Exception as e:
+            self._set(family, state=FAILED, error=f"{type(e).__name__}: {e}")
+            print(f"⚠️ Preload failed for {family}: {e}")
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return all(v["state"] == READY for v in self._state.values())
+
+    def status(self) -> dict:
+        with self._lock:
+            return {f: dict(v) for f, v in self._state.items()}
+
+
+_PRELOADER: Optional[ModelPreloader] = None
+_PRELOADER_LOCK = threading.Lock()
+
+
+def get_preloader() -> ModelPreloader:
+    """설정(PRELOAD_MODELS, PRELOAD_WARMUP) 기반 프리로더 싱글톤"""
+    global _PRELOADER
+    with _PRELOADER_LOCK:
+        if _PRELOADER is None:
+            s = get_settings()
+            _PRELOADER = ModelPreloader(s.PRELOAD_MODELS, warmup=s.PRELOAD_WARMUP)
+        return _PRELOADER
@@ -0,0 +1,260 @@
+# model_manager/registry.py
+"""
+모델 레지스트리 (모든 model_manager 공용)
+- 키(모델 패밀리)별 로더 등록 → get(key) 최초 호출 시 1회만 로드 (키별 락으로 동시 첫 요청의 중복 로드 방지)
+- 참조 카운트: hold(key) / @holding(key) 로 사용 중 표시 → 사용 중인 모델은 언로드/축출하지 않음
+- RAM 예산(MODEL_RAM_BUDGET_MB): 로드 후 상주 크기 합이 예산을 넘으면 사용 중이 아닌 모델을 LRU 순으로 언로드
+- 로드/언로드 시간, 상주 크기는 stats() → /metrics 로 노출
+"""
+import functools
+import gc
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from config import get_settings
+
+
+def estimate_bytes(obj: Any, _seen: Optional[set] = None) -> int:
+    """nn.Module/텐서/파이프라인/컨테이너 안의 파라미터+버퍼 바이트 수 추정"""
+    seen = _seen if _seen is not None else set()
+    if obj is None or id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if hasattr(obj, "named_parameters") and hasattr(obj, "buffers"):
+        total = 0
+        for p in list(obj.parameters()) + list(obj.buffers()):
+            if id(p) not in seen:
+                seen.add(id(p))
+                total += p.numel() * p.element_size()
+        return total
+    if hasattr(obj, "numel") and hasattr(obj, "element_size"):
+        return obj.numel() * obj.element_size()
+    if isinstance(obj, dict):
+        return sum(estimate_bytes(v, seen) for v in obj.values())
+    if isinstance(obj, (list, tuple, set)):
+        return sum(estimate_bytes(v, seen) for v in obj)
+    components = getattr(obj, "components", None)  # diffusers 파이프라인
+    if isinstance(components, dict):
+        return sum(estimate_bytes(v, seen) for v in components.values())
+    return 0
+
+
+class _Entry:
+    __slots__ = ("key", "loader", "on_unload", "lock", "value", "loaded",
+                 "refs", "last_used", "bytes", "loads", "unloads", "load_sec", "unload_sec")
+
+    def __init__(self, key: str, loader: Callable[[], Any], on_unload: Optional[Callable[[Any], None]]):
+        self.key = key
+        self.loader = loader
+        self.on_unload = on_unload
+        self.lock = threading.Lock()  # 키별 로드 락
+        self.value = None
+        self.loaded = False
+        self.refs = 0
+        self.last_used = 0.0
+        self.bytes = 0
+        self.loads = 0
+        self.unloads = 0
+        self.load_sec = None
+        self.unload_sec = None
+
+
+class ModelRegistry:
+    def __init__(self, budget_bytes: int = 0):
+        self.budget_bytes = max(0, int(budget_bytes))  # 0 = 무제한
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()  # 엔트리 표/카운트 보호
+        self._evictions = 0
+
+    # ---- 등록 ----
+    def register(self, key: str, loader: Callable[[], Any], on_unload: Optional[Callable[[Any], None]] = None) -> None:
+        """키에 로더를 등록 (이미 있으면 로더만 교체, 로드된 값은 유지)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = _Entry(key, loader, on_unload)
+            else:
+                entry.loader = loader
+                entry.on_unload = on_unload
+
+    def _entry(self, key: str) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(f"등록되지 않은 모델 키: {key}")
+        return entry
+
+    # ---- 조회/로드 ----
+    def get(self, key: str) -> Any:
+        """로드된 값 반환. 없으면 키별 락 안에서 1회만 로드"""
+        entry = self._entry(key)
+        with entry.lock:
+            if not entry.loaded:
+                self._load(entry)
+            with self._lock:
+                entry.last_used = time.monotonic()
+            return entry.value
+
+    def _load(self, entry: _Entry) -> None:
+        # 이전 로드 크기를 알면 미리 자리를 비워 둔다.
+        if entry.bytes:
+            self._evict(entry.bytes, exclude=entry.key)
+        t0 = time.perf_counter()
+        value = entry.loader()
+        size = estimate_bytes(value)
+        with self._lock:
+            entry.value = value
+            entry.loaded = True
+            entry.bytes = size
+            entry.loads += 1
+            entry.load_sec = round(time.perf_counter() - t0, 3)
+        print(f"✓ Registry loaded {entry.key} ({entry.load_sec}s, {size / 2**20:.0f} MB)")
+        self._evict(0, exclude=entry.key)
+
+    def is_loaded(self, key: str) -> bool:
+        entry = self._entry(key)
+        with self._lock:
+            return entry.loaded
+
+    @contextmanager
+    def hold(self, key: str):
+        """사용 구간 동안 참조 카운트를 올려 언로드/축출을 막는다."""
+        entry = self._entry(key)
+        with self._lock:
+            entry.refs += 1
+        try:
+            yield self.get(key)
+        finally:
+            with self._lock:
+                entry.refs -= 1
+                entry.last_used = time.monotonic()
+
+    # ---- 언로드/축출 ----
+    def unload(self, key: str, force: bool = False) -> bool:
+        """모델 해제. 사용 중(refs > 0)이면 force=True일 때만 해제"""
+        entry = self._entry(key)
+        with entry.lock:
+            with self._lock:
+                if not entry.loaded or (entry.refs > 0 and not force):
+                    return False
+            self._unload(entry)
+            return True
+
+    def _unload(self, entry: _Entry) -> None:
+        t0 = time.perf_counter()
+        value = entry.value
+        with self._lock:
+            entry.value = None
+            entry.loaded = False
+            entry.unloads += 1
+        if entry.on_unload is not None:
+            try:
+                entry.on_unload(value)
+            except Exception as e:
+                print(f"⚠️ on_unload failed for {entry.key}: {e}")
+        del value
+        gc.collect()
+        _empty_device_cache()
+        entry.unload_sec = round(time.perf_counter() - t0, 3)
+        print(f"✓ Registry unloaded {entry.key} ({entry.unload_sec}s)")
+
+    def _evict(self, incoming: int, exclude: Optional[str] = None) -> None:
+        """상주 합 + incoming 이 예산을 넘는 동안, 사용 중이 아닌 모델을 LRU 순으로 언로드"""
+        if not self.budget_bytes:
+            return
+        while True:
+            with self._lock:
+                resident = sum(e.bytes for e in self._entries.values() if e.loaded)
+                if resident + incoming <= self.budget_bytes:
+                    return
+                idle = sorted(
+                    (e for e in self._entries.values() if e.loaded and e.refs == 0 and e.key != exclude),
+                    key=lambda e: e.last_used,
+                )
+            if not idle:
+                return  # 더 비울 수 있는 모델 없음 (예산 초과 상태 유지)
+            victim = idle[0]
+            # 다른 스레드가 로드/언로드 중인 모델이면 기다리지 않고 축출을 멈춘다.
+            if not victim.lock.acquire(blocking=False):
+                return
+            try:
+                with self._lock:
+                    still_idle = victim.loaded and victim.refs == 0
+                if not still_idle:
+                    continue
+                self._unload(victim)
+                with self._lock:
+                    self._evictions += 1
+            finally:
+                victim.lock.release()
+
+    # ---- 통계 ----
+    def stats(self) -> dict:
+        with self._lock:
+            models = {
+                key: {
+                    "loaded": e.loaded,
+                    "refs": e.refs,
+                    "resident_mb": round(e.bytes / 2**20, 1) if e.loaded else 0.0,
+                    "loads": e.loads,
+                    "unloads": e.unloads,
+                    "load_sec": e.load_sec,
+                    "unload_sec": e.unload_sec,
+                }
+                for key, e in self._entries.items()
+            }
+            resident = sum(e.bytes for e in self._entries.values() if e.loaded)
+        return {
+            "budget_mb": round(self.budget_bytes / 2**20, 1) if self.budget_bytes else None,
+            "resident_mb": round(resident / 2**20, 1),
+            "evictions": self._evictions,
+            "models": models,
+        }
+
+
+def _empty_device_cache() -> None:
+    import sys
+    torch = sys.modules.get("torch")  # torch를 쓰지 않은 프로세스에서 새로 import하지 않음
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+_REGISTRY: Optional[ModelRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """전역 레지스트리 싱글톤 (MODEL_RAM_BUDGET_MB)"""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = ModelRegistry(budget_bytes=get_settings().MODEL_RAM_BUDGET_MB * 2**20)
+        return _REGISTRY
+
+
+def holding(*keys: str):
+    """함수 실행 동안 keys 모델을 사용 중으로 표시하는 데코레이터 (로드는 하지 않음)"""
+    def decorator(fn: Callable):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            registry = get_registry()
+            entries = [registry._entry(k) for k in keys]
+            with registry._lock:
+                for e in entries:
+                    e.refs += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with registry._lock:
+                    for e in entries:
+                        e.refs -= 1
+                        e.last_used = time.monotonic()
+        return wrapper
+    return decorator
+
+
+def registry_stats() -> dict:
+    return get_registry().stats()
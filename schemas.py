@@ -1,8 +1,26 @@
 # schemas.py
 from __future__ import annotations
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any
 from pydantic import BaseModel, Field, model_validator
 
+
+def _require_image(b64: str, image_id: Optional[str], name: str) -> None:
+    """인라인 base64 또는 업로드 image_id 중 하나는 있어야 한다"""
+    if not b64 and not image_id:
+        raise ValueError(f"{name}_base64 또는 {name}_id 중 하나가 필요합니다.")
+
+# ------------------------ Images -----------------------
+class ImageUploadRequest(BaseModel):
+    image_base64: str = Field(..., description="업로드할 이미지 base64")
+
+class ImageUploadResponse(BaseModel):
+    status: str
+    image_id: Optional[str] = Field(default=None, description="원본 바이트 sha256. 다른 요청의 *_image_id 로 사용")
+    width: Optional[int] = None
+    height: Optional[int] = None
+    bytes: Optional[int] = None
+    message: Optional[str] = None
+
 # ------------------------- NIA -------------------------
 class NIAPredictions(BaseModel):
     # 회귀(0~100로 스케일링해 출력)
@@ -13,7 +31,13 @@ class NIAPredictions(BaseModel):
     pore_reg: int = Field(..., ge=0, le=100)
 
 class NIARequest(BaseModel):
-    image_base64: str
+    image_base64: str = Field(default="", description="얼굴 이미지 base64 (image_id 사용 시 생략)")
+    image_id: Optional[str] = Field(default=None, description="POST /v1/images 로 업로드한 이미지 ID")
+
+    @model_validator(mode="after")
+    def _check_image(self) -> "NIARequest":
+        _require_image(self.image_base64, self.image_id, "image")
+        return self
 
 class NIAResponse(BaseModel):
     status: str
@@ -106,9 +130,15 @@ class ProductResponse(BaseModel):
 
 # ----------------------- Style -------------------------
 class StyleRequest(BaseModel):
-    source_image_base64: str = Field(..., description="사용자 얼굴 이미지 base64")
+    source_image_base64: str = Field(default="", description="사용자 얼굴 이미지 base64 (source_image_id 사용 시 생략)")
+    source_image_id: Optional[str] = Field(default=None, description="업로드한 얼굴 이미지 ID")
     keywords: List[str] = Field(default_factory=list, description="스타일 힌트 키워드 리스트")
 
+    @model_validator(mode="after")
+    def _check_image(self) -> "StyleRequest":
+        _require_image(self.source_image_base64, self.source_image_id, "source_image")
+        return self
+
 class StyleResult(BaseModel):
     style_id: str = Field(default="", description="스타일 식별자")
     style_image_base64: str = Field(default="", description="추천 스타일 이미지(base64)")
@@ -130,11 +160,34 @@ class StyleResponse(BaseModel):
 
 # ---------------------- Makeup -------------------------
 class MakeupRequest(BaseModel):
-    source_image_base64: str = Field(..., description="사용자 얼굴 이미지 base64")
+    source_image_base64: str = Field(default="", description="사용자 얼굴 이미지 base64 (source_image_id 사용 시 생략)")
     style_image_base64: str = Field(
-        ..., description="참조 메이크업 스타일 이미지 base64"
+        default="", description="참조 메이크업 스타일 이미지 base64 (style_image_id 사용 시 생략)"
+    )
+    source_image_id: Optional[str] = Field(default=None, description="업로드한 얼굴 이미지 ID")
+    style_image_id: Optional[str] = Field(default=None, description="업로드한 스타일 이미지 ID")
+    seed: Optional[int] = Field(
+        default=None, description="고정 시드(선택). 지정 시 결과가 결정적이며 결과 캐시를 사용"
+    )
+    face_crop: bool = Field(
+        default=False,
+        description="얼굴 영역만 잘라 생성한 뒤 원본 해상도 사진에 합성 (고해상도 입력용, 결과는 원본 크기)",
+    )
+    quality: Literal["preview", "final"] = Field(
+        default="final",
+        description='"preview"(저해상도 종횡비 버킷 + 적은 steps, 빠른 초안) | "final"(512)',
+    )
+    strength: float = Field(
+        default=1.0, gt=0.0, le=1.0,
+        description="1.0 미만이면 원본 이미지에서 출발하는 img2img 모드 (낮을수록 원본 유지 + 빠름, 은은한 메이크업용)",
     )
 
+    @model_validator(mode="after")
+    def _check_images(self) -> "MakeupRequest":
+        _require_image(self.source_image_base64, self.source_image_id, "source_image")
+        _require_image(self.style_image_base64, self.style_image_id, "style_image")
+        return self
+
 class MakeupResponse(BaseModel):
     status: str
     result_image_base64: Optional[str] = None
@@ -146,10 +199,72 @@ class EditItem(BaseModel):
     intensity: int
 
 class CustomizationRequest(BaseModel):
-    base_image_base64: str
+    base_image_base64: str = ""
+    base_image_id: Optional[str] = None  # 업로드한 이미지 ID (base64 대신)
     edits: List[EditItem]
 
+    @model_validator(mode="after")
+    def _check_image(self) -> "CustomizationRequest":
+        _require_image(self.base_image_base64, self.base_image_id, "base_image")
+        return self
+
 class CustomizationResponse(BaseModel):
     status: str
     result_image_base64: Optional[str] = None
     message: Optional[str] = None
+
+
+# ----------------------- Pipeline ----------------------
+class PipelineRequest(BaseModel):
+    image_base64: str = Field(default="", description="사용자 얼굴 이미지 base64 (NIA / Style / Makeup 공용, 1회 업로드)")
+    image_id: Optional[str] = Field(default=None, description="업로드한 얼굴 이미지 ID (image_base64 대신)")
+    keywords: List[str] = Field(default_factory=list, description="스타일 힌트 키워드 리스트")
+    recommended_categories: List[str] = Field(default_factory=list, description="제품 추천 카테고리")
+    filtered_products: List[ProductIn] = Field(
+        default_factory=list, description="제품 후보. 비어 있으면 Product 단계 생략"
+    )
+    locale: str = Field(default="ko", description="제품 추천 이유 언어")
+    makeup: bool = Field(default=True, description="Style Top-1 로 Makeup 단계 실행 여부")
+    seed: Optional[int] = Field(default=None, description="Makeup 고정 시드(선택)")
+    quality: Literal["preview", "final"] = Field(default="final", description='Makeup 품질 단계 "preview" | "final"')
+    edits: List[EditItem] = Field(
+        default_factory=list, description="Makeup 결과에 적용할 커스터마이징. 비어 있으면 Customization 단계 생략"
+    )
+    stream: bool = Field(default=True, description="true: 단계별 결과를 완료 순서대로 NDJSON 스트리밍, false: 모아서 한 번에 응답")
+
+    @model_validator(mode="after")
+    def _check_image(self) -> "PipelineRequest":
+        _require_image(self.image_base64, self.image_id, "image")
+        return self
+
+class PipelineStageResult(BaseModel):
+    """단계별 결과. 각 단계 API 응답 필드(predictions, feedback, results, ...)를 그대로 담는다."""
+    model_config = {"extra": "allow"}
+
+    stage: str = Field(..., description='"nia" | "feedback" | "product" | "style" | "makeup" | "customization" | "pipeline"')
+    status: str = Field(..., description='"success" | "error" | "skipped"')
+    message: Optional[str] = None
+    elapsed_ms: Optional[float] = None
+
+class PipelineResponse(BaseModel):
+    status: str = Field(..., description='"success" | "partial" | "error"')
+    stages: Dict[str, PipelineStageResult] = Field(default_factory=dict)
+    timings: Dict[str, float] = Field(default_factory=dict, description="단계별 소요 시간(ms) + total")
+
+# ------------------------- Jobs ------------------------
+class JobSubmitResponse(BaseModel):
+    status: str
+    job_id: Optional[str] = None
+    job_status: Optional[str] = Field(default=None, description='"queued" | "running" | "succeeded" | "failed" | "cancelled"')
+    message: Optional[str] = None
+
+class JobStatusResponse(BaseModel):
+    status: str
+    job_id: str
+    job_status: str = Field(..., description='"queued" | "running" | "succeeded" | "failed" | "cancelled"')
+    created_at: Optional[float] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+    result_image_base64: Optional[str] = None
+    message: Optional[str] = None
@@ -9,6 +9,9 @@ from PIL import Image
 import mediapipe as mp
 import torch.nn.functional as F
 from model_manager.customization_manager import load_customization_model
+from model_manager.registry import holding
+from utils.singleflight import single_flight
+from service.image_service import load_image
 
 
 # ==========================
@@ -93,19 +96,20 @@ def apply_blusher_intensity(image_array, landmarks_df, intensity=50, blur_size=1
 # ==========================
 # 메인 추론 함수
 # ==========================
+@single_flight()
+@holding("custom")
 def run_inference(request: dict) -> dict:
     try:
-        if "base_image_base64" not in request:
-            raise ValueError("Missing key: base_image_base64")
+        if not request.get("base_image_base64") and not request.get("base_image_id"):
+            raise ValueError("Missing key: base_image_base64 (or base_image_id)")
         if "edits" not in request or not isinstance(request["edits"], list):
             raise ValueError("Missing key or invalid type: edits (must be list)")
 
         # 모델 로드
         model, processor, device = load_customization_model()
 
-        # base64 → PIL → np.array
-        image_data = base64.b64decode(request["base_image_base64"])
-        image = Image.open(io.BytesIO(image_data)).convert("RGB")
+        # base64 | image_id → PIL → np.array
+        image = load_image(request.get("base_image_base64"), request.get("base_image_id"))
         image_np = np.array(image)
 
         # SegFormer 추론: mask 생성
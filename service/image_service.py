@@ -0,0 +1,176 @@
+# service/image_service.py
+"""
+콘텐츠 주소 기반 이미지 저장소
+- POST /v1/images 로 올린 이미지를 원본 바이트의 sha256(image_id) 로 한 번만 저장하고,
+  이후 요청은 base64 대신 *_image_id 로 참조한다. (세션 내 같은 사진 재업로드 / 재디코딩 제거)
+- 바이트 계층: TieredCache (메모리 LRU + 선택적 디스크, TTL)
+- 디코딩 계층: image_id → RGB uint8 배열 (읽기 전용) LRU, 바이트 상한 IMAGE_STORE_DECODED_MB
+- load_image(): 서비스 공용 진입점. image_id 또는 인라인 base64 를 받아 PIL.Image 반환
+  (인라인 base64 도 같은 해시로 디코딩 캐시를 사용한다)
+"""
+import base64
+import binascii
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from config import get_settings
+from utils.base64_utils import Base64Error
+from utils.errors import AppError
+from utils.tiered_cache import TieredCache
+
+
+class ImageNotFound(AppError):
+    """image_id 가 없거나 TTL 이 지나 만료된 경우"""
+
+    def __init__(self, image_id: str):
+        super().__init__(f"이미지를 찾을 수 없습니다(만료되었을 수 있음): {image_id}", code="IMAGE_NOT_FOUND", status=404)
+        self.image_id = image_id
+
+
+def _decode_b64(image_base64: str) -> bytes:
+    if "base64," in image_base64[:64]:
+        image_base64 = image_base64.split("base64,", 1)[1]
+    try:
+        return base64.b64decode("".join(image_base64.split()))
+    except (binascii.Error, ValueError) as e:
+        raise Base64Error(f"Invalid base64: {e}")
+
+
+def _decode_image(data: bytes) -> np.ndarray:
+    try:
+        arr = np.asarray(Image.open(io.BytesIO(data)).convert("RGB"))
+    except Exception as e:
+        raise Base64Error(f"Invalid image bytes: {e}")
+    arr.setflags(write=False)
+    return arr
+
+
+class ImageStore:
+    def __init__(self):
+        s = get_settings()
+        self.bytes = TieredCache(
+            "images",
+            mem_max_bytes=s.IMAGE_STORE_MEM_MB * 1024 * 1024,
+            disk_dir=s.IMAGE_STORE_DIR if s.IMAGE_STORE_DISK else None,
+            ttl_sec=s.IMAGE_STORE_TTL_SEC,
+        )
+        self.decoded_max_bytes = s.IMAGE_STORE_DECODED_MB * 1024 * 1024
+        self._decoded: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._decoded_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    # ---- 저장 ----
+    def put(self, data: bytes) -> Tuple[str, np.ndarray]:
+        """원본 바이트 저장 (디코딩은 이미 있으면 재사용). (image_id, 디코딩 배열) 반환"""
+        max_bytes = get_settings().IMAGE_UPLOAD_MAX_MB * 1024 * 1024
+        if len(data) > max_bytes:
+            raise ValueError(f"이미지가 너무 큽니다: {len(data)} bytes (최대 {max_bytes})")
+        image_id = hashlib.sha256(data).hexdigest()
+        arr = self._decoded_get(image_id)
+        if arr is None:
+            arr = _decode_image(data)  # 이미지가 아니면 저장하지 않는다
+            self._decoded_put(image_id, arr)
+        # 항상 다시 저장: 같은 사진 재업로드가 TTL(stored_at / 디스크 mtime)을 갱신한다
+        self.bytes.put(image_id, data)
+        return image_id, arr
+
+    # ---- 조회 ----
+    def array(self, image_id: str) -> np.ndarray:
+        """RGB uint8 배열 (읽기 전용, 공유 객체)"""
+        arr = self._decoded_get(image_id)
+        if arr is not None:
+            return arr
+        data = self.bytes.get(image_id)
+        if data is None:
+            raise ImageNotFound(image_id)
+        arr = _decode_image(data)
+        self._decoded_put(image_id, arr)
+        return arr
+
+    def image(self, image_id: str) -> Image.Image:
+        return Image.fromarray(self.array(image_id))
+
+    def inline(self, image_base64: str) -> np.ndarray:
+        """인라인 base64 디코딩 (같은 내용이면 디코딩 캐시 재사용, 바이트는 저장하지 않음)"""
+        data = _decode_b64(image_base64)
+        image_id = hashlib.sha256(data).hexdigest()
+        arr = self._decoded_get(image_id)
+        if arr is None:
+            arr = _decode_image(data)
+            self._decoded_put(image_id, arr)
+        return arr
+
+    # ---- 디코딩 계층 ----
+    def _decoded_get(self, image_id: str) -> Optional[np.ndarray]:
+        with self._lock:
+            arr = self._decoded.get(image_id)
+            if arr is None:
+                self._misses += 1
+                return None
+            self._decoded.move_to_end(image_id)
+            self._hits += 1
+            return arr
+
+    def _decoded_put(self, image_id: str, arr: np.ndarray) -> None:
+        if arr.nbytes > self.decoded_max_bytes:
+            return
+        with self._lock:
+            old = self._decoded.pop(image_id, None)
+            if old is not None:
+                self._decoded_bytes -= old.nbytes
+            self._decoded[image_id] = arr
+            self._decoded_bytes += arr.nbytes
+            while self._decoded_bytes > self.decoded_max_bytes and self._decoded:
+                _, evicted = self._decoded.popitem(last=False)
+                self._decoded_bytes -= evicted.nbytes
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "decoded_entries": len(self._decoded),
+                "decoded_bytes": self._decoded_bytes,
+                "decoded_max_bytes": self.decoded_max_bytes,
+                "decoded_hit_ratio": round(self._hits / lookups, 4) if lookups else None,
+            }
+
+
+_STORE: Optional[ImageStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_image_store() -> ImageStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = ImageStore()
+        return _STORE
+
+
+def upload_image(image_base64: str) -> dict:
+    """base64 이미지를 저장하고 {"image_id", "width", "height", "bytes"} 반환"""
+    data = _decode_b64(image_base64)
+    image_id, arr = get_image_store().put(data)
+    return {"image_id": image_id, "width": int(arr.shape[1]), "height": int(arr.shape[0]), "bytes": len(data)}
+
+
+def load_image(image_base64: Optional[str] = None, image_id: Optional[str] = None) -> Image.Image:
+    """image_id(업로드 저장소) 우선, 없으면 인라인 base64 를 RGB PIL.Image 로"""
+    store = get_image_store()
+    if image_id:
+        return store.image(image_id)
+    if image_base64:
+        return Image.fromarray(store.inline(image_base64))
+    raise ValueError("image_base64 또는 image_id가 필요합니다.")
+
+
+def image_store_stats() -> dict:
+    return get_image_store().stats()
@@ -0,0 +1,264 @@
+# service/job_service.py
+"""
+비동기 작업(Job) 서비스
+- 오래 걸리는 makeup / customization 추론을 HTTP 연결과 분리한다.
+- POST 시 job_id를 즉시 반환하고, 프로세스 내 bounded 워커 큐가 실행한다.
+- 결과는 TTL 경과 후 만료되며, 저장소는 메모리 또는 로컬 파일(JSON) 중 선택.
+  (외부 브로커 불필요)
+"""
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from config import get_settings
+from utils.cancellation import CancellationToken, InferenceCancelled
+
+# 상태 값
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """대기열이 가득 찬 경우"""
+
+
+# ------------------------------------------------------------
+# 저장소 (memory | file)
+# ------------------------------------------------------------
+class MemoryJobStore:
+    def __init__(self):
+        self._jobs: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def put(self, job: dict) -> None:
+        with self._lock:
+            self._jobs[job["job_id"]] = dict(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def ids(self) -> list:
+        with self._lock:
+            return list(self._jobs.keys())
+
+
+class FileJobStore:
+    """job 하나당 JSON 파일 1개 (원자적 교체로 기록)"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, job_id: str) -> Path:
+        return self.root / f"{job_id}.json"
+
+    def put(self, job: dict) -> None:
+        path = self._path(job["job_id"])
+        tmp = path.with_suffix(".json.tmp")
+        with self._lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(job, f, ensure_ascii=False)
+            os.replace(tmp, path)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        path = self._path(job_id)
+        with self._lock:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                return None
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            try:
+                self._path(job_id).unlink()
+            except FileNotFoundError:
+                pass
+
+    def ids(self) -> list:
+        return [p.stem for p in self.root.glob("*.json")]
+
+
+# ------------------------------------------------------------
+# 작업 큐
+# ------------------------------------------------------------
+class JobManager:
+    def __init__(self, store, max_queue: int, workers: int, ttl_sec: float):
+        self.store = store
+        self.ttl_sec = ttl_sec
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._tokens: Dict[str, CancellationToken] = {}
+        self._tokens_lock = threading.Lock()
+        # QUEUED → RUNNING(워커) / QUEUED → CANCELLED(cancel) 전이를 직렬화
+        self._state_lock = threading.Lock()
+        self._recover()
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for t in self._workers:
+            t.start()
+
+    # ---- public ----
+    def submit(self, kind: str, fn: Callable[[CancellationToken], Dict[str, Any]]) -> dict:
+        """
+        fn(token) -> 결과 dict. job 레코드를 만들고 대기열에 넣는다.
+        대기열이 가득 차면 JobQueueFull.
+        """
+        self.purge_expired()
+        now = time.time()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": QUEUED,
+            "created_at": now,
+            "started_at": None,
+            "finished_at": None,
+            "expires_at": now + self.ttl_sec,
+            "result": None,
+            "message": None,
+        }
+        token = CancellationToken()
+        self.store.put(job)
+        with self._tokens_lock:
+            self._tokens[job["job_id"]] = token
+        try:
+            self._queue.put_nowait((job["job_id"], fn, token))
+        except queue.Full:
+            with self._tokens_lock:
+                self._tokens.pop(job["job_id"], None)
+            self.store.delete(job["job_id"])
+            raise JobQueueFull("작업 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.")
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        if job["status"] in FINISHED_STATES and job["expires_at"] <= time.time():
+            self.store.delete(job_id)
+            return None
+        return job
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """
+        토큰을 취소하고, 아직 대기 중이면 바로 CANCELLED 로 끝낸다.
+        실행 중인 작업은 워커가 토큰을 보고 끝낸다 (상태는 락 안에서 다시 읽어 판단)
+        """
+        if self.get(job_id) is None:
+            return None
+        with self._tokens_lock:
+            token = self._tokens.get(job_id)
+        if token is not None:
+            token.cancel("cancelled_by_client")
+            with self._state_lock:
+                job = self.store.get(job_id)
+                if job is not None and job["status"] == QUEUED:
+                    self._finish(job, CANCELLED, message="작업이 취소되었습니다.")
+        return self.store.get(job_id)
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        removed = 0
+        for job_id in self.store.ids():
+            job = self.store.get(job_id)
+            if job and job["status"] in FINISHED_STATES and job["expires_at"] <= now:
+                self.store.delete(job_id)
+                removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        return {"queued": self._queue.qsize(), "max_queue": self._queue.maxsize, "workers": len(self._workers)}
+
+    # ---- internal ----
+    def _recover(self) -> None:
+        """
+        기동 시: 이전 프로세스가 남긴 미완료(queued/running) 레코드를 FAILED 로 정리
+        (이 프로세스에는 해당 토큰/워커가 없어 영원히 끝나지 않으므로. file 저장소에서만 발생)
+        """
+        for job_id in self.store.ids():
+            job = self.store.get(job_id)
+            if job is not None and job["status"] not in FINISHED_STATES:
+                self._finish(job, FAILED, message="서버 재시작으로 작업이 중단되었습니다. 다시 요청하세요.")
+
+    def _finish(self, job: dict, status: str, result: Optional[dict] = None, message: Optional[str] = None):
+        now = time.time()
+        job.update(status=status, result=result, message=message, finished_at=now, expires_at=now + self.ttl_sec)
+        self.store.put(job)
+        with self._tokens_lock:
+            self._tokens.pop(job["job_id"], None)
+
+    def _worker(self):
+        while True:
+            job_id, fn, token = self._queue.get()
+            try:
+                with self._state_lock:
+                    job = self.store.get(job_id)
+                    if job is None or job["status"] in FINISHED_STATES:
+                        continue
+                    if token.cancelled:
+                        self._finish(job, CANCELLED, message="작업이 취소되었습니다.")
+                        continue
+                    job.update(status=RUNNING, started_at=time.time())
+                    self.store.put(job)
+                try:
+                    result = fn(token)
+                except InferenceCancelled as e:
+                    self._finish(job, CANCELLED, message=e.message)
+                except Exception as e:
+                    self._finish(job, FAILED, message=str(e))
+                else:
+                    if result.get("status") in ("failed", "error"):
+                        self._finish(job, FAILED, message=result.get("message", "작업 실패"))
+                    else:
+                        self._finish(job, SUCCEEDED, result=result)
+            finally:
+                self._queue.task_done()
+
+
+_MANAGER: Optional[JobManager] = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """JobManager 싱글톤 (최초 호출 시 워커 스레드 시작)"""
+    global _MANAGER
+    with _MANAGER_LOCK:
+        if _MANAGER is None:
+            s = get_settings()
+            store = FileJobStore(s.JOB_DIR) if s.JOB_BACKEND == "file" else MemoryJobStore()
+            _MANAGER = JobManager(store, max_queue=s.JOB_QUEUE_SIZE, workers=s.JOB_WORKERS, ttl_sec=s.JOB_TTL_SEC)
+        return _MANAGER
+
+
+def job_to_response(job: dict) -> dict:
+    """job 레코드 → JobStatusResponse 필드"""
+    result = job.get("result") or {}
+    return {
+        "status": "success",
+        "job_id": job["job_id"],
+        "job_status": job["status"],
+        "created_at": job.get("created_at"),
+        "started_at": job.get("started_at"),
+        "finished_at": job.get("finished_at"),
+        "expires_at": job.get("expires_at"),
+        "result_image_base64": result.get("result_image_base64"),
+        "message": job.get("message"),
+    }
@@ -5,9 +5,14 @@
   여기서는 이미지 전이(inference)만 책임집니다.
 """
 
+import io
+import math
 import os
 import sys
+import threading
 import torch
+from collections import OrderedDict
+from concurrent.futures import wait as futures_wait
 from typing import Optional, Union
 from PIL import Image
 import numpy as np
@@ -19,52 +24,112 @@ if project_root not in sys.path:
 
 # 내부 모듈
 from model_manager.makeup_manager import load_model
-from libs.spiga_draw import get_draw  # 포즈/랜드마크 기반 draw 이미지
-from facelib import FaceDetector  # 얼굴 검출기 (모델 웜업/보조용)
+from model_manager.registry import holding
+from model_manager.compile_manager import compile_enabled, route_size
+from model_manager.memory_planner import plan_memory
+from libs.spiga_draw import pose_from_landmarks, LandmarkEngine  # 포즈/랜드마크 기반 draw 이미지 (SPIGA는 지연 생성)
+from config import get_settings
+from utils.cancellation import CancellationToken
+from utils.singleflight import single_flight, request_fingerprint
+from utils.tiered_cache import TieredCache
+from utils.face_crop import face_crop_box, paste_face
+from utils.stages import StageTimings, run_parallel
 
 
 # ------------------------------------------------------------
 # 패딩 유틸
 # ------------------------------------------------------------
-def resize_with_padding(pil_img: Image.Image, target: int = 512, pad_mode: str = "edge") -> Image.Image:
+def fit_layout(w: int, h: int, width: int, height: int):
     """
-    종횡비를 유지해 긴 변 기준으로 리사이즈한 뒤, 패딩을 넣어 정사각(512x512)으로 맞춘다.
-    pad_mode: "edge" | "reflect" | "constant"
+    (w, h) 이미지를 종횡비 유지로 (width, height) 안에 맞출 때의 배치.
+    Returns: (new_w, new_h, scale, pad_left, pad_top)
     """
-    w, h = pil_img.size
     if w == 0 or h == 0:
         raise ValueError("Invalid image size")
+    scale = min(width / w, height / h)
+    new_w = min(width, int(round(w * scale)))
+    new_h = min(height, int(round(h * scale)))
+    return new_w, new_h, scale, (width - new_w) // 2, (height - new_h) // 2
 
-    # 종횡비 유지 리사이즈
-    if w >= h:
-        new_w = target
-        new_h = int(round(h * (target / w)))
-    else:
-        new_h = target
-        new_w = int(round(w * (target / h)))
 
+def fit_with_padding(pil_img: Image.Image, width: int, height: int, pad_mode: str = "edge") -> Image.Image:
+    """
+    종횡비를 유지해 (width, height) 안에 들어가게 리사이즈한 뒤, 패딩을 넣어 (width, height)로 맞춘다.
+    pad_mode: "edge" | "reflect" | "constant"
+    """
+    new_w, new_h, _, pad_left, pad_top = fit_layout(*pil_img.size, width, height)
     img_resized = pil_img.resize((new_w, new_h), Image.LANCZOS)
 
     # Numpy로 패딩
     arr = np.array(img_resized)
-    pad_top = (target - new_h) // 2
-    pad_bottom = target - new_h - pad_top
-    pad_left = (target - new_w) // 2
-    pad_right = target - new_w - pad_left
+    pad_bottom = height - new_h - pad_top
+    pad_right = width - new_w - pad_left
+    pads = ((pad_top, pad_bottom), (pad_left, pad_right), (0, 0))
 
     if pad_mode == "constant":
         # 흰색 패딩(255)
-        arr_padded = np.pad(arr, ((pad_top, pad_bottom), (pad_left, pad_right), (0, 0)), mode="constant", constant_values=255)
+        arr_padded = np.pad(arr, pads, mode="constant", constant_values=255)
     elif pad_mode == "reflect":
         # 반사 패딩
-        arr_padded = np.pad(arr, ((pad_top, pad_bottom), (pad_left, pad_right), (0, 0)), mode="reflect")
+        arr_padded = np.pad(arr, pads, mode="reflect")
     else:
         # 가장자리 반복(edge)
-        arr_padded = np.pad(arr, ((pad_top, pad_bottom), (pad_left, pad_right), (0, 0)), mode="edge")
+        arr_padded = np.pad(arr, pads, mode="edge")
 
     return Image.fromarray(arr_padded)
 
 
+def resize_with_padding(pil_img: Image.Image, target: int = 512, pad_mode: str = "edge") -> Image.Image:
+    """
+    종횡비를 유지해 긴 변 기준으로 리사이즈한 뒤, 패딩을 넣어 정사각(512x512)으로 맞춘다.
+    pad_mode: "edge" | "reflect" | "constant"
+    """
+    return fit_with_padding(pil_img, target, target, pad_mode)
+
+
+# ------------------------------------------------------------
+# 품질 단계 (preview / final)
+# ------------------------------------------------------------
+def aspect_bucket(width: int, height: int, base: int):
+    """
+    입력 종횡비에 가장 가까운 (bucket_w, bucket_h). 면적은 base² 근처, 각 변은 64의 배수
+    (MAKEUP_PREVIEW_ASPECTS 후보 중 선택)
+    """
+    target = math.log(width / height)
+    best = (base, base)
+    best_err = abs(target)
+    for rw, rh in get_settings().MAKEUP_PREVIEW_ASPECTS:
+        root = math.sqrt(rw / rh)
+        bw = max(64, int(round(base * root / 64)) * 64)
+        bh = max(64, int(round(base / root / 64)) * 64)
+        err = abs(math.log(bw / bh) - target)
+        if err < best_err:
+            best, best_err = (bw, bh), err
+    return best
+
+
+def resolve_tier(quality: str, size: int, num_inference_steps: int, image_size, device: str = "cuda"):
+    """
+    품질 단계 → (width, height, steps)
+    - final  : size × size, 요청 steps (device 에서 컴파일 모드면 버킷 해상도)
+    - preview: MAKEUP_PREVIEW_SIZE 면적의 종횡비 버킷, steps ≤ MAKEUP_PREVIEW_STEPS
+               (컴파일 모드에서는 재컴파일을 피하려고 정사각 버킷만 사용. 기본 MAKEUP_COMPILE_SIZES 에
+                preview 해상도가 포함되어 웜업되며, 빠진 경우 route_size 로 더 큰 버킷에서 실행 → steps 만 줄어든다)
+    """
+    s = get_settings()
+    if quality == "final":
+        size = route_size(size, device)
+        return size, size, num_inference_steps
+    if quality != "preview":
+        raise ValueError(f"지원하지 않는 quality: {quality} (preview | final)")
+    steps = min(num_inference_steps, s.MAKEUP_PREVIEW_STEPS)
+    base = route_size(s.MAKEUP_PREVIEW_SIZE, device)
+    if compile_enabled(device):
+        return base, base, steps
+    width, height = aspect_bucket(*image_size, base)
+    return width, height, steps
+
+
 # ------------------------------------------------------------
 # Face Detector (옵셔널, 웜업/보조)
 # ------------------------------------------------------------
@@ -74,6 +139,7 @@ def get_face_detector():
     """Face Detector 싱글톤 (가중치가 있으면 로컬 사용, 없으면 기본 생성)"""
     global _FACE_DETECTOR
     if _FACE_DETECTOR is None:
+        from facelib import FaceDetector  # 얼굴 검출기 (첫 사용 시 import)
         weight_path = "./models/mobilenet0.25_Final.pth"
         if os.path.exists(weight_path):
             _FACE_DETECTOR = FaceDetector(weight_path=weight_path)
@@ -82,9 +148,83 @@ def get_face_detector():
     return _FACE_DETECTOR
 
 
+_LANDMARK_ENGINE = None
+_LANDMARK_ENGINE_LOCK = threading.Lock()
+
+def get_landmark_engine() -> LandmarkEngine:
+    """
+    랜드마크 엔진 싱글톤 (위 Face Detector 싱글톤을 공유, 프로세스 전체에서 하나)
+    preloader / pose stage 스레드 / 추측 실행이 동시에 처음 호출해도 한 번만 만든다.
+    """
+    global _LANDMARK_ENGINE
+    with _LANDMARK_ENGINE_LOCK:
+        if _LANDMARK_ENGINE is None:
+            _LANDMARK_ENGINE = LandmarkEngine(
+                detector=get_face_detector(),
+                refine_iou=get_settings().SPIGA_REFINE_IOU,
+            )
+        return _LANDMARK_ENGINE
+
+
+# ------------------------------------------------------------
+# img2img 소스 잠재값 캐시
+# ------------------------------------------------------------
+_SOURCE_LATENTS = OrderedDict()
+_SOURCE_LATENTS_LOCK = threading.Lock()
+
+
+def get_source_latents(pipeline, image: Image.Image, width: int, height: int):
+    """
+    패딩된 소스 이미지의 VAE 잠재값 (소스 픽셀 해시 / 해상도 / VAE dtype·device 별 LRU 캐시,
+    MAKEUP_SOURCE_LATENT_CACHE 개)
+    """
+    vae = pipeline.vae
+    key = request_fingerprint(image, (width, height), str(vae.dtype), str(vae.device), get_settings().MAKEUP_MODEL_VERSION)
+    with _SOURCE_LATENTS_LOCK:
+        if key in _SOURCE_LATENTS:
+            _SOURCE_LATENTS.move_to_end(key)
+            return _SOURCE_LATENTS[key]
+
+    latents = pipeline.encode_source_latents(image, height=height, width=width)
+
+    with _SOURCE_LATENTS_LOCK:
+        _SOURCE_LATENTS[key] = latents
+        while len(_SOURCE_LATENTS) > max(0, get_settings().MAKEUP_SOURCE_LATENT_CACHE):
+            _SOURCE_LATENTS.popitem(last=False)
+    return latents
+
+
+# ------------------------------------------------------------
+# 참조 이미지 임베딩 캐시
+# ------------------------------------------------------------
+_REFERENCE_EMBEDS = OrderedDict()
+_REFERENCE_EMBEDS_LOCK = threading.Lock()
+
+
+def get_reference_embeds(makeup_encoder, image: Image.Image):
+    """
+    패딩된 참조 이미지의 (cond, uncond) CLIP 임베딩 (참조 픽셀 해시 / dtype·device 별 LRU 캐시,
+    MAKEUP_REFERENCE_EMBED_CACHE 개). 같은 스타일을 여러 사용자가 쓰는 경우 / 추측 실행 결과 재사용
+    """
+    key = request_fingerprint(image, str(makeup_encoder.dtype), str(makeup_encoder.device), get_settings().MAKEUP_MODEL_VERSION)
+    with _REFERENCE_EMBEDS_LOCK:
+        if key in _REFERENCE_EMBEDS:
+            _REFERENCE_EMBEDS.move_to_end(key)
+            return _REFERENCE_EMBEDS[key]
+
+    embeds = makeup_encoder.get_image_embeds(image)
+
+    with _REFERENCE_EMBEDS_LOCK:
+        _REFERENCE_EMBEDS[key] = embeds
+        while len(_REFERENCE_EMBEDS) > max(0, get_settings().MAKEUP_REFERENCE_EMBED_CACHE):
+            _REFERENCE_EMBEDS.popitem(last=False)
+    return embeds
+
+
 # ------------------------------------------------------------
 # Inference
 # ------------------------------------------------------------
+@holding("makeup")
 def run_inference(
     id_image: Union[Image.Image, str],
     makeup_image: Union[Image.Image, str],
@@ -93,6 +233,10 @@ def run_inference(
     num_inference_steps: int = 30,
     seed: Optional[int] = None,
     device: str = "cuda",
+    cancel_token: Optional[CancellationToken] = None,
+    face_crop: bool = False,
+    quality: str = "final",
+    strength: float = 1.0,
 ) -> Image.Image:
     """
     메이크업 전이 추론.
@@ -104,45 +248,330 @@ def run_inference(
         num_inference_steps: 디퓨전 스텝 수
         seed: 고정 시드(재현성)
         device: "cuda" | "cpu"
+        cancel_token: 취소 토큰(선택). 단계 사이와 매 디퓨전 step마다 확인하며,
+            취소되면 InferenceCancelled를 던진다.
+        face_crop: True면 얼굴 주변 정사각 영역만 size로 생성한 뒤 원본 해상도 사진에 합성해 반환
+            (얼굴이 검출되지 않으면 전체 이미지 모드로 처리)
+        quality: "final"(size × size, 요청 steps) | "preview"(저해상도 종횡비 버킷 + 적은 steps,
+            결과는 버킷 해상도 그대로 반환)
+        strength: 1.0 미만이면 img2img 모드 — 소스 이미지 잠재값을 strength 지점까지 노이즈화한 뒤
+            남은 int(steps × strength) step만 디노이즈 (은은한 메이크업용, step 수에 비례해 빨라짐)
+            최소 1 step: strength < 1/steps 는 1/steps 로 올려 처리 (img2img_strength)
 
     Returns:
         PIL.Image: 전이된 결과 이미지
     """
 
-    # 1) 이미지 로드/전처리
-    if isinstance(id_image, str):
-        id_image = Image.open(id_image).convert("RGB")
-    if isinstance(makeup_image, str):
-        makeup_image = Image.open(makeup_image).convert("RGB")
-
-    # 2) 512 정규화 (종횡비 유지 + 패딩)
-    id_image = resize_with_padding(id_image, target=size, pad_mode="edge")
-    makeup_image = resize_with_padding(makeup_image, target=size, pad_mode="edge")
-
-    # 3) 얼굴 검출기 웜업
-    _ = get_face_detector()
-
-    # 4) 포즈/랜드마크 기반 보조 이미지 생성
-    pose_image = get_draw(id_image, size=size)
-
-    # 5) 모델 로드(캐시 사용)
-    pipeline, makeup_encoder = load_model(device=device)
+    # 단계 DAG:
+    #   preprocess ─┬─ pose (랜드마크 + 포즈 렌더, CPU, 별도 스레드) ──────────────┐
+    #               └─ load_model → reference_embeds (CLIP-L) → source_latents ─┴─ diffusion → postprocess
+    timings = StageTimings("makeup")
+
+    with timings.stage("preprocess"):
+        # 1) 이미지 로드/전처리
+        if isinstance(id_image, str):
+            id_image = Image.open(id_image).convert("RGB")
+        if isinstance(makeup_image, str):
+            makeup_image = Image.open(makeup_image).convert("RGB")
+
+        # 랜드마크 엔진 (검출기 + SPIGA 싱글톤)
+        engine = get_landmark_engine()
+
+        # face_crop: 원본에서 얼굴 정사각 영역만 잘라 디퓨전에 사용
+        original, crop_box = None, None
+        if face_crop:
+            s = get_settings()
+            crop_box = face_crop_box(id_image, engine.face_boxes(id_image), margin=s.MAKEUP_FACE_CROP_MARGIN)
+            if crop_box is None:
+                print("⚠️ face_crop: no face detected, using the full image")
+            else:
+                original, id_image = id_image, id_image.crop(crop_box)
+
+        # 2) 품질 단계별 해상도/steps + 정규화 (종횡비 유지 + 패딩)
+        #    컴파일 모드에서는 컴파일된 형상 버킷 해상도로 맞춘다 (서빙 중 재컴파일 방지)
+        width, height, num_inference_steps = resolve_tier(quality, size, num_inference_steps, id_image.size, device)
+        _, _, scale, pad_left, pad_top = fit_layout(*id_image.size, width, height)
+        id_input = fit_with_padding(id_image, width, height, pad_mode="edge")
+        makeup_image = resize_with_padding(makeup_image, target=max(width, height), pad_mode="edge")
+
+    # 3~4) 포즈/랜드마크 기반 보조 이미지 생성 (참조 인코딩과 동시에 실행)
+    #      랜드마크는 원본 좌표로 1회 계산/캐시 → 단계별 배치에 맞게 좌표만 변환해 렌더링
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+    def _pose_stage():
+        landmarks = engine.cached_landmarks(id_image)
+        return pose_from_landmarks(landmarks, size=(width, height), scale=scale, offset=(pad_left, pad_top))
+
+    pose_future = run_parallel(timings, "pose", _pose_stage)
+
+    # 병렬 pose 단계가 끝나기 전에 아래 단계가 실패/취소되면, 대기 중이면 취소하고 실행 중이면 끝날 때까지 기다린다
+    # (요청이 끝난 뒤 stage 스레드가 랜드마크 엔진을 계속 쓰거나 결과가 버려지지 않도록)
+    try:
+        # 5) 모델 로드(캐시 사용)
+        with timings.stage("load_model"):
+            pipeline, makeup_encoder = load_model(device=device)
+
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        with timings.stage("reference_embeds"):
+            image_embeds = get_reference_embeds(makeup_encoder, makeup_image)
+
+        # 메모리 상한(MAKEUP_PEAK_RSS_MB)에 맞춘 attention chunk / VAE slicing·tiling
+        plan_memory(pipeline, makeup_encoder, height, width, batch=2 if guidance_scale > 1 else 1)
+        if get_settings().MAKEUP_TOME_RATIO > 0:
+            from libs.detail_encoder.token_merging import set_token_merging_aspect
+            set_token_merging_aspect(pipeline.unet, width / height)
+
+        # img2img: 소스 잠재값 (캐시)
+        img2img = {}
+        strength = img2img_strength(strength, num_inference_steps)
+        if strength < 1.0:
+            with timings.stage("source_latents"):
+                img2img = {"strength": strength, "source_latents": get_source_latents(pipeline, id_input, width, height)}
+
+        pose_image = pose_future.result()
+    except BaseException:
+        if not pose_future.cancel():
+            futures_wait([pose_future])
+        raise
 
     # 6) 시드 고정(선택)
     if seed is not None:
         torch.manual_seed(seed)
 
     # 7) 전이 실행
-    result_img = makeup_encoder.generate(
-        id_image=[id_image, pose_image],
+    with timings.stage("diffusion"):
+        result_img = makeup_encoder.generate(
+            id_image=[id_input, pose_image],
+            makeup_image=makeup_image,
+            pipe=pipeline,
+            guidance_scale=guidance_scale,
+            num_inference_steps=num_inference_steps,
+            seed=seed,
+            cancel_token=cancel_token,
+            image_embeds=image_embeds,
+            height=height,
+            width=width,
+            **img2img,
+        )
+
+    with timings.stage("postprocess"):
+        if original is not None:
+            result_img = paste_face(original, result_img, crop_box, feather=get_settings().MAKEUP_FACE_CROP_FEATHER)
+        elif quality == "final" and result_img.size != (size, size):
+            result_img = result_img.resize((size, size), Image.LANCZOS)
+
+    timings.report()
+    return result_img
+
+
+@holding("makeup")
+def warm_inputs(
+    id_image: Image.Image,
+    makeup_image: Image.Image,
+    size: int = 512,
+    num_inference_steps: int = 30,
+    quality: str = "final",
+    device: str = "cuda",
+    cancel_token: Optional[CancellationToken] = None,
+) -> None:
+    """
+    run_inference 와 같은 전처리로 디퓨전 이전 단계(랜드마크, 모델 로드, 참조 임베딩)만 실행해 캐시를 채운다.
+    (추측 실행용, face_crop 미사용 요청 기준. 포즈 맵은 캐시된 랜드마크로 요청 시 렌더링)
+    """
+    get_landmark_engine().cached_landmarks(id_image)
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+    width, height, _ = resolve_tier(quality, size, num_inference_steps, id_image.size, device)
+    makeup_image = resize_with_padding(makeup_image, target=max(width, height), pad_mode="edge")
+    _, makeup_encoder = load_model(device=device)
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+    get_reference_embeds(makeup_encoder, makeup_image)
+
+
+# ------------------------------------------------------------
+# 결과 캐시 (seed 고정 요청 전용)
+# ------------------------------------------------------------
+_RESULT_CACHE = None
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def get_result_cache() -> TieredCache:
+    """seed 고정 결과 캐시 싱글톤 (메모리 LRU + 선택적 디스크 계층)"""
+    global _RESULT_CACHE
+    with _RESULT_CACHE_LOCK:
+        if _RESULT_CACHE is None:
+            s = get_settings()
+            _RESULT_CACHE = TieredCache(
+                "makeup_result",
+                mem_max_bytes=s.MAKEUP_CACHE_MEM_MB * 1024 * 1024,
+                disk_dir=s.MAKEUP_CACHE_DIR if s.MAKEUP_CACHE_DISK else None,
+                ttl_sec=s.MAKEUP_CACHE_TTL_SEC,
+            )
+        return _RESULT_CACHE
+
+
+def result_cache_key(
+    id_image: Image.Image,
+    makeup_image: Image.Image,
+    guidance_scale: float,
+    size: int,
+    num_inference_steps: int,
+    seed: Optional[int],
+    face_crop: bool = False,
+    quality: str = "final",
+    strength: float = 1.0,
+) -> Optional[str]:
+    """
+    (원본 픽셀 해시, 참조 픽셀 해시, 파라미터, seed, 모델 버전) 기반 키.
+    seed가 없으면 결과가 결정적이지 않으므로 None(캐시 미사용).
+    """
+    if seed is None:
+        return None
+    params = _result_params(guidance_scale, size, num_inference_steps, face_crop, quality, strength)
+    params["seed"] = seed
+    return request_fingerprint(id_image, makeup_image, params, get_settings().MAKEUP_MODEL_VERSION)
+
+
+def img2img_strength(strength: float, num_inference_steps: int) -> float:
+    """실제 적용 strength: 디노이즈 step 이 0 이 되지 않도록 1/steps 이상 (1.0 = img2img 미사용)"""
+    if strength >= 1.0:
+        return 1.0
+    return max(strength, 1.0 / max(1, num_inference_steps))
+
+
+def _result_params(guidance_scale, size, num_inference_steps, face_crop, quality, strength) -> dict:
+    params = {"guidance": guidance_scale, "size": size, "steps": num_inference_steps}
+    if face_crop:
+        params["face_crop"] = True
+    if quality != "final":
+        params["quality"] = quality
+    # 키는 실제 적용 strength 기준 (1 step 미만 strength 는 최소값으로 정규화된 결과와 같다)
+    tier_steps = min(num_inference_steps, get_settings().MAKEUP_PREVIEW_STEPS) if quality == "preview" else num_inference_steps
+    strength = img2img_strength(strength, tier_steps)
+    if strength < 1.0:
+        params["strength"] = strength
+    return params
+
+
+def lookup_cached_result(**kwargs) -> Optional[bytes]:
+    """
+    run_inference_encoded와 같은 인자로 캐시된 PNG를 조회 (없으면 None).
+    요청당 유일한 결과 캐시 조회 지점 — 히트면 executor 대기 없이 반환하고, 미스면 run_inference_encoded 로.
+    """
+    key = result_cache_key(
+        kwargs["id_image"], kwargs["makeup_image"], kwargs.get("guidance_scale", 1.6),
+        kwargs.get("size", 512), kwargs.get("num_inference_steps", 30), kwargs.get("seed"),
+        kwargs.get("face_crop", False), kwargs.get("quality", "final"), kwargs.get("strength", 1.0),
+    )
+    return get_result_cache().get(key) if key is not None else None
+
+
+# ------------------------------------------------------------
+# 추측 실행 결과 (seed 미지정 요청에 1회 제공)
+# ------------------------------------------------------------
+_SPECULATIVE_CACHE = None
+
+
+def get_speculative_cache() -> TieredCache:
+    """추측 실행으로 미리 만든 결과 PNG (메모리 전용, TTL)"""
+    global _SPECULATIVE_CACHE
+    with _RESULT_CACHE_LOCK:
+        if _SPECULATIVE_CACHE is None:
+            s = get_settings()
+            _SPECULATIVE_CACHE = TieredCache(
+                "makeup_speculative",
+                mem_max_bytes=s.MAKEUP_SPECULATE_MEM_MB * 1024 * 1024,
+                ttl_sec=s.MAKEUP_SPECULATE_TTL_SEC,
+            )
+        return _SPECULATIVE_CACHE
+
+
+def speculative_key(
+    id_image: Image.Image,
+    makeup_image: Image.Image,
+    guidance_scale: float = 1.6,
+    size: int = 512,
+    num_inference_steps: int = 30,
+    face_crop: bool = False,
+    quality: str = "final",
+    strength: float = 1.0,
+) -> str:
+    params = _result_params(guidance_scale, size, num_inference_steps, face_crop, quality, strength)
+    return request_fingerprint(id_image, makeup_image, params, get_settings().MAKEUP_MODEL_VERSION, "speculative")
+
+
+def speculate_result(
+    id_image: Image.Image,
+    makeup_image: Image.Image,
+    device: str = "cuda",
+    cancel_token: Optional[CancellationToken] = None,
+) -> None:
+    """API 기본 파라미터(seed 미지정) 결과를 미리 생성해 추측 결과 캐시에 저장 (유효한 결과가 있으면 생략)"""
+    cache = get_speculative_cache()
+    key = speculative_key(id_image, makeup_image)
+    # contains 는 TTL 이 지난 항목을 제거하고 False → 만료된 결과는 다시 만든다 (get 과 달리 히트율 통계 미반영)
+    if cache.contains(key):
+        return
+    result_img = run_inference(id_image=id_image, makeup_image=makeup_image, device=device, cancel_token=cancel_token)
+    buf = io.BytesIO()
+    result_img.save(buf, format="PNG")
+    cache.put(key, buf.getvalue())
+
+
+# 요청 병합(single-flight)은 이 계층에서만 한다 (run_inference 는 병합하지 않음 → 입력 해시 1회)
+@single_flight()
+def run_inference_encoded(
+    id_image: Image.Image,
+    makeup_image: Image.Image,
+    guidance_scale: float = 1.6,
+    size: int = 512,
+    num_inference_steps: int = 30,
+    seed: Optional[int] = None,
+    device: str = "cuda",
+    cancel_token: Optional[CancellationToken] = None,
+    face_crop: bool = False,
+    quality: str = "final",
+    strength: float = 1.0,
+) -> bytes:
+    """
+    run_inference + PNG 인코딩. seed가 주어지면 결과를 캐시에 저장하고,
+    seed가 없으면 추측 실행으로 미리 만든 결과가 있을 때 그것을 1회 사용한다.
+    결과 캐시 조회는 호출 측이 executor 제출 전에 lookup_cached_result() 로 한 번만 한다.
+    Returns:
+        bytes: PNG 인코딩된 결과 이미지
+    """
+    key = result_cache_key(id_image, makeup_image, guidance_scale, size, num_inference_steps, seed, face_crop, quality, strength)
+    if key is None and get_settings().MAKEUP_SPECULATE_RESULT:
+        speculated = get_speculative_cache().pop(
+            speculative_key(id_image, makeup_image, guidance_scale, size, num_inference_steps, face_crop, quality, strength)
+        )
+        if speculated is not None:
+            return speculated
+
+    result_img = run_inference(
+        id_image=id_image,
         makeup_image=makeup_image,
-        pipe=pipeline,
         guidance_scale=guidance_scale,
+        size=size,
         num_inference_steps=num_inference_steps,
         seed=seed,
+        device=device,
+        cancel_token=cancel_token,
+        face_crop=face_crop,
+        quality=quality,
+        strength=strength,
     )
+    buf = io.BytesIO()
+    result_img.save(buf, format="PNG")
+    png = buf.getvalue()
 
-    return result_img
+    if key is not None:
+        get_result_cache().put(key, png)
+    return png
 
 
 # ------------------------------------------------------------
@@ -17,6 +17,9 @@ from model_manager.nia_manager import (
     load_regression_models,
     get_device
 )
+from model_manager.registry import holding
+from utils.singleflight import single_flight
+from service.image_service import load_image
 
 def base64_to_image(base64_string):
     """Base64 문자열을 PIL Image로 변환"""
@@ -132,16 +135,18 @@ def convert_to_score(regression_raw):
         "pore_reg": pore_score
     }
 
+@single_flight()
+@holding("nia")
 def run_inference(request: dict) -> dict:
-    """NIA 피부 분석 추론"""
+    """NIA 피부 분석 추론 (동일 요청 동시 처리 시 single-flight 병합)"""
     try:
-        if "image_base64" not in request:
-            raise ValueError("Missing required field: image_base64")
+        if not request.get("image_base64") and not request.get("image_id"):
+            raise ValueError("Missing required field: image_base64 (or image_id)")
 
         # crop_face는 내부적으로만 사용 (기본값 True)
         crop_face = request.get("crop_face", True)
 
-        image = base64_to_image(request["image_base64"])
+        image = load_image(request.get("image_base64"), request.get("image_id"))
         image_tensor = preprocess_image(image, resolution=256, crop_face=crop_face)
 
         regression_models, device = load_regression_models()
@@ -0,0 +1,215 @@
+# service/pipeline_service.py
+"""
+서버 측 전체 파이프라인 (NIA → Feedback/Product, Style → Makeup → Customization)
+- 얼굴 이미지를 한 번만 받아 단계 DAG 를 서버에서 실행한다. (클라이언트 6회 왕복 → 1회)
+  인라인 base64 는 이미지 저장소에 한 번 올린 뒤 모든 단계가 image_id 로 참조한다. (디코딩 1회)
+- 서로 독립인 가지는 동시에 실행된다:
+    nia ──┬─ feedback
+          └─ product            (filtered_products 가 있을 때)
+    style ── makeup ── customization   (edits 가 있을 때)
+- 각 단계는 기존 API 와 같은 executor / 우선순위 클래스로 실행되며, 결과 필드도 단계별 API 응답과 같다.
+- run_pipeline() 은 단계가 끝나는 순서대로 이벤트(dict)를 내보내고, 마지막에 stage="pipeline" 요약을 낸다.
+"""
+import asyncio
+import base64
+import os
+import time
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from config import get_settings
+from schemas import PipelineRequest, ProductRequest
+from service.image_service import load_image, upload_image
+from utils.cancellation import CancellationToken
+from utils.executors import run_model
+from utils.stages import StageTimings
+
+_NIA_KEYS = ("moisture_reg", "elasticity_reg", "wrinkle_reg", "pigmentation_reg", "pore_reg")
+
+
+# ------------------------------------------------------------
+# 단계 구현 (각 API 핸들러와 같은 서비스 호출)
+# ------------------------------------------------------------
+async def _nia(image_id: str) -> dict:
+    from service.nia_service import run_inference
+    result = await run_model("nia", run_inference, {"image_id": image_id})
+    if result.get("status") != "success":
+        return {"status": "error", "message": result.get("message", "NIA 분석 실패")}
+    return {"status": "success", "predictions": result.get("predictions")}
+
+
+async def _feedback(predictions: dict) -> dict:
+    from service.feedback_service import run_inference
+    payload = {"predictions": {k: predictions.get(k) for k in _NIA_KEYS}}
+    result = await run_model("llm", run_inference, payload, endpoint="feedback")
+    if result.get("status") != "success":
+        return {"status": "error", "message": result.get("message", "피드백 생성 실패")}
+    return {"status": "success", "feedback": result.get("feedback")}
+
+
+async def _product(predictions: dict, req: PipelineRequest) -> dict:
+    from service.product_service import run_inference
+    payload = ProductRequest(
+        skin_analysis={k: predictions.get(k) for k in _NIA_KEYS},
+        recommended_categories=req.recommended_categories,
+        filtered_products=req.filtered_products,
+        locale=req.locale,
+    ).model_dump()
+    result = await run_model("llm", run_inference, payload, endpoint="product")
+    if result.get("status") != "success":
+        return {
+            "status": "error",
+            "message": result.get("message", "제품 추천 이유 생성 실패"),
+            "error_code": result.get("error_code", "UNKNOWN_ERROR"),
+        }
+    return {"status": "success", "recommendations": result.get("recommendations", [])}
+
+
+async def _style(image_id: str, keywords) -> dict:
+    from service.style_service import run_inference
+    json_dir = os.path.join("data", "style-recommendation")
+    if not os.path.exists(json_dir):
+        return {"status": "error", "message": "데이터 경로를 찾을 수 없습니다: data/style-recommendation"}
+    result = await run_model("style", run_inference, {"source_image_id": image_id, "keywords": list(keywords)},
+                             json_dir=json_dir)
+    if result.get("status") != "success":
+        return {"status": "error", "message": result.get("message", "스타일 추천 실패")}
+    results = [
+        {"style_id": r.get("style_id", ""), "style_image_base64": r.get("style_image_base64", "")}
+        for r in result.get("results", [])[:3]
+    ]
+    return {"status": "success", "results": results}
+
+
+def _makeup_kwargs(image_id: str, style_image_base64: str, req: PipelineRequest) -> dict:
+    import torch  # 첫 요청 시 import (서버 기동 시간 단축)
+    return dict(
+        id_image=load_image(image_id=image_id),
+        makeup_image=load_image(style_image_base64),
+        seed=req.seed,
+        quality=req.quality,
+        device="cuda" if torch.cuda.is_available() else "cpu",
+    )
+
+
+async def _makeup(image_id: str, style_image_base64: str, req: PipelineRequest, token: CancellationToken) -> dict:
+    from service.makeup_service import run_inference_encoded, lookup_cached_result
+    kwargs = await run_in_threadpool(_makeup_kwargs, image_id, style_image_base64, req)
+    png = await run_in_threadpool(lookup_cached_result, **kwargs)
+    if png is None:
+        png = await run_model("makeup", run_inference_encoded, **kwargs, cancel_token=token)
+    return {"status": "success", "result_image_base64": base64.b64encode(png).decode()}
+
+
+async def _customization(base_image_base64: str, req: PipelineRequest) -> dict:
+    from service.customization_service import run_inference
+    payload = {"base_image_base64": base_image_base64, "edits": [e.model_dump() for e in req.edits]}
+    result = await run_model("custom", run_inference, payload)
+    if result.get("status") != "success":
+        return {"status": "error", "message": result.get("message", "Inference failed")}
+    return {"status": "success", "result_image_base64": result.get("result_image_base64")}
+
+
+# ------------------------------------------------------------
+# DAG 실행
+# ------------------------------------------------------------
+def _skipped(stage: str, message: str) -> dict:
+    return {"stage": stage, "status": "skipped", "message": message}
+
+
+async def run_pipeline(req: PipelineRequest, token: Optional[CancellationToken] = None) -> AsyncIterator[dict]:
+    """
+    단계 DAG 실행. 단계가 끝날 때마다 {"stage", "status", ...단계 응답 필드, "elapsed_ms"} 를 yield 하고,
+    마지막으로 {"stage": "pipeline", "status", "timings"} 를 yield 한다.
+    이터레이터가 도중에 닫히면(클라이언트 이탈) 남은 단계를 취소한다.
+    """
+    if token is None:
+        timeout = get_settings().MAKEUP_REQUEST_TIMEOUT_SEC
+        token = CancellationToken(timeout=timeout if timeout > 0 else None)
+    timings = StageTimings("pipeline")
+    image_id = req.image_id
+    if not image_id:
+        try:
+            image_id = (await run_in_threadpool(upload_image, req.image_base64))["image_id"]
+        except ValueError as e:
+            yield {"stage": "pipeline", "status": "error", "message": str(e)}
+            return
+    events: asyncio.Queue = asyncio.Queue()
+    statuses: Dict[str, str] = {}
+
+    def emit(event: dict) -> None:
+        statuses[event["stage"]] = event["status"]
+        events.put_nowait(event)
+
+    async def stage(name: str, coro) -> dict:
+        t0 = time.perf_counter()
+        try:
+            with timings.stage(name):
+                result = await coro
+        except HTTPException as e:
+            detail = e.detail if isinstance(e.detail, dict) else {"message": str(e.detail)}
+            result = {"status": "error", "message": detail.get("message", str(e.detail))}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result = {"status": "error", "message": f"{name} 처리 중 오류: {e}"}
+        event = {"stage": name, **result, "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1)}
+        emit(event)
+        return event
+
+    async def skin_branch():
+        nia = await stage("nia", _nia(image_id))
+        predictions = nia.get("predictions") if nia["status"] == "success" else None
+        if predictions is None:
+            emit(_skipped("feedback", "NIA 결과가 없습니다."))
+            emit(_skipped("product", "NIA 결과가 없습니다."))
+            return
+        branches = [stage("feedback", _feedback(predictions))]
+        if req.filtered_products:
+            branches.append(stage("product", _product(predictions, req)))
+        else:
+            emit(_skipped("product", "filtered_products가 없습니다."))
+        await asyncio.gather(*branches)
+
+    async def look_branch():
+        style = await stage("style", _style(image_id, req.keywords))
+        if not req.makeup:
+            emit(_skipped("makeup", "makeup=false"))
+            emit(_skipped("customization", "makeup=false"))
+            return
+        if style["status"] != "success" or not style.get("results"):
+            emit(_skipped("makeup", "스타일 추천 결과가 없습니다."))
+            emit(_skipped("customization", "스타일 추천 결과가 없습니다."))
+            return
+        makeup = await stage("makeup", _makeup(image_id, style["results"][0]["style_image_base64"], req, token))
+        if not req.edits:
+            emit(_skipped("customization", "edits가 없습니다."))
+        elif makeup["status"] != "success":
+            emit(_skipped("customization", "메이크업 결과가 없습니다."))
+        else:
+            await stage("customization", _customization(makeup["result_image_base64"], req))
+
+    runner = asyncio.ensure_future(asyncio.gather(skin_branch(), look_branch()))
+    runner.add_done_callback(lambda _: events.put_nowait(None))
+    try:
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            yield event
+        await runner  # 예외 전파
+
+        ran = [s for s in statuses.values() if s != "skipped"]
+        if ran and all(s == "success" for s in ran):
+            status = "success"
+        elif any(s == "success" for s in ran):
+            status = "partial"
+        else:
+            status = "error"
+        yield {"stage": "pipeline", "status": status, "timings": timings.report()}
+    finally:
+        if not runner.done():
+            token.cancel("client_disconnected")
+            runner.cancel()
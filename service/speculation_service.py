@@ -0,0 +1,120 @@
+# service/speculation_service.py
+"""
+추측 실행 (opt-in: MAKEUP_SPECULATE=1)
+- 앱 흐름상 /style/recommend 다음 요청은 거의 항상 Top-1 스타일의 /makeup/simulate 이다.
+- 스타일 추천 직후 서버가 유휴 상태이면 같은 얼굴 + Top-1 스타일로 랜드마크 / 참조 임베딩
+  (MAKEUP_SPECULATE_RESULT=1 이면 결과 이미지까지)을 백그라운드에서 미리 계산한다.
+  모두 이미지 해시 키 캐시에 들어가므로, 이후 일치하는 요청은 그대로 캐시 히트가 된다.
+- makeup executor 의 "speculative" 우선순위 클래스로 실행되며, 스케줄러에 다른 작업이 대기하는 순간
+  취소 토큰이 다음 확인 지점(단계 사이 / 디퓨전 step)에서 중단시킨다.
+"""
+import threading
+from typing import Optional
+
+from config import get_settings
+from utils.cancellation import CancellationToken, InferenceCancelled
+from utils.executors import ExecutorBusy, get_executor
+from utils.scheduler import get_scheduler
+from utils.singleflight import request_fingerprint
+
+
+def _speculative_class() -> str:
+    return get_settings().priority_class("makeup_speculative")
+
+
+class PreemptibleToken(CancellationToken):
+    """추측 실행 외의 작업이 스케줄러에 대기하면 스스로 취소되는 토큰"""
+
+    @property
+    def cancelled(self) -> bool:
+        if super().cancelled:
+            return True
+        if get_scheduler().pending(exclude=(_speculative_class(),)) > 0:
+            self.cancel("preempted")
+            return True
+        return False
+
+
+_LOCK = threading.Lock()
+_INFLIGHT = set()
+_STATS = {"scheduled": 0, "skipped_busy": 0, "skipped_duplicate": 0, "completed": 0, "preempted": 0, "failed": 0}
+
+
+def _bump(field: str) -> None:
+    with _LOCK:
+        _STATS[field] += 1
+
+
+def _idle() -> bool:
+    """대기 작업이 없고 makeup executor 가 비어 있을 때만 추측 실행"""
+    if get_scheduler().pending() > 0:
+        return False
+    stats = get_executor("makeup").stats()
+    return stats["running"] == 0 and stats["queued"] == 0
+
+
+def speculate_after_style(source_image_base64: str, style_image_base64: str,
+                          source_image_id: Optional[str] = None) -> bool:
+    """
+    /style/recommend 성공 직후 호출 (Top-1 스타일 이미지, 얼굴은 base64 또는 업로드 image_id).
+    추측 실행을 등록했으면 True, 비활성 / 부하 중 / 같은 입력이 진행 중이면 False
+    """
+    if not get_settings().MAKEUP_SPECULATE or not (source_image_base64 or source_image_id) or not style_image_base64:
+        return False
+    key = request_fingerprint(source_image_id or source_image_base64, style_image_base64)
+    with _LOCK:
+        if key in _INFLIGHT:
+            _STATS["skipped_duplicate"] += 1
+            return False
+        _INFLIGHT.add(key)
+    if not _idle():
+        with _LOCK:
+            _INFLIGHT.discard(key)
+            _STATS["skipped_busy"] += 1
+        return False
+
+    try:
+        get_executor("makeup").submit(_run, source_image_base64, style_image_base64, source_image_id, key,
+                                      priority=_speculative_class())
+    except ExecutorBusy:
+        with _LOCK:
+            _INFLIGHT.discard(key)
+            _STATS["skipped_busy"] += 1
+        return False
+    _bump("scheduled")
+    return True
+
+
+def _run(source_image_base64: str, style_image_base64: str, source_image_id: Optional[str], key: str) -> None:
+    token = PreemptibleToken()
+    try:
+        import torch
+        from service.image_service import load_image
+        from service.makeup_service import warm_inputs, speculate_result
+
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        token.raise_if_cancelled()
+        id_image = load_image(source_image_base64, source_image_id)
+        makeup_image = load_image(style_image_base64)
+
+        warm_inputs(id_image, makeup_image, device=device, cancel_token=token)
+        if get_settings().MAKEUP_SPECULATE_RESULT:
+            token.raise_if_cancelled()
+            speculate_result(id_image, makeup_image, device=device, cancel_token=token)
+        _bump("completed")
+    except InferenceCancelled:
+        _bump("preempted")
+    except Exception as e:
+        _bump("failed")
+        print(f"⚠️ speculative precompute failed: {e}")
+    finally:
+        with _LOCK:
+            _INFLIGHT.discard(key)
+
+
+def speculation_stats() -> dict:
+    with _LOCK:
+        out = dict(_STATS)
+        out["inflight"] = len(_INFLIGHT)
+    out["enabled"] = get_settings().MAKEUP_SPECULATE
+    return out
@@ -6,6 +6,8 @@ import os
 import unicodedata
 from PIL import Image
 from model_manager.clip_manager import load_clip
+from model_manager.registry import holding
+from service.image_service import load_image
 
 _cached_dataset = None
 _cached_json_dir = None
@@ -40,11 +42,6 @@ def _kor_to_eng_keywords(keywords):
     return eng_keywords
 
 
-def _decode_image(base64_str: str) -> Image.Image:
-    image_bytes = base64.b64decode(base64_str)
-    return Image.open(io.BytesIO(image_bytes)).convert("RGB")
-
-
 def _encode_image(image: Image.Image) -> str:
     buffered = io.BytesIO()
     image.save(buffered, format="JPEG")
@@ -115,6 +112,7 @@ def get_dataset(json_dir: str):
     return _cached_dataset
 
 
+@holding("style")
 def run_inference(request: dict, json_dir: str) -> dict:
     """
     CLIP 원리 기반 스타일 추천 (이미지 ↔ 텍스트 유사도)
@@ -124,8 +122,8 @@ def run_inference(request: dict, json_dir: str) -> dict:
     }
     """
     try:
-        if "source_image_base64" not in request:
-            raise ValueError("Missing key: source_image_base64")
+        if not request.get("source_image_base64") and not request.get("source_image_id"):
+            raise ValueError("Missing key: source_image_base64 (or source_image_id)")
         if "keywords" not in request or not isinstance(request["keywords"], list):
             raise ValueError("Missing or invalid key: keywords")
 
@@ -137,7 +135,7 @@ def run_inference(request: dict, json_dir: str) -> dict:
         model, processor, device = load_clip()
 
         # 3️⃣ 사용자 이미지 임베딩
-        user_image = _decode_image(request["source_image_base64"])
+        user_image = load_image(request.get("source_image_base64"), request.get("source_image_id"))
         image_inputs = processor(images=user_image, return_tensors="pt").to(device)
         with torch.no_grad():
             image_features = model.get_image_features(**image_inputs)
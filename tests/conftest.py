@@ -0,0 +1,8 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가 (python -m pytest / pytest 어느 쪽으로 실행해도 동일)
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
@@ -0,0 +1,40 @@
+# tests/test_compile_routing.py
+"""컴파일 모드 형상 버킷 라우팅 (MAKEUP_COMPILE / MAKEUP_CPU_COMPILE) 검증"""
+import pytest
+
+from config import get_settings
+from model_manager.compile_manager import compile_enabled, route_size
+
+
+@pytest.fixture
+def flags(monkeypatch):
+    s = get_settings()
+    monkeypatch.setattr(s, "MAKEUP_COMPILE_SIZES", [384, 512])
+
+    def set_flags(compile=False, cpu_compile=False):
+        monkeypatch.setattr(s, "MAKEUP_COMPILE", compile)
+        monkeypatch.setattr(s, "MAKEUP_CPU_COMPILE", cpu_compile)
+    return set_flags
+
+
+def test_cpu_flag_alone_routes_cpu_sizes_to_buckets(flags):
+    flags(cpu_compile=True)
+    assert compile_enabled("cpu")
+    assert route_size(300, "cpu") == 384
+    assert route_size(448, "cpu") == 512
+    assert route_size(1024, "cpu") == 512  # 가장 큰 버킷
+    # cuda 프로파일은 MAKEUP_CPU_COMPILE 로 컴파일하지 않는다
+    assert not compile_enabled("cuda")
+    assert route_size(300, "cuda") == 300
+
+
+def test_compile_flag_routes_every_device(flags):
+    flags(compile=True)
+    assert route_size(300, "cuda") == 384
+    assert route_size(300, "cpu") == 384
+
+
+def test_no_compile_keeps_size(flags):
+    flags()
+    assert route_size(300, "cpu") == 300
+    assert route_size(300, "cuda:0") == 300
@@ -0,0 +1,119 @@
+# tests/test_image_service.py
+"""콘텐츠 주소 이미지 저장소: image_id / 디코딩 캐시 / 읽기 전용 공유 / 오류 검증"""
+import base64
+import hashlib
+import io
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import service.image_service as image_service
+from config import get_settings
+from service.image_service import ImageNotFound, ImageStore, load_image, upload_image
+from utils.base64_utils import Base64Error
+
+
+def _png(color=(10, 20, 30), size=(8, 6)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """모듈 싱글톤을 테스트마다 새 저장소로 교체"""
+    fresh = ImageStore()
+    monkeypatch.setattr(image_service, "_STORE", fresh)
+    return fresh
+
+
+def test_upload_is_content_addressed(store):
+    data = _png()
+    first = upload_image(_b64(data))
+    assert first == {"image_id": hashlib.sha256(data).hexdigest(), "width": 8, "height": 6, "bytes": len(data)}
+    # data URL / 줄바꿈이 섞여도 같은 바이트면 같은 id
+    second = upload_image("data:image/png;base64," + "\n".join(_b64(data)[i:i + 16] for i in range(0, len(_b64(data)), 16)))
+    assert second["image_id"] == first["image_id"]
+    assert store.bytes.stats()["entries_mem"] == 1
+
+
+def test_load_by_id_shares_one_read_only_array(store):
+    image_id = upload_image(_b64(_png((1, 2, 3))))["image_id"]
+    arr = store.array(image_id)
+    assert arr is store.array(image_id)
+    assert not arr.flags.writeable
+    img = load_image(image_id=image_id)
+    assert img.mode == "RGB" and img.getpixel((0, 0)) == (1, 2, 3)
+    # 반환된 PIL 이미지를 수정해도 공유 배열은 그대로
+    img.putpixel((0, 0), (255, 255, 255))
+    assert tuple(store.array(image_id)[0, 0]) == (1, 2, 3)
+
+
+def test_redecodes_from_bytes_after_decoded_eviction(store):
+    image_id = upload_image(_b64(_png((4, 5, 6))))["image_id"]
+    store._decoded.clear()
+    store._decoded_bytes = 0
+    assert tuple(store.array(image_id)[0, 0]) == (4, 5, 6)
+
+
+def test_decoded_cache_is_byte_bounded(store):
+    one = 8 * 6 * 3
+    store.decoded_max_bytes = one * 2
+    ids = [upload_image(_b64(_png((i, 0, 0))))["image_id"] for i in range(3)]
+    stats = store.stats()
+    assert stats["decoded_entries"] == 2 and stats["decoded_bytes"] == one * 2
+    assert ids[0] not in store._decoded  # LRU 제거
+
+
+def test_inline_base64_uses_decoded_cache_without_storing_bytes(store):
+    data = _png((7, 8, 9))
+    a = load_image(_b64(data))
+    b = load_image(_b64(data))
+    assert np.array_equal(np.asarray(a), np.asarray(b))
+    assert store.stats()["decoded_entries"] == 1
+    assert store.bytes.stats()["entries_mem"] == 0
+
+
+def test_image_id_takes_precedence_over_inline(store):
+    image_id = upload_image(_b64(_png((1, 1, 1))))["image_id"]
+    img = load_image(_b64(_png((2, 2, 2))), image_id=image_id)
+    assert img.getpixel((0, 0)) == (1, 1, 1)
+
+
+def test_unknown_id_raises_404(store):
+    with pytest.raises(ImageNotFound) as exc:
+        load_image(image_id="0" * 64)
+    assert exc.value.status == 404 and exc.value.code == "IMAGE_NOT_FOUND"
+
+
+def test_invalid_inputs(store):
+    with pytest.raises(Base64Error):
+        upload_image("not base64 !!")
+    with pytest.raises(Base64Error):
+        upload_image(_b64(b"not an image"))
+    assert store.bytes.stats()["entries_mem"] == 0  # 이미지가 아니면 저장하지 않는다
+    with pytest.raises(ValueError):
+        load_image()
+
+
+def test_upload_size_limit(store, monkeypatch):
+    monkeypatch.setattr(get_settings(), "IMAGE_UPLOAD_MAX_MB", 0)
+    with pytest.raises(ValueError):
+        upload_image(_b64(_png()))
+
+
+def test_reupload_after_ttl_refreshes_bytes(store):
+    store.bytes.ttl_sec = 0.05
+    data = _b64(_png((3, 3, 3)))
+    image_id = upload_image(data)["image_id"]
+    time.sleep(0.1)  # 바이트 TTL 경과 (디코딩 캐시에는 남아 있음)
+    assert upload_image(data)["image_id"] == image_id
+    store._decoded.clear()
+    store._decoded_bytes = 0
+    assert load_image(image_id=image_id).getpixel((0, 0)) == (3, 3, 3)
@@ -0,0 +1,140 @@
+# tests/test_job_service.py
+"""비동기 Job 큐 상태 전이 / 취소 / 대기열 상한 / TTL / 저장소 검증"""
+import threading
+import time
+
+import pytest
+
+from service.job_service import (
+    CANCELLED, FAILED, QUEUED, SUCCEEDED, FileJobStore, JobManager, JobQueueFull, MemoryJobStore,
+)
+from utils.cancellation import InferenceCancelled
+
+
+def _wait_status(manager, job_id, statuses, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job is not None and job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not reach {statuses}: {manager.get(job_id)}")
+
+
+def _blocker(manager):
+    """워커 1개를 점유하는 job 등록 → (해제 이벤트, job)"""
+    started, release = threading.Event(), threading.Event()
+
+    def _run(token):
+        started.set()
+        release.wait(5)
+        return {"status": "success"}
+
+    job = manager.submit("makeup", _run)
+    assert started.wait(5)
+    return release, job
+
+
+@pytest.fixture(params=["memory", "file"])
+def store(request, tmp_path):
+    return MemoryJobStore() if request.param == "memory" else FileJobStore(tmp_path / "jobs")
+
+
+def test_job_succeeds(store):
+    manager = JobManager(store, max_queue=4, workers=1, ttl_sec=60)
+    job = manager.submit("makeup", lambda token: {"status": "success", "value": 1})
+    assert job["status"] == QUEUED
+    done = _wait_status(manager, job["job_id"], (SUCCEEDED,))
+    assert done["result"] == {"status": "success", "value": 1}
+    assert done["started_at"] is not None and done["finished_at"] >= done["started_at"]
+
+
+def test_failed_result_and_exception(store):
+    manager = JobManager(store, max_queue=4, workers=1, ttl_sec=60)
+    failed = manager.submit("makeup", lambda token: {"status": "error", "message": "bad input"})
+
+    def _raise(token):
+        raise RuntimeError("boom")
+
+    crashed = manager.submit("makeup", _raise)
+    assert _wait_status(manager, failed["job_id"], (FAILED,))["message"] == "bad input"
+    assert _wait_status(manager, crashed["job_id"], (FAILED,))["message"] == "boom"
+
+
+def test_cancel_queued_job_never_runs(store):
+    manager = JobManager(store, max_queue=4, workers=1, ttl_sec=60)
+    release, blocker = _blocker(manager)
+    ran = []
+    queued = manager.submit("makeup", lambda token: ran.append(1) or {"status": "success"})
+    assert manager.cancel(queued["job_id"])["status"] == CANCELLED
+    release.set()
+    _wait_status(manager, blocker["job_id"], (SUCCEEDED,))
+    time.sleep(0.05)
+    assert ran == []
+    assert manager.get(queued["job_id"])["status"] == CANCELLED
+
+
+def test_cancel_running_job_via_token(store):
+    manager = JobManager(store, max_queue=4, workers=1, ttl_sec=60)
+    started = threading.Event()
+
+    def _run(token):
+        started.set()
+        while True:
+            token.raise_if_cancelled()
+            time.sleep(0.01)
+
+    job = manager.submit("makeup", _run)
+    assert started.wait(5)
+    manager.cancel(job["job_id"])
+    assert _wait_status(manager, job["job_id"], (CANCELLED,))["status"] == CANCELLED
+
+
+def test_cancel_finished_job_is_noop(store):
+    manager = JobManager(store, max_queue=4, workers=1, ttl_sec=60)
+    job = manager.submit("makeup", lambda token: {"status": "success"})
+    _wait_status(manager, job["job_id"], (SUCCEEDED,))
+    assert manager.cancel(job["job_id"])["status"] == SUCCEEDED
+    assert manager.cancel("missing") is None
+
+
+def test_queue_full_rejects_and_forgets_job(store):
+    manager = JobManager(store, max_queue=1, workers=1, ttl_sec=60)
+    release, _ = _blocker(manager)
+    manager.submit("makeup", lambda token: {"status": "success"})
+    with pytest.raises(JobQueueFull):
+        manager.submit("makeup", lambda token: {"status": "success"})
+    release.set()
+    assert len(store.ids()) == 2  # 거절된 job 은 저장소에 남지 않는다
+
+
+def test_finished_jobs_expire(store):
+    manager = JobManager(store, max_queue=4, workers=1, ttl_sec=0.05)
+    job = manager.submit("makeup", lambda token: {"status": "success"})
+    _wait_status(manager, job["job_id"], (SUCCEEDED,))
+    time.sleep(0.1)
+    assert manager.get(job["job_id"]) is None
+    assert job["job_id"] not in store.ids()
+
+
+def test_cancelled_exception_maps_to_cancelled(store):
+    manager = JobManager(store, max_queue=4, workers=1, ttl_sec=60)
+
+    def _run(token):
+        raise InferenceCancelled("요청이 중단되었습니다: expired", reason="expired")
+
+    job = manager.submit("makeup", _run)
+    assert _wait_status(manager, job["job_id"], (CANCELLED,))["message"].endswith("expired")
+
+
+def test_restart_fails_unfinished_file_jobs(tmp_path):
+    store = FileJobStore(tmp_path / "jobs")
+    now = time.time()
+    for job_id, status in (("queued1", QUEUED), ("running1", "running"), ("done1", SUCCEEDED)):
+        store.put({"job_id": job_id, "kind": "makeup", "status": status, "created_at": now, "started_at": None,
+                   "finished_at": None, "expires_at": now + 60, "result": None, "message": None})
+    manager = JobManager(store, max_queue=4, workers=1, ttl_sec=60)
+    assert manager.get("queued1")["status"] == FAILED
+    assert manager.get("running1")["status"] == FAILED
+    assert manager.get("running1")["expires_at"] > now
+    assert manager.get("done1")["status"] == SUCCEEDED
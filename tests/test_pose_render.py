@@ -0,0 +1,48 @@
+# tests/test_pose_render.py
+"""OpenCV 포즈 렌더러 ↔ 기존 matplotlib 렌더러 픽셀 차이 검증"""
+import numpy as np
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from benchmarks.bench_pose_render import pixel_diff, synthetic_landmarks
+from libs.pose_render import POSE_PARTS, render_pose_matplotlib
+from libs.spiga_draw import conditioning_from_landmarks
+
+MAX_MEAN_ABS = 2.0        # 0~255
+MAX_TOLERANT_RATIO = 0.03  # 1px 이동 허용 후에도 크게 다른 픽셀 비율 (그려진 영역 기준)
+
+
+def _faces(size):
+    return [
+        synthetic_landmarks(size),
+        synthetic_landmarks(size, cx=size * 0.3, cy=size * 0.35, scale=size * 0.12),
+    ]
+
+
+@pytest.mark.parametrize("size", [256, 512])
+@pytest.mark.parametrize("n_faces", [1, 2])
+def test_matches_matplotlib(size, n_faces):
+    landmarks = _faces(size)[:n_faces]
+    new = conditioning_from_landmarks(landmarks, size=size)
+    old = render_pose_matplotlib(landmarks, size=size)
+    assert new.size == old.size == (size, size)
+
+    d = pixel_diff(new, old)
+    assert d["mean_abs"] <= MAX_MEAN_ABS, d
+    assert d["tolerant_ratio"] <= MAX_TOLERANT_RATIO, d
+
+
+def test_part_colors_present():
+    """부위별 색(POSE_PARTS)이 두 렌더러 출력 모두에 그대로 나타난다"""
+    landmarks = _faces(512)[:1]
+    for img in (conditioning_from_landmarks(landmarks, size=512), render_pose_matplotlib(landmarks, size=512)):
+        colors = {tuple(c) for c in np.asarray(img).reshape(-1, 3).tolist()}
+        for _, color, _ in POSE_PARTS:
+            assert color in colors
+
+
+def test_empty_landmarks_render_black():
+    img = np.asarray(conditioning_from_landmarks([], size=(96, 64)))
+    assert img.shape == (64, 96, 3)
+    assert not img.any()
@@ -0,0 +1,130 @@
+# tests/test_registry.py
+"""모델 레지스트리 1회 로드 / 참조 카운트 / 예산 기반 LRU 축출 검증"""
+import threading
+import time
+
+import pytest
+
+from model_manager.registry import ModelRegistry, estimate_bytes
+
+MB = 2**20
+
+
+class FakeTensor:
+    """estimate_bytes 가 numel × element_size 로 크기를 세는 객체"""
+
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+    def numel(self):
+        return self.nbytes
+
+    def element_size(self):
+        return 1
+
+
+def _registry(budget_mb=0, **models):
+    """models: key → MB. 로더 호출 횟수와 언로드된 키를 함께 반환"""
+    registry = ModelRegistry(budget_bytes=budget_mb * MB)
+    loads, unloaded = {k: 0 for k in models}, []
+
+    def loader(key, size):
+        def load():
+            loads[key] += 1
+            return {"weights": FakeTensor(size * MB)}
+        return load
+
+    for key, size in models.items():
+        registry.register(key, loader(key, size), on_unload=lambda value, key=key: unloaded.append(key))
+    return registry, loads, unloaded
+
+
+def test_estimate_bytes_walks_containers_once():
+    t = FakeTensor(10)
+    assert estimate_bytes({"a": t, "b": [t, FakeTensor(5)], "c": "text"}) == 15
+
+
+def test_get_loads_once_under_concurrency():
+    registry = ModelRegistry()
+    calls = []
+
+    def slow_load():
+        calls.append(1)
+        time.sleep(0.1)
+        return object()
+
+    registry.register("nia", slow_load)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("nia"))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert len(calls) == 1
+    assert len({id(r) for r in results}) == 1
+    assert registry.is_loaded("nia")
+
+
+def test_unregistered_key_raises():
+    with pytest.raises(KeyError):
+        ModelRegistry().get("missing")
+
+
+def test_unload_respects_refs():
+    registry, loads, unloaded = _registry(nia=1)
+    with registry.hold("nia"):
+        assert registry.unload("nia") is False
+        assert registry.stats()["models"]["nia"]["refs"] == 1
+    assert registry.unload("nia") is True
+    assert unloaded == ["nia"]
+    assert not registry.is_loaded("nia")
+    registry.get("nia")
+    assert loads["nia"] == 2
+
+
+def test_force_unload_while_held():
+    registry, _, unloaded = _registry(nia=1)
+    with registry.hold("nia"):
+        assert registry.unload("nia", force=True) is True
+    assert unloaded == ["nia"]
+
+
+def test_budget_evicts_least_recently_used_idle_model():
+    registry, _, unloaded = _registry(budget_mb=25, a=10, b=10, c=10)
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")  # b 가 LRU
+    registry.get("c")  # 30 > 25 → b 축출
+    assert unloaded == ["b"]
+    stats = registry.stats()
+    assert stats["evictions"] == 1
+    assert stats["resident_mb"] == 20.0
+
+
+def test_held_model_is_not_evicted():
+    registry, _, unloaded = _registry(budget_mb=15, a=10, b=10)
+    with registry.hold("a"):
+        registry.get("b")  # a 는 사용 중 → 축출 불가, 예산 초과 상태 유지
+        assert unloaded == []
+        assert registry.stats()["resident_mb"] == 20.0
+    registry.get("a")
+    assert unloaded == []
+
+
+def test_reload_makes_room_using_previous_size():
+    registry, _, unloaded = _registry(budget_mb=25, a=10, b=10, c=10)
+    registry.get("a")
+    registry.get("b")
+    registry.unload("a")
+    registry.get("c")
+    unloaded.clear()
+    registry.get("a")  # 이전 크기(10MB)만큼 미리 비운다 → LRU(b) 축출
+    assert unloaded == ["b"]
+
+
+def test_unlimited_budget_never_evicts():
+    registry, _, unloaded = _registry(a=100, b=100)
+    registry.get("a")
+    registry.get("b")
+    assert unloaded == []
+    assert registry.stats()["budget_mb"] is None
@@ -0,0 +1,128 @@
+# tests/test_scheduler.py
+"""우선순위 스케줄러(WFQ + SLO) 배차 순서 / 패밀리 상한 검증"""
+import threading
+import time
+
+from utils.scheduler import PriorityClass, Scheduler
+
+
+def _scheduler(compute_slots=1, **classes):
+    classes = classes or {"interactive": (4.0, 60.0), "standard": (2.0, 60.0), "batch": (1.0, 60.0)}
+    return Scheduler({name: PriorityClass(name, w, slo) for name, (w, slo) in classes.items()}, compute_slots)
+
+
+def _block(scheduler, family):
+    """family 슬롯을 점유하는 작업을 넣고 (해제 이벤트, Future) 반환"""
+    started, release = threading.Event(), threading.Event()
+
+    def _hold():
+        started.set()
+        release.wait(5)
+
+    future = scheduler.submit(family, "standard", _hold)
+    assert started.wait(5)
+    return release, future
+
+
+def _run_order(scheduler, family, submissions):
+    """슬롯을 막아 둔 상태에서 submissions[(class, label)] 을 넣고 실제 실행 순서 반환"""
+    release, blocker = _block(scheduler, family)
+    order, lock = [], threading.Lock()
+
+    def _task(label):
+        def run():
+            with lock:
+                order.append(label)
+        return run
+
+    futures = [scheduler.submit(family, klass, _task(label)) for klass, label in submissions]
+    release.set()
+    blocker.result(5)
+    for f in futures:
+        f.result(5)
+    return order
+
+
+def test_submit_returns_result_and_exception():
+    s = _scheduler()
+    s.register_family("nia", 1)
+    assert s.submit("nia", "standard", lambda: 42).result(5) == 42
+
+    def _fail():
+        raise ValueError("boom")
+
+    err = s.submit("nia", "standard", _fail).exception(5)
+    assert isinstance(err, ValueError)
+
+
+def test_weighted_fair_order():
+    s = _scheduler()
+    s.register_family("makeup", 1)
+    order = _run_order(s, "makeup", [("batch", "b1"), ("batch", "b2"), ("interactive", "i1"), ("interactive", "i2")])
+    # 가중치 4:1 → interactive 두 건(vfinish 0.25, 0.5)이 batch 첫 건(1.0)보다 먼저
+    assert order == ["i1", "i2", "b1", "b2"]
+
+
+def test_fifo_within_class():
+    s = _scheduler()
+    s.register_family("makeup", 1)
+    order = _run_order(s, "makeup", [("standard", str(i)) for i in range(5)])
+    assert order == ["0", "1", "2", "3", "4"]
+
+
+def test_overdue_task_jumps_ahead():
+    s = _scheduler(interactive=(100.0, 60.0), batch=(1.0, 0.0), standard=(1.0, 60.0))
+    s.register_family("makeup", 1)
+    release, blocker = _block(s, "makeup")
+    order = []
+    late = s.submit("makeup", "batch", lambda: order.append("batch"))
+    time.sleep(0.05)  # batch SLO(0초) 초과
+    early = s.submit("makeup", "interactive", lambda: order.append("interactive"))
+    release.set()
+    for f in (blocker, late, early):
+        f.result(5)
+    assert order == ["batch", "interactive"]
+    assert s.stats()["classes"]["batch"]["slo_violations"] == 1
+
+
+def test_family_limit_and_compute_slots():
+    s = _scheduler(compute_slots=1)
+    s.register_family("nia", 2)
+    s.register_family("llm", 2, compute=False)
+    running, peak, lock = {"nia": 0, "llm": 0}, {"nia": 0, "llm": 0}, threading.Lock()
+
+    def _task(family):
+        def run():
+            with lock:
+                running[family] += 1
+                peak[family] = max(peak[family], running[family])
+            time.sleep(0.05)
+            with lock:
+                running[family] -= 1
+        return run
+
+    futures = [s.submit(f, "standard", _task(f)) for f in ("nia", "llm") for _ in range(4)]
+    for f in futures:
+        f.result(5)
+    assert peak["nia"] == 1  # compute 슬롯 1개에 막힌다
+    assert peak["llm"] == 2  # I/O 패밀리는 compute 슬롯과 무관, 패밀리 상한까지
+
+
+def test_pending_excludes_classes():
+    s = _scheduler()
+    s.register_family("makeup", 1)
+    release, blocker = _block(s, "makeup")
+    futures = [s.submit("makeup", "batch", lambda: None), s.submit("makeup", "standard", lambda: None)]
+    assert s.pending() == 2
+    assert s.pending(exclude=("batch",)) == 1
+    release.set()
+    for f in [blocker] + futures:
+        f.result(5)
+    assert s.pending() == 0
+
+
+def test_unknown_class_falls_back_to_standard():
+    s = _scheduler()
+    s.register_family("nia", 1)
+    assert s.submit("nia", "no-such-class", lambda: "ok").result(5) == "ok"
+    assert s.stats()["classes"]["standard"]["dispatched"] == 1
@@ -0,0 +1,202 @@
+# tests/test_singleflight.py
+"""single-flight 요청 병합 / 요청 지문 / executor 계층 병합 검증"""
+import threading
+import time
+import uuid
+
+import pytest
+from PIL import Image
+
+from utils.cancellation import CancellationToken, InferenceCancelled
+from utils.executors import ModelExecutor
+from utils.singleflight import request_fingerprint, single_flight
+
+
+def _concurrently(fn, n):
+    results, errors = [None] * n, [None] * n
+
+    def run(i):
+        try:
+            results[i] = fn()
+        except BaseException as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return results, errors
+
+
+def test_fingerprint_normalizes_base64_and_ignores_dict_order():
+    b64 = "A" * 300
+    assert request_fingerprint({"img": b64, "k": 1}) == request_fingerprint({"k": 1, "img": "data:image/png;base64," + b64})
+    assert request_fingerprint({"k": 1}) == request_fingerprint({"k": 1.0})
+    assert request_fingerprint({"k": 1}) != request_fingerprint({"k": 2})
+
+
+def test_fingerprint_hashes_image_pixels():
+    a = Image.new("RGB", (4, 4), (1, 2, 3))
+    b = Image.new("RGB", (4, 4), (1, 2, 4))
+    assert request_fingerprint(a) == request_fingerprint(a.copy())
+    assert request_fingerprint(a) != request_fingerprint(b)
+
+
+def test_concurrent_duplicates_run_once():
+    calls = []
+
+    @single_flight()
+    def work(x):
+        calls.append(x)
+        time.sleep(0.2)
+        return {"x": x}
+
+    results, errors = _concurrently(lambda: work(1), 5)
+    assert errors == [None] * 5
+    assert calls == [1]
+    assert all(r == {"x": 1} for r in results)
+    # 결과는 호출자마다 얕은 복사본
+    assert len({id(r) for r in results}) == 5
+    assert work.inflight_count() == 0
+
+
+def test_different_keys_and_excluded_kwargs():
+    calls = []
+
+    @single_flight()
+    def work(x, cancel_token=None):
+        calls.append(x)
+        time.sleep(0.1)
+        return x
+
+    # cancel_token 은 키에서 제외 → 같은 키
+    assert work.flight_key(1, cancel_token=CancellationToken()) == work.flight_key(1, cancel_token=CancellationToken())
+    _concurrently(lambda: work(1), 2)
+    _concurrently(lambda: work(2), 1)
+    assert sorted(calls) == [1, 2]
+
+
+def test_leader_error_propagates_to_followers():
+    @single_flight()
+    def work():
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    _, errors = _concurrently(work, 3)
+    assert all(isinstance(e, ValueError) for e in errors)
+
+
+def test_follower_reruns_when_leader_cancelled():
+    calls = []
+    leader_token = CancellationToken()
+
+    @single_flight()
+    def work(cancel_token=None):
+        calls.append(cancel_token)
+        time.sleep(0.1)
+        cancel_token.raise_if_cancelled()
+        return "done"
+
+    leader = threading.Thread(target=lambda: pytest.raises(InferenceCancelled, work, cancel_token=leader_token))
+    leader.start()
+    time.sleep(0.02)
+    leader_token.cancel("client_disconnected")
+    assert work(cancel_token=CancellationToken()) == "done"
+    leader.join(5)
+    assert len(calls) == 2
+
+
+def test_call_with_key_reuses_precomputed_key():
+    hashed = []
+
+    def key_fn(x):
+        hashed.append(x)
+        return str(x)
+
+    @single_flight(key_fn=key_fn)
+    def work(x):
+        return x * 2
+
+    key = work.flight_key(3)
+    assert work.call_with_key(key, 3) == 6
+    assert hashed == [3]  # call_with_key 는 키를 다시 계산하지 않는다
+
+
+def test_executor_coalesces_before_taking_a_slot():
+    calls = []
+    release = threading.Event()
+
+    @single_flight()
+    def work(x):
+        calls.append(x)
+        release.wait(5)
+        return [x]
+
+    ex = ModelExecutor(f"test-sf-{uuid.uuid4().hex[:8]}", concurrency=1, max_queue=0, compute=False)
+    leader = ex.submit(work, 1)
+    follower = ex.submit(work, 1)  # 대기열 0 이지만 진행 중 Future 에 붙으므로 ExecutorBusy 아님
+    release.set()
+    assert leader.result(5) == [1]
+    assert follower.result(5) == [1]
+    assert calls == [1]
+    assert ex.stats()["rejected"] == 0
+
+
+class _SlowAdmission:
+    """admission 획득을 늦춰 leader 확인 ~ 예약 사이 경쟁 구간을 넓힌다"""
+
+    def __init__(self, sem):
+        self._sem = sem
+
+    def acquire(self, blocking=True):
+        time.sleep(0.02)
+        return self._sem.acquire(blocking=blocking)
+
+    def release(self):
+        self._sem.release()
+
+
+def test_executor_concurrent_identical_submits_run_once():
+    ex = ModelExecutor(f"test-sf-{uuid.uuid4().hex[:8]}", concurrency=4, max_queue=16, compute=False)
+    ex._admission = _SlowAdmission(ex._admission)
+    for round_ in range(5):
+        calls = []
+        completed = ex.stats()["completed"]
+        n = 8
+        barrier = threading.Barrier(n)
+
+        @single_flight()
+        def work(x):
+            calls.append(x)
+            time.sleep(0.01)
+            return x
+
+        def submit():
+            barrier.wait(5)
+            return ex.submit(work, round_).result(5)
+
+        results, errors = _concurrently(submit, n)
+        assert errors == [None] * n
+        assert results == [round_] * n
+        assert calls == [round_]
+        # 같은 요청은 executor 슬롯도 하나만 쓴다 (follower 가 wrapper 안에서 기다리며 슬롯을 잡지 않음)
+        assert ex.stats()["completed"] - completed == 1, f"round {round_}"
+
+
+def test_executor_busy_releases_reservation():
+    from utils.executors import ExecutorBusy
+    release = threading.Event()
+
+    @single_flight()
+    def work(x):
+        release.wait(5)
+        return x
+
+    ex = ModelExecutor(f"test-sf-{uuid.uuid4().hex[:8]}", concurrency=1, max_queue=0, compute=False)
+    running = ex.submit(work, 1)
+    with pytest.raises(ExecutorBusy):
+        ex.submit(work, 2)
+    release.set()
+    assert running.result(5) == 1
+    assert ex.submit(work, 2).result(5) == 2  # 거절된 키가 예약으로 남지 않는다
@@ -0,0 +1,112 @@
+# tests/test_tiered_cache.py
+"""2단 캐시(메모리 LRU + 디스크) 용량 / TTL / 통계 검증"""
+import os
+import time
+
+from utils.tiered_cache import TieredCache
+
+
+def _expire_mem(cache, key, age):
+    value, stored_at = cache._mem[key]
+    cache._mem[key] = (value, stored_at - age)
+
+
+def _expire_disk(cache, key, age):
+    path = cache._disk_path(key)
+    mtime = path.stat().st_mtime - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_memory_lru_eviction_by_bytes():
+    cache = TieredCache("test-lru", mem_max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"  # a 가 최근 사용
+    cache.put("c", b"1234")          # 12 > 10 → LRU(b) 제거
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.get("c") == b"1234"
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes_mem"] == 8
+
+
+def test_value_larger_than_memory_is_not_kept():
+    cache = TieredCache("test-big", mem_max_bytes=4)
+    cache.put("a", b"12345")
+    assert cache.get("a") is None
+    assert cache.stats()["bytes_mem"] == 0
+
+
+def test_memory_ttl():
+    cache = TieredCache("test-ttl", mem_max_bytes=100, ttl_sec=60)
+    cache.put("a", b"x")
+    assert cache.get("a") == b"x"
+    _expire_mem(cache, "a", 61)
+    assert cache.get("a") is None
+    assert cache.stats()["entries_mem"] == 0
+
+
+def test_disk_tier_survives_memory_clear_and_promotes(tmp_path):
+    cache = TieredCache("test-disk", mem_max_bytes=100, disk_dir=tmp_path)
+    cache.put("a", b"png")
+    cache.clear()
+    assert cache.contains("a")
+    assert cache.get("a") == b"png"
+    assert cache.get("a") == b"png"
+    stats = cache.stats()
+    assert (stats["hits_disk"], stats["hits_mem"]) == (1, 1)
+
+
+def test_disk_ttl_and_evict_expired(tmp_path):
+    cache = TieredCache("test-disk-ttl", mem_max_bytes=100, disk_dir=tmp_path, ttl_sec=60)
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    cache.clear()
+    _expire_disk(cache, "a", 61)
+    assert cache.get("a") is None
+    assert not cache._disk_path("a").exists()
+    _expire_disk(cache, "b", 61)
+    assert cache.evict_expired() == 1
+    assert not cache.contains("b")
+
+
+def test_pop_removes_from_both_tiers(tmp_path):
+    cache = TieredCache("test-pop", mem_max_bytes=100, disk_dir=tmp_path)
+    cache.put("a", b"once")
+    assert cache.pop("a") == b"once"
+    assert cache.pop("a") is None
+    assert not cache.contains("a")
+
+
+def test_hit_ratio_counts_each_lookup_once():
+    cache = TieredCache("test-ratio", mem_max_bytes=100)
+    assert cache.get("a") is None
+    cache.put("a", b"x")
+    assert cache.get("a") == b"x"
+    stats = cache.stats()
+    assert (stats["misses"], stats["hits_mem"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+
+def test_ttl_zero_never_expires():
+    cache = TieredCache("test-no-ttl", mem_max_bytes=100, ttl_sec=0)
+    cache.put("a", b"x")
+    _expire_mem(cache, "a", time.time())
+    assert cache.get("a") == b"x"
+
+
+def test_contains_applies_ttl_in_both_tiers(tmp_path):
+    cache = TieredCache("test-contains-ttl", mem_max_bytes=100, disk_dir=tmp_path, ttl_sec=60)
+    cache.put("mem", b"1")
+    _expire_mem(cache, "mem", 61)
+    _expire_disk(cache, "mem", 61)
+    assert not cache.contains("mem")
+    assert cache.stats()["entries_mem"] == 0
+
+    cache.put("disk", b"2")
+    cache.clear()  # 디스크에만 남은 항목
+    assert cache.contains("disk")
+    _expire_disk(cache, "disk", 61)
+    assert not cache.contains("disk")
+    assert not cache._disk_path("disk").exists()
+    assert cache.get("disk") is None
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+요청 취소 토큰
+- API 레이어에서 클라이언트 연결 끊김/타임아웃을 감지하면 cancel()을 호출하고,
+  추론 루프(디퓨전 step 콜백 등)는 raise_if_cancelled()로 즉시 중단한다.
+"""
+import threading
+import time
+from typing import Optional
+
+from utils.errors import AppError
+
+
+class InferenceCancelled(AppError):
+    """클라이언트 이탈/만료로 추론이 중단된 경우"""
+
+    def __init__(self, message: str = "요청이 취소되었습니다.", reason: str = "cancelled"):
+        super().__init__(message, code="REQUEST_CANCELLED", status=499)
+        self.reason = reason
+
+
+class CancellationToken:
+    """스레드 간에 공유되는 취소 플래그 (+ 선택적 만료 시각)"""
+
+    def __init__(self, timeout: Optional[float] = None):
+        self._event = threading.Event()
+        self._reason: Optional[str] = None
+        self.deadline = time.monotonic() + timeout if timeout else None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if not self._event.is_set():
+            self._reason = reason
+            self._event.set()
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._reason
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel("expired")
+            return True
+        return False
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise InferenceCancelled(f"요청이 중단되었습니다: {self._reason}", reason=self._reason or "cancelled")
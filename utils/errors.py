@@ -14,6 +14,16 @@ def bad_request(msg: str, code: str = "BAD_REQUEST") -> HTTPException:
 def unprocessable(msg: str, code: str = "UNPROCESSABLE_ENTITY") -> HTTPException:
     return HTTPException(status_code=422, detail={"message": msg, "error_code": code})
 
+def not_found(msg: str, code: str = "NOT_FOUND") -> HTTPException:
+    return HTTPException(status_code=404, detail={"message": msg, "error_code": code})
+
+def too_many_requests(msg: str, retry_after: int = 1, code: str = "TOO_MANY_REQUESTS") -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail={"message": msg, "error_code": code},
+        headers={"Retry-After": str(max(1, int(retry_after)))},
+    )
+
 def internal_error(msg: str, code: str = "INTERNAL_ERROR") -> HTTPException:
     return HTTPException(status_code=500, detail={"message": msg, "error_code": code})
 
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+모델 패밀리별 실행기(executor) 풀
+- 블로킹 run_inference를 이벤트 루프 밖(전용 스레드 풀)에서 실행한다.
+- 패밀리마다 동시 실행 수(concurrency)와 대기열 길이(queue)를 따로 둔다.
+  (예: makeup=1, nia=N, llm=M)
+- 대기열이 가득 차면 ExecutorBusy → HTTP 429 + Retry-After
+- 대기 깊이/대기 시간 통계는 /metrics 로 노출
+- 실제 배차는 utils.scheduler 의 우선순위 스케줄러가 담당한다.
+"""
+import asyncio
+import copy
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+from typing import Callable, Dict, Optional
+
+from config import get_settings
+from utils.cancellation import InferenceCancelled
+from utils.errors import AppError, too_many_requests
+from utils.scheduler import get_scheduler
+from utils.singleflight import record_coalesced
+
+
+class ExecutorBusy(AppError):
+    """대기열이 가득 차 요청을 받을 수 없는 경우"""
+
+    def __init__(self, family: str, retry_after: int):
+        super().__init__(
+            f"{family} 요청이 많아 처리할 수 없습니다. {retry_after}초 후 다시 시도하세요.",
+            code="TOO_MANY_REQUESTS",
+            status=429,
+        )
+        self.family = family
+        self.retry_after = retry_after
+
+
+class ModelExecutor:
+    """동시 실행 수 + bounded admission 대기열 (배차는 공용 스케줄러)"""
+
+    _SAMPLES = 512
+
+    def __init__(self, name: str, concurrency: int, max_queue: int, compute: bool = True):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max(0, max_queue)
+        self._scheduler = get_scheduler()
+        self._scheduler.register_family(name, self.concurrency, compute=compute)
+        # 실행 중 + 대기 중 요청 수의 상한
+        self._admission = threading.BoundedSemaphore(self.concurrency + self.max_queue)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._waits = deque(maxlen=self._SAMPLES)
+        self._runs = deque(maxlen=self._SAMPLES)
+        # single-flight 키 → 진행 중 Future
+        self._inflight: Dict[str, Future] = {}
+
+    # ---- 제출 ----
+    def submit(self, fn: Callable, *args, block: bool = False, priority: Optional[str] = None, **kwargs) -> Future:
+        """
+        fn을 스케줄러에 제출. block=False면 대기열이 가득 찼을 때 ExecutorBusy를 던지고,
+        block=True면 자리가 날 때까지 기다린다(내부 job 워커용).
+        priority: 우선순위 클래스명 (기본: 패밀리 기본 클래스)
+
+        fn이 @single_flight 데코레이트 함수이면, 같은 키로 진행 중인 작업이 있을 때
+        슬롯을 새로 잡지 않고 그 Future의 결과를 공유한다.
+        """
+        key_fn = getattr(fn, "flight_key", None)
+        key = key_fn(*args, **kwargs) if key_fn is not None else None
+        placeholder: Optional[Future] = None
+        if key is not None:
+            # leader 확인과 자리 예약을 한 번의 락 구간에서 (동시에 들어온 같은 요청이 둘 다 leader 가 되지 않도록)
+            with self._lock:
+                leader = self._inflight.get(key)
+                if leader is None or leader.done():
+                    leader = None
+                    placeholder = self._inflight[key] = Future()
+            if leader is not None:
+                record_coalesced(fn.flight_name)
+                return self._follow(leader, fn, args, kwargs, block, priority)
+
+        try:
+            if not self._admission.acquire(blocking=block):
+                with self._lock:
+                    self._rejected += 1
+                raise ExecutorBusy(self.name, self.retry_after())
+        except BaseException as e:
+            self._release_key(key, placeholder, e)
+            raise
+
+        enqueued = time.monotonic()
+        with self._lock:
+            self._queued += 1
+
+        def _task():
+            started = time.monotonic()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._waits.append(started - enqueued)
+            try:
+                if key is not None:
+                    return fn.call_with_key(key, *args, **kwargs)  # 키 재계산(재해시) 없음
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._runs.append(time.monotonic() - started)
+                self._admission.release()
+
+        klass = priority or get_settings().priority_class(self.name)
+        try:
+            future = self._scheduler.submit(self.name, klass, _task)
+        except BaseException as e:
+            with self._lock:
+                self._queued -= 1
+            self._admission.release()
+            self._release_key(key, placeholder, e)
+            raise
+
+        if placeholder is None:
+            return future
+        _chain(future, placeholder)
+        placeholder.add_done_callback(lambda f, key=key: self._release_key(key, f))
+        return placeholder
+
+    def _release_key(self, key: Optional[str], placeholder: Optional[Future], error: Optional[BaseException] = None):
+        """single-flight 예약 해제. error 가 주어지면 (이미 붙은 follower 에게) 예외로 완료"""
+        if placeholder is None:
+            return
+        with self._lock:
+            if self._inflight.get(key) is placeholder:
+                del self._inflight[key]
+        if error is not None and not placeholder.done():
+            placeholder.set_exception(error)
+
+    def _follow(self, leader: Future, fn: Callable, args, kwargs, block: bool, priority: Optional[str]) -> Future:
+        """진행 중 Future 결과를 fan-out. leader가 취소로 끝나면 이 요청은 다시 제출한다."""
+        out: Future = Future()
+
+        def _relay(f: Future):
+            err = f.exception()
+            if err is None:
+                out.set_result(copy.copy(f.result()))
+            else:
+                out.set_exception(err)
+
+        def _on_leader_done(f: Future):
+            # leader 호출자가 Future 를 취소한 경우(클라이언트 이탈)도 취소와 같이 다시 제출
+            err = InferenceCancelled() if f.cancelled() else f.exception()
+            token = kwargs.get("cancel_token")
+            if isinstance(err, InferenceCancelled) and not (token is not None and token.cancelled):
+                try:
+                    retry = self.submit(fn, *args, block=block, priority=priority, **kwargs)
+                except BaseException as e:
+                    out.set_exception(e)
+                    return
+                retry.add_done_callback(_relay)
+            else:
+                _relay(f)
+
+        leader.add_done_callback(_on_leader_done)
+        return out
+
+    async def run(self, fn: Callable, *args, priority: Optional[str] = None, **kwargs):
+        """이벤트 루프에서 await 가능한 형태로 실행"""
+        return await asyncio.wrap_future(self.submit(fn, *args, priority=priority, **kwargs))
+
+    def call(self, fn: Callable, *args, priority: Optional[str] = None, **kwargs):
+        """동기 호출자(job 워커 등)용: 자리가 날 때까지 기다렸다가 결과 반환"""
+        return self.submit(fn, *args, block=True, priority=priority, **kwargs).result()
+
+    # ---- 통계 ----
+    def retry_after(self) -> int:
+        with self._lock:
+            avg_run = (sum(self._runs) / len(self._runs)) if self._runs else 1.0
+            backlog = self._queued + self._running
+        return max(1, math.ceil(avg_run * backlog / self.concurrency))
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            runs = list(self._runs)
+            out = {
+                "concurrency": self.concurrency,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+        def _pct(q: float) -> Optional[float]:
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))], 4)
+
+        out["wait_sec"] = {
+            "avg": round(sum(waits) / len(waits), 4) if waits else None,
+            "p50": _pct(0.50),
+            "p95": _pct(0.95),
+            "max": round(waits[-1], 4) if waits else None,
+        }
+        out["run_sec_avg"] = round(sum(runs) / len(runs), 4) if runs else None
+        return out
+
+
+def _chain(src: Future, dst: Future) -> None:
+    """src 결과를 dst 로 전달하고, dst 가 취소되면 (아직 배차 전인) src 도 취소"""
+    def _copy(f: Future):
+        if dst.done():
+            return
+        try:
+            if f.cancelled():
+                dst.cancel()
+            elif f.exception() is not None:
+                dst.set_exception(f.exception())
+            else:
+                dst.set_result(f.result())
+        except InvalidStateError:
+            pass  # 그 사이 dst 가 취소됨
+
+    src.add_done_callback(_copy)
+    dst.add_done_callback(lambda f: f.cancelled() and src.cancel())
+
+
+_EXECUTORS: Dict[str, ModelExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def get_executor(family: str) -> ModelExecutor:
+    """패밀리별 executor 싱글톤 (설정: EXECUTOR_<FAMILY>_CONCURRENCY / _QUEUE)"""
+    with _EXECUTORS_LOCK:
+        ex = _EXECUTORS.get(family)
+        if ex is None:
+            s = get_settings()
+            concurrency, max_queue = s.executor_limits(family)
+            ex = ModelExecutor(family, concurrency=concurrency, max_queue=max_queue,
+                               compute=family not in s.IO_FAMILIES)
+            _EXECUTORS[family] = ex
+        return ex
+
+
+async def run_model(family: str, fn: Callable, *args, endpoint: Optional[str] = None, **kwargs):
+    """
+    API 핸들러용: family executor에서 실행하고, 포화 시 HTTP 429로 변환
+    endpoint: 우선순위 클래스 결정용 엔드포인트 이름 (없으면 family 기본값)
+    """
+    priority = get_settings().priority_class(endpoint or family)
+    try:
+        return await get_executor(family).run(fn, *args, priority=priority, **kwargs)
+    except ExecutorBusy as e:
+        raise too_many_requests(e.message, retry_after=e.retry_after)
+
+
+def executor_stats() -> dict:
+    with _EXECUTORS_LOCK:
+        executors = dict(_EXECUTORS)
+    return {name: ex.stats() for name, ex in executors.items()}
+
+
+def scheduler_stats() -> dict:
+    return get_scheduler().stats()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+얼굴 영역 크롭 / 합성 (고해상도 입력용 face_crop 모드)
+- face_crop_box(): 검출 박스 중 가장 큰 얼굴을 중심으로 여백을 둔 정사각 영역 (이미지 안으로 이동/축소)
+- paste_face(): 크롭 영역에서 생성한 결과를 원본 해상도로 되돌려, 가장자리를 부드럽게(feather) 한 마스크로 합성
+"""
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+Box = Tuple[float, float, float, float]  # (x, y, w, h)
+
+
+def face_crop_box(image: Image.Image, boxes: Sequence[Box], margin: float = 0.6) -> Optional[Tuple[int, int, int, int]]:
+    """
+    가장 큰 얼굴 박스 기준 정사각 크롭 영역 (left, top, right, bottom). 얼굴이 없으면 None
+    margin: 박스 긴 변 대비 사방 여백 비율 (머리/턱선까지 포함되도록)
+    """
+    if not boxes:
+        return None
+    W, H = image.size
+    x, y, w, h = max(boxes, key=lambda b: b[2] * b[3])
+    side = int(round(max(w, h) * (1 + 2 * margin)))
+    side = max(1, min(side, W, H))
+
+    cx, cy = x + w / 2, y + h / 2
+    left = int(round(min(max(cx - side / 2, 0), W - side)))
+    top = int(round(min(max(cy - side / 2, 0), H - side)))
+    return left, top, left + side, top + side
+
+
+def feather_mask(side: int, feather: float = 0.08) -> Image.Image:
+    """가장자리 feather × side 폭에서 0→1 로 부드럽게 올라가는 정사각 마스크 (L 모드)"""
+    pad = max(1, int(round(side * feather)))
+    mask = Image.new("L", (side, side), 0)
+    ImageDraw.Draw(mask).rectangle((pad, pad, side - 1 - pad, side - 1 - pad), fill=255)
+    return mask.filter(ImageFilter.GaussianBlur(radius=pad / 2))
+
+
+def paste_face(original: Image.Image, result: Image.Image, crop_box: Tuple[int, int, int, int],
+               feather: float = 0.08) -> Image.Image:
+    """result(크롭 영역 생성 결과)를 원본의 crop_box 에 feather 마스크로 합성한 새 이미지"""
+    left, top, right, bottom = crop_box
+    side = right - left
+    patch = result.convert("RGB").resize((side, side), Image.LANCZOS)
+
+    out = np.array(original.convert("RGB"), dtype=np.float32)
+    region = out[top:bottom, left:right]
+    alpha = np.asarray(feather_mask(side, feather), dtype=np.float32)[..., None] / 255.0
+    out[top:bottom, left:right] = region * (1.0 - alpha) + np.asarray(patch, dtype=np.float32) * alpha
+    return Image.fromarray(np.clip(out + 0.5, 0, 255).astype(np.uint8))
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+우선순위 스케줄러 (model executor 하위 계층)
+- 엔드포인트별 우선순위 클래스(interactive / standard / batch)
+- 클래스 간 가중 공정 큐잉(WFQ): 가상 완료 시각이 가장 이른 작업부터 배차
+- 클래스별 지연 SLO: 대기 시간이 SLO를 넘긴 작업은 가중치와 무관하게 먼저 배차
+- 대기열 순서만 조정하며, 이미 실행 중인 작업은 선점하지 않는다.
+- compute 슬롯: 연산 위주 패밀리가 동시에 점유할 수 있는 전역 슬롯 수.
+  (LLM 같은 I/O 위주 패밀리는 슬롯을 쓰지 않음)
+"""
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+from config import get_settings
+
+
+class PriorityClass:
+    def __init__(self, name: str, weight: float, slo_sec: float):
+        self.name = name
+        self.weight = max(weight, 1e-6)
+        self.slo_sec = slo_sec
+
+
+class _Task:
+    __slots__ = ("fn", "future", "family", "klass", "enqueued", "vstart", "vfinish")
+
+    def __init__(self, fn: Callable, family: str, klass: PriorityClass):
+        self.fn = fn
+        self.future: Future = Future()
+        self.family = family
+        self.klass = klass
+        self.enqueued = time.monotonic()
+        self.vstart = 0.0
+        self.vfinish = 0.0
+
+
+class Scheduler:
+    _SAMPLES = 512
+
+    def __init__(self, classes: Dict[str, PriorityClass], compute_slots: int):
+        self.classes = classes
+        self.compute_slots = max(1, compute_slots)
+        self._cond = threading.Condition()
+        self._queues: Dict[str, deque] = {name: deque() for name in classes}
+        self._vtime = 0.0
+        self._last_finish: Dict[str, float] = defaultdict(float)
+        self._family_limit: Dict[str, int] = {}
+        self._family_compute: Dict[str, bool] = {}
+        self._family_running: Dict[str, int] = defaultdict(int)
+        self._compute_running = 0
+        self._threads = []
+        # 클래스별 통계
+        self._waits: Dict[str, deque] = {name: deque(maxlen=self._SAMPLES) for name in classes}
+        self._dispatched: Dict[str, int] = defaultdict(int)
+        self._slo_violations: Dict[str, int] = defaultdict(int)
+
+    # ---- 등록 ----
+    def register_family(self, family: str, concurrency: int, compute: bool = True) -> None:
+        """패밀리 동시 실행 상한을 등록하고, 그만큼 워커 스레드를 늘린다."""
+        with self._cond:
+            if family in self._family_limit:
+                return
+            self._family_limit[family] = max(1, concurrency)
+            self._family_compute[family] = compute
+            for i in range(self._family_limit[family]):
+                t = threading.Thread(target=self._worker, name=f"sched-{family}-{i}", daemon=True)
+                self._threads.append(t)
+                t.start()
+
+    # ---- 제출 ----
+    def submit(self, family: str, klass_name: str, fn: Callable) -> Future:
+        klass = self.classes.get(klass_name) or self.classes["standard"]
+        task = _Task(fn, family, klass)
+        with self._cond:
+            # WFQ 태그: start = max(V, 직전 finish), finish = start + 1/weight
+            task.vstart = max(self._vtime, self._last_finish[klass.name])
+            task.vfinish = task.vstart + 1.0 / klass.weight
+            self._last_finish[klass.name] = task.vfinish
+            self._queues[klass.name].append(task)
+            self._cond.notify_all()
+        return task.future
+
+    def pending(self, exclude: tuple = ()) -> int:
+        """대기 중인 작업 수 (exclude 클래스 제외)"""
+        with self._cond:
+            return sum(len(q) for name, q in self._queues.items() if name not in exclude)
+
+    # ---- 배차 ----
+    def _eligible(self, task: _Task) -> bool:
+        if self._family_running[task.family] >= self._family_limit.get(task.family, 1):
+            return False
+        if self._family_compute.get(task.family, True) and self._compute_running >= self.compute_slots:
+            return False
+        return True
+
+    def _pick(self) -> Optional[_Task]:
+        now = time.monotonic()
+        best, best_key = None, None
+        for name, q in self._queues.items():
+            # 클래스 내부는 FIFO이되, 패밀리 한도에 막힌 작업은 건너뛴다.
+            for task in q:
+                if not self._eligible(task):
+                    continue
+                overdue = (now - task.enqueued) - task.klass.slo_sec
+                # SLO 초과 작업 우선(초과량 큰 순), 그 다음 가상 완료 시각 순
+                key = (0, -overdue) if overdue > 0 else (1, task.vfinish)
+                if best_key is None or key < best_key:
+                    best, best_key = task, key
+                break
+        if best is not None:
+            self._queues[best.klass.name].remove(best)
+        return best
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                task = self._pick()
+                while task is None:
+                    self._cond.wait()
+                    task = self._pick()
+                self._vtime = max(self._vtime, task.vstart)
+                self._family_running[task.family] += 1
+                compute = self._family_compute.get(task.family, True)
+                if compute:
+                    self._compute_running += 1
+                wait = time.monotonic() - task.enqueued
+                self._waits[task.klass.name].append(wait)
+                self._dispatched[task.klass.name] += 1
+                if wait > task.klass.slo_sec:
+                    self._slo_violations[task.klass.name] += 1
+
+            try:
+                if task.future.set_running_or_notify_cancel():
+                    try:
+                        task.future.set_result(task.fn())
+                    except BaseException as e:
+                        task.future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._family_running[task.family] -= 1
+                    if compute:
+                        self._compute_running -= 1
+                    self._cond.notify_all()
+
+    # ---- 통계 ----
+    def stats(self) -> dict:
+        with self._cond:
+            out = {"compute_slots": self.compute_slots, "compute_running": self._compute_running, "classes": {}}
+            for name, klass in self.classes.items():
+                waits = sorted(self._waits[name])
+                dispatched = self._dispatched[name]
+                out["classes"][name] = {
+                    "weight": klass.weight,
+                    "slo_sec": klass.slo_sec,
+                    "queued": len(self._queues[name]),
+                    "dispatched": dispatched,
+                    "wait_p95_sec": round(waits[min(len(waits) - 1, int(0.95 * len(waits)))], 4) if waits else None,
+                    "slo_violations": self._slo_violations[name],
+                    "slo_attainment": round(1 - self._slo_violations[name] / dispatched, 4) if dispatched else None,
+                }
+            return out
+
+
+_SCHEDULER: Optional[Scheduler] = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            s = get_settings()
+            classes = {
+                name: PriorityClass(name, weight, slo)
+                for name, (weight, slo) in s.PRIORITY_CLASSES.items()
+            }
+            _SCHEDULER = Scheduler(classes, compute_slots=s.SCHEDULER_COMPUTE_SLOTS)
+        return _SCHEDULER
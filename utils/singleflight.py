@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Single-flight 요청 병합
+- 동일한(정규화 후 해시가 같은) 요청이 처리 중일 때 들어온 중복 요청은
+  새 추론을 띄우지 않고 진행 중인 호출의 결과를 함께 받는다.
+- 사용: 서비스 run_inference에 @single_flight() 데코레이터 적용
+  (데코레이트된 함수의 flight_key()를 utils.executors 가 사용해, 중복 요청이
+   executor 슬롯을 차지하지 않고 진행 중인 Future에 바로 붙도록 한다.
+   executor 는 계산한 키를 call_with_key() 로 넘기므로 입력은 요청당 한 번만 해시된다.)
+- 병합은 호출 경로당 한 계층에만 둔다 (데코레이트된 함수끼리 중첩하지 않음)
+"""
+import copy
+import functools
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from PIL import Image
+
+from utils.cancellation import InferenceCancelled
+
+
+def _normalize_b64(s: str) -> str:
+    if "base64," in s[:64]:
+        s = s.split("base64,", 1)[1]
+    return "".join(s.split())
+
+
+def _feed(h, obj: Any) -> None:
+    """요청 값을 타입별로 정규화하여 해시에 반영"""
+    if obj is None:
+        h.update(b"N")
+    elif isinstance(obj, bool):
+        h.update(b"B1" if obj else b"B0")
+    elif isinstance(obj, (int, float)):
+        h.update(b"F" + repr(float(obj)).encode())
+    elif isinstance(obj, str):
+        h.update(b"S" + _normalize_b64(obj).encode("utf-8") if len(obj) > 256 else b"S" + obj.encode("utf-8"))
+    elif isinstance(obj, (bytes, bytearray)):
+        h.update(b"Y" + bytes(obj))
+    elif isinstance(obj, Image.Image):
+        h.update(f"I{obj.mode}{obj.size}".encode())
+        h.update(obj.tobytes())
+    elif isinstance(obj, dict):
+        h.update(b"D")
+        for k in sorted(obj, key=str):
+            h.update(str(k).encode("utf-8"))
+            _feed(h, obj[k])
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"L")
+        for v in obj:
+            _feed(h, v)
+    elif hasattr(obj, "model_dump"):
+        _feed(h, obj.model_dump())
+    else:
+        h.update(repr(obj).encode("utf-8"))
+    h.update(b"|")
+
+
+def request_fingerprint(*parts: Any) -> str:
+    h = hashlib.sha256()
+    for p in parts:
+        _feed(h, p)
+    return h.hexdigest()
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+_STATS: Dict[str, Dict[str, int]] = {}
+_STATS_LOCK = threading.Lock()
+
+
+def _bump(name: str, field: str) -> None:
+    with _STATS_LOCK:
+        _STATS.setdefault(name, {"leaders": 0, "coalesced": 0})[field] += 1
+
+
+def record_coalesced(name: str) -> None:
+    _bump(name, "coalesced")
+
+
+def single_flight(key_fn: Optional[Callable[..., str]] = None, exclude: Iterable[str] = ("cancel_token",)):
+    """
+    동일 키의 동시 호출을 하나로 병합하는 데코레이터.
+    key_fn: (*args, **kwargs) -> 키 문자열. 없으면 인자 전체(exclude 제외)를 해시.
+    exclude: 키 계산에서 제외할 kwargs (취소 토큰 등 요청마다 다른 값)
+    """
+    exclude = tuple(exclude)
+
+    def decorator(fn: Callable):
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        inflight: Dict[str, _Call] = {}
+        lock = threading.Lock()
+
+        def flight_key(*args, **kwargs) -> str:
+            if key_fn is not None:
+                return f"{name}:{key_fn(*args, **kwargs)}"
+            return f"{name}:{request_fingerprint(args, {k: v for k, v in kwargs.items() if k not in exclude})}"
+
+        def call_with_key(key: str, /, *args, **kwargs):
+            """키를 이미 계산한 호출자(utils.executors)용: 입력을 다시 해시하지 않는다."""
+            with lock:
+                call = inflight.get(key)
+                leader = call is None
+                if leader:
+                    call = inflight[key] = _Call()
+                else:
+                    call.waiters += 1
+
+            if leader:
+                _bump(name, "leaders")
+                try:
+                    call.result = fn(*args, **kwargs)
+                    return call.result
+                except BaseException as e:
+                    call.error = e
+                    raise
+                finally:
+                    with lock:
+                        inflight.pop(key, None)
+                    call.event.set()
+
+            # follower: 자신의 취소 토큰도 확인하면서 leader 결과를 기다린다.
+            _bump(name, "coalesced")
+            token = kwargs.get("cancel_token")
+            while not call.event.wait(0.2):
+                if token is not None:
+                    token.raise_if_cancelled()
+            if call.error is not None:
+                if isinstance(call.error, InferenceCancelled):
+                    # leader 쪽 클라이언트가 이탈한 경우: 이 요청은 다시 실행한다.
+                    return call_with_key(key, *args, **kwargs)
+                raise call.error
+            return copy.copy(call.result)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return call_with_key(flight_key(*args, **kwargs), *args, **kwargs)
+
+        wrapper.call_with_key = call_with_key
+        wrapper.flight_key = flight_key
+        wrapper.flight_name = name
+        wrapper.inflight_count = lambda: len(inflight)
+        return wrapper
+
+    return decorator
+
+
+def singleflight_stats() -> dict:
+    with _STATS_LOCK:
+        return {name: dict(v) for name, v in _STATS.items()}
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+요청 내부 단계(stage) 실행/계측
+- StageTimings: 요청 하나의 단계별 소요 시간(ms). 여러 스레드에서 동시에 기록 가능
+- run_parallel(): 서로 독립인 단계를 전용 스레드 풀에서 동시에 실행 (executor 슬롯을 더 쓰지 않음)
+- 누적 통계(stage_stats)는 /metrics 의 "stages" 로 노출
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+
+class StageTimings:
+    def __init__(self, name: str):
+        self.name = name
+        self._t0 = time.perf_counter()
+        self._ms: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, stage: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._ms[stage] = round((time.perf_counter() - t0) * 1000, 1)
+
+    def timed(self, stage: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """fn 을 stage 로 계측하는 래퍼 (스레드 풀 제출용)"""
+        def wrapper(*args, **kwargs):
+            with self.stage(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            out = dict(self._ms)
+        out["total"] = round((time.perf_counter() - self._t0) * 1000, 1)
+        return out
+
+    def report(self) -> Dict[str, float]:
+        """누적 통계에 반영하고 한 줄 로그 출력"""
+        ms = self.as_dict()
+        _record(self.name, ms)
+        print(f"⏱ {self.name} stages: " + " ".join(f"{k}={v:.0f}ms" for k, v in ms.items()))
+        return ms
+
+
+# ------------------------------------------------------------
+# 단계 병렬 실행용 스레드 풀
+# ------------------------------------------------------------
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def stage_pool() -> ThreadPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="stage")
+        return _POOL
+
+
+def run_parallel(timings: StageTimings, stage: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+    """fn 을 별도 스레드에서 실행하고 Future 반환 (소요 시간은 timings 의 stage 로 기록)"""
+    return stage_pool().submit(timings.timed(stage, fn), *args, **kwargs)
+
+
+# ------------------------------------------------------------
+# 누적 통계
+# ------------------------------------------------------------
+_STATS: Dict[str, Dict[str, Dict[str, float]]] = {}
+_STATS_LOCK = threading.Lock()
+
+
+def _record(name: str, ms: Dict[str, float]) -> None:
+    with _STATS_LOCK:
+        per_stage = _STATS.setdefault(name, {})
+        for stage, value in ms.items():
+            s = per_stage.setdefault(stage, {"count": 0, "sum_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0})
+            s["count"] += 1
+            s["sum_ms"] += value
+            s["max_ms"] = max(s["max_ms"], value)
+            s["last_ms"] = value
+
+
+def stage_stats() -> dict:
+    with _STATS_LOCK:
+        return {
+            name: {
+                stage: {
+                    "count": s["count"],
+                    "mean_ms": round(s["sum_ms"] / s["count"], 1),
+                    "max_ms": s["max_ms"],
+                    "last_ms": s["last_ms"],
+                }
+                for stage, s in per_stage.items()
+            }
+            for name, per_stage in _STATS.items()
+        }
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+2단 캐시 (메모리 LRU + 선택적 디스크)
+- 값은 bytes (인코딩된 PNG 등)
+- 메모리 계층: 전체 바이트 상한(mem_max_bytes)을 넘으면 LRU 순으로 제거
+- 디스크 계층: <disk_dir>/<key>.bin, 수정 시각 기준 TTL 경과 시 제거
+- 히트율 통계는 cache_stats()로 /metrics 에 노출
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class TieredCache:
+    def __init__(self, name: str, mem_max_bytes: int, disk_dir: Optional[Path] = None, ttl_sec: float = 0):
+        self.name = name
+        self.mem_max_bytes = max(0, int(mem_max_bytes))
+        self.ttl_sec = ttl_sec
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self._mem: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, stored_at)
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        self._hits_mem = 0
+        self._hits_disk = 0
+        self._misses = 0
+        self._evictions = 0
+        _register(self)
+
+    # ---- 조회/저장 ----
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            item = self._mem.get(key)
+            if item is not None:
+                value, stored_at = item
+                if self.ttl_sec and now - stored_at > self.ttl_sec:
+                    self._drop(key)
+                else:
+                    self._mem.move_to_end(key)
+                    self._hits_mem += 1
+                    return value
+
+        value = self._disk_get(key, now)
+        with self._lock:
+            if value is None:
+                self._misses += 1
+                return None
+            self._hits_disk += 1
+            self._mem_put(key, value, now)
+        return value
+
+    def put(self, key: str, value: bytes) -> None:
+        now = time.time()
+        with self._lock:
+            self._mem_put(key, value, now)
+        self._disk_put(key, value)
+
+    def pop(self, key: str) -> Optional[bytes]:
+        """조회 후 제거 (1회용 값)"""
+        value = self.get(key)
+        if value is not None:
+            with self._lock:
+                if key in self._mem:
+                    self._drop(key)
+            if self.disk_dir is not None:
+                self._disk_path(key).unlink(missing_ok=True)
+        return value
+
+    def contains(self, key: str) -> bool:
+        """get() 이 값을 돌려줄 항목이 있는지 (TTL 이 지난 항목은 여기서 제거하고 False, 통계 미반영)"""
+        now = time.time()
+        with self._lock:
+            item = self._mem.get(key)
+            if item is not None:
+                if not (self.ttl_sec and now - item[1] > self.ttl_sec):
+                    return True
+                self._drop(key)
+        if self.disk_dir is None:
+            return False
+        path = self._disk_path(key)
+        try:
+            mtime = path.stat().st_mtime
+            if self.ttl_sec and now - mtime > self.ttl_sec:
+                path.unlink()
+                return False
+            return True
+        except FileNotFoundError:
+            return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._mem_bytes = 0
+
+    # ---- 메모리 계층 ----
+    def _mem_put(self, key: str, value: bytes, now: float) -> None:
+        if len(value) > self.mem_max_bytes:
+            return
+        if key in self._mem:
+            self._drop(key)
+        self._mem[key] = (value, now)
+        self._mem_bytes += len(value)
+        while self._mem_bytes > self.mem_max_bytes and self._mem:
+            old_key = next(iter(self._mem))
+            self._drop(old_key)
+            self._evictions += 1
+
+    def _drop(self, key: str) -> None:
+        value, _ = self._mem.pop(key)
+        self._mem_bytes -= len(value)
+
+    # ---- 디스크 계층 ----
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.bin"
+
+    def _disk_get(self, key: str, now: float) -> Optional[bytes]:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            if self.ttl_sec and now - path.stat().st_mtime > self.ttl_sec:
+                path.unlink()
+                return None
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _disk_put(self, key: str, value: bytes) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+        tmp.write_bytes(value)
+        os.replace(tmp, path)
+
+    def evict_expired(self) -> int:
+        """TTL이 지난 디스크 항목 정리"""
+        if self.disk_dir is None or not self.ttl_sec:
+            return 0
+        now = time.time()
+        removed = 0
+        for path in self.disk_dir.glob("*.bin"):
+            try:
+                if now - path.stat().st_mtime > self.ttl_sec:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    # ---- 통계 ----
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits_mem + self._hits_disk + self._misses
+            return {
+                "entries_mem": len(self._mem),
+                "bytes_mem": self._mem_bytes,
+                "mem_max_bytes": self.mem_max_bytes,
+                "disk": str(self.disk_dir) if self.disk_dir else None,
+                "hits_mem": self._hits_mem,
+                "hits_disk": self._hits_disk,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_ratio": round((self._hits_mem + self._hits_disk) / lookups, 4) if lookups else None,
+            }
+
+
+_CACHES: Dict[str, TieredCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def _register(cache: TieredCache) -> None:
+    with _CACHES_LOCK:
+        _CACHES[cache.name] = cache
+
+
+def cache_stats() -> dict:
+    with _CACHES_LOCK:
+        caches = dict(_CACHES)
+    return {name: c.stats() for name, c in caches.items()}
@@ -0,0 +1,72 @@
+# utils/weights.py
+"""
+체크포인트 가중치 로딩 유틸
+- <stem>.safetensors 가 있으면 우선 사용 (safe_open 으로 필요한 키만 텐서 단위로 읽음)
+- 없으면 <stem>.bin 을 torch.load(mmap=True, weights_only=True) 로 읽고, 안 되면 기존 방식으로 재시도
+- 모듈은 meta 디바이스에 만든 뒤(파라미터 메모리 할당/초기화 없음) state dict를 assign=True 로 꽂는다.
+  (assign 미지원 torch 이거나 채워지지 않은 파라미터가 남으면 호출 측에서 기존 경로로 되돌린다)
+"""
+import os
+from typing import Dict, Optional
+
+import torch
+
+from config import get_settings
+
+
+def resolve_weights(directory: str, stem: str) -> Optional[str]:
+    """directory/stem.{safetensors,bin} 중 설정(MAKEUP_WEIGHTS_FORMAT)에 맞는 파일 경로"""
+    fmt = get_settings().MAKEUP_WEIGHTS_FORMAT
+    st = os.path.join(directory, f"{stem}.safetensors")
+    bn = os.path.join(directory, f"{stem}.bin")
+    candidates = {"safetensors": [st], "bin": [bn]}.get(fmt, [st, bn])
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_state_dict(path: str, device: str = "cpu", prefix: Optional[str] = None) -> Dict[str, torch.Tensor]:
+    """
+    safetensors / pickle(.bin) 체크포인트를 state dict로 읽는다.
+    prefix 가 주어지면 그 prefix 로 시작하는 키만 반환 (safetensors 는 나머지 텐서를 아예 읽지 않음)
+    """
+    if path.endswith(".safetensors"):
+        from safetensors import safe_open
+        with safe_open(path, framework="pt", device=device) as f:
+            return {k: f.get_tensor(k) for k in f.keys() if prefix is None or k.startswith(prefix)}
+    try:
+        state_dict = torch.load(path, map_location=device, mmap=True, weights_only=True)
+    except Exception:
+        # 구형 직렬화 포맷 / mmap 미지원 torch
+        state_dict = torch.load(path, map_location=device)
+    if prefix is not None:
+        state_dict = {k: v for k, v in state_dict.items() if k.startswith(prefix)}
+    return state_dict
+
+
+def empty_init():
+    """파라미터를 meta 디바이스에 만드는 컨텍스트 (accelerate 미설치 시 None)"""
+    if not get_settings().MAKEUP_FAST_INIT:
+        return None
+    try:
+        from accelerate import init_empty_weights
+    except ImportError:
+        return None
+    return init_empty_weights()
+
+
+def has_meta_tensors(module: torch.nn.Module) -> bool:
+    return any(t.is_meta for t in list(module.parameters()) + list(module.buffers()))
+
+
+def assign_state_dict(module: torch.nn.Module, state_dict: Dict[str, torch.Tensor]) -> bool:
+    """
+    meta 모듈에 state dict 텐서를 그대로 꽂는다 (복사 없음).
+    모든 파라미터가 채워졌으면 True, 아니면 False (호출 측에서 일반 초기화 경로로 재시도)
+    """
+    try:
+        module.load_state_dict(state_dict, strict=False, assign=True)
+    except TypeError:
+        return False  # torch < 2.1: assign 미지원
+    return not has_meta_tensors(module)